@@ -3,7 +3,7 @@ Django admin configuration for scope and permission management.
 """
 
 from django.contrib import admin, messages
-from django.db import connection
+from django.db import connection, transaction
 from django.shortcuts import redirect
 from django.urls import path, reverse
 from django.utils.html import format_html
@@ -1759,24 +1759,33 @@ if CONFIG_AVAILABLE:
                 return
 
             config = queryset.first()
+            changed_by = request.user.username if request.user.is_authenticated else 'unknown'
 
-            # Deactivate all others
-            AzureADConfiguration.objects.exclude(pk=config.pk).update(is_active=False)
-
-            # Activate selected
-            config.is_active = True
-            config.save()
-
-            # Log history
-            AzureADConfigurationHistory.objects.create(
-                configuration=config,
-                configuration_name=config.name,
-                action='activated',
-                tenant_id=config.tenant_id,
-                client_id=config.client_id,
-                changed_by=request.user.username if request.user.is_authenticated else 'unknown',
-                details="Activated via admin action"
-            )
+            with transaction.atomic():
+                # Deactivate all others
+                deactivated = list(
+                    AzureADConfiguration.objects.filter(is_active=True).exclude(pk=config.pk)
+                )
+                AzureADConfiguration.objects.filter(pk__in=[c.pk for c in deactivated]).update(is_active=False)
+
+                # Activate selected
+                config.is_active = True
+                config.save()
+
+                # Log history (single bulk insert on commit)
+                AzureADConfigurationHistory.log(
+                    [
+                        AzureADConfigurationHistory.for_configuration(
+                            other, 'deactivated', changed_by, f"Deactivated when '{config.name}' was activated"
+                        )
+                        for other in deactivated
+                    ]
+                    + [
+                        AzureADConfigurationHistory.for_configuration(
+                            config, 'activated', changed_by, "Activated via admin action"
+                        )
+                    ]
+                )
 
             self.message_user(
                 request,
@@ -1838,16 +1847,15 @@ if CONFIG_AVAILABLE:
 
             super().save_model(request, obj, form, change)
 
-            # Log history
-            AzureADConfigurationHistory.objects.create(
-                configuration=obj,
-                configuration_name=obj.name,
-                action=action,
-                tenant_id=obj.tenant_id,
-                client_id=obj.client_id,
-                changed_by=request.user.username if request.user.is_authenticated else 'unknown',
-                details="Modified via admin interface"
-            )
+            # Log history (written on commit of the admin transaction)
+            AzureADConfigurationHistory.log([
+                AzureADConfigurationHistory.for_configuration(
+                    obj,
+                    action,
+                    request.user.username if request.user.is_authenticated else 'unknown',
+                    "Modified via admin interface"
+                )
+            ])
 
         class Media:
             css = {
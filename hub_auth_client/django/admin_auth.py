@@ -96,27 +96,15 @@ class MSALAdminBackend(BaseBackend):
             dict: Token claims if valid, None otherwise
         """
         try:
-            # Try database config first
-            from .config_models import AzureADConfiguration
-            config = AzureADConfiguration.get_active_config()
+            # Database config first, then settings.py
+            from .config_models import resolve_azure_config
+            config = resolve_azure_config()
 
-            if config:
-                validator = config.get_validator()
-            else:
-                # Fall back to creating validator from settings
-                from ..validator import MSALTokenValidator
-
-                tenant_id = getattr(settings, 'AZURE_AD_TENANT_ID', None)
-                client_id = getattr(settings, 'AZURE_AD_CLIENT_ID', None)
-
-                if not tenant_id or not client_id:
-                    logger.error("No Azure AD configuration found")
-                    return None
+            if not config:
+                logger.error("No Azure AD configuration found")
+                return None
 
-                validator = MSALTokenValidator(
-                    tenant_id=tenant_id,
-                    client_id=client_id
-                )
+            validator = config.validator
 
             is_valid, claims, error = validator.validate_token(token)
 
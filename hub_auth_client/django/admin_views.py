@@ -8,14 +8,47 @@ import logging
 import secrets
 from urllib.parse import urlencode
 
+import requests
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
+from django.core import signing
+from django.http import HttpResponseRedirect
 from django.shortcuts import redirect
 from django.views import View
 
+from ..utils.json_helpers import loads as json_loads
+from .admin_auth import MSALAdminBackend
+from .config_models import resolve_azure_config
+
 logger = logging.getLogger(__name__)
 
+# Error-path redirect target; a literal path needs no resolve_url() lookup
+_ADMIN_LOGIN_URL = '/admin/login/'
+
+# Signed OAuth state: verified on callback without a session round-trip
+_STATE_SALT = 'hub_auth_client.django.admin_views.state'
+_STATE_MAX_AGE = 600  # seconds
+_NONCE_COOKIE = 'msal_admin_nonce'
+
+
+def _dump_state(payload):
+    """Sign and timestamp the OAuth state payload."""
+    return signing.dumps(payload, salt=_STATE_SALT)
+
+
+def _load_state(state):
+    """
+    Verify a signed OAuth state value.
+
+    Returns:
+        dict: State payload, or None if the signature is invalid or expired
+    """
+    try:
+        return signing.loads(state, salt=_STATE_SALT, max_age=_STATE_MAX_AGE)
+    except signing.BadSignature:
+        return None
+
 
 class MSALAdminLoginView(View):
     """
@@ -37,17 +70,17 @@ class MSALAdminLoginView(View):
         config = self._get_config()
         if not config:
             messages.error(request, "Azure AD is not configured")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         tenant_id, client_id = config
 
-        # Generate state for CSRF protection
-        state = secrets.token_urlsafe(32)
-        request.session['msal_state'] = state
-
         # Get redirect URI
         redirect_uri = self._get_redirect_uri(request)
-        request.session['msal_redirect_uri'] = redirect_uri
+
+        # Generate signed state for CSRF protection; the nonce cookie binds it to this browser.
+        # The redirect URI travels in the state too, so the handshake needs no session I/O.
+        nonce = secrets.token_urlsafe(16)
+        state = _dump_state({'n': nonce, 'r': redirect_uri})
 
         # Build authorization URL
         auth_endpoint = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/authorize"
@@ -63,26 +96,22 @@ class MSALAdminLoginView(View):
 
         auth_url = f"{auth_endpoint}?{urlencode(params)}"
 
-        return redirect(auth_url)
+        response = HttpResponseRedirect(auth_url)
+        response.set_cookie(
+            _NONCE_COOKIE,
+            nonce,
+            max_age=_STATE_MAX_AGE,
+            secure=request.is_secure(),
+            httponly=True,
+            samesite='Lax',
+        )
+        return response
 
     def _get_config(self):
-        """Get Azure AD configuration."""
-        try:
-            from .config_models import AzureADConfiguration
-            config = AzureADConfiguration.get_active_config()
-
-            if config:
-                return (config.tenant_id, config.client_id)
-        except Exception:
-            pass
-
-        # Fall back to settings
-        tenant_id = getattr(settings, 'AZURE_AD_TENANT_ID', None)
-        client_id = getattr(settings, 'AZURE_AD_CLIENT_ID', None)
-
-        if tenant_id and client_id:
-            return (tenant_id, client_id)
-
+        """Get Azure AD configuration as a (tenant_id, client_id) tuple."""
+        config = resolve_azure_config()
+        if config:
+            return (config.tenant_id, config.client_id)
         return None
 
     def _get_redirect_uri(self, request):
@@ -110,13 +139,11 @@ class MSALAdminCallbackView(View):
     def get(self, request):
         """Handle OAuth callback."""
         # Validate state
-        state = request.GET.get('state')
-        expected_state = request.session.get('msal_state')
-
-        if not state or state != expected_state:
+        state = self._load_verified_state(request)
+        if not state:
             logger.warning("MSAL callback state mismatch")
             messages.error(request, "Invalid state parameter")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         # Check for error
         error = request.GET.get('error')
@@ -124,46 +151,51 @@ class MSALAdminCallbackView(View):
             error_description = request.GET.get('error_description', error)
             logger.warning(f"MSAL login error: {error_description}")
             messages.error(request, f"Login failed: {error_description}")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         # Get authorization code
         code = request.GET.get('code')
         if not code:
             messages.error(request, "No authorization code received")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
+
+        # Resolve configuration once for the whole callback
+        config = self._get_config()
+        if not config:
+            messages.error(request, "Azure AD is not configured")
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         # Exchange code for token
-        token_data = self._exchange_code_for_token(request, code)
+        token_data = self._exchange_code_for_token(request, code, state.get('r'), config)
         if not token_data:
             messages.error(request, "Failed to obtain access token")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         # Authenticate user with token
         id_token = token_data.get('id_token')
         if not id_token:
             messages.error(request, "No ID token received")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         # Validate token and get claims
-        claims = self._validate_id_token(id_token)
+        claims = self._validate_id_token(id_token, config)
         if not claims:
             messages.error(request, "Invalid ID token")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         # Authenticate user
-        from .admin_auth import MSALAdminBackend
         backend = MSALAdminBackend()
 
         user = backend.authenticate(request=request, claims=claims)
         if not user:
             messages.error(request, "Authentication failed")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         # Check if user has admin access
         if not user.is_staff:
             logger.warning(f"User {user.username} attempted admin login without staff privileges")
             messages.error(request, "You do not have permission to access the admin site")
-            return redirect('/admin/login/')
+            return HttpResponseRedirect(_ADMIN_LOGIN_URL)
 
         # Log user in
         user.backend = 'hub_auth_client.django.admin_auth.MSALAdminBackend'
@@ -172,42 +204,58 @@ class MSALAdminCallbackView(View):
         logger.info(f"User {user.username} logged in via MSAL")
         messages.success(request, f"Welcome, {user.get_full_name() or user.username}!")
 
-        # Clean up session
-        request.session.pop('msal_state', None)
-        request.session.pop('msal_redirect_uri', None)
-
         # Redirect to admin
         next_url = request.GET.get('next', '/admin/')
-        return redirect(next_url)
+        response = redirect(next_url)
+        response.delete_cookie(_NONCE_COOKIE)
+        return response
 
-    def _exchange_code_for_token(self, request, code):
+    def _load_verified_state(self, request):
         """
-        Exchange authorization code for access token.
+        Verify the signed state parameter against the nonce cookie.
 
         Args:
             request: Django request object
-            code: Authorization code
 
         Returns:
-            dict: Token data or None if failed
+            dict: State payload if it is authentic, unexpired and issued to this
+            browser; None otherwise
         """
-        import requests
+        state = request.GET.get('state')
+        if not state:
+            return None
 
-        # Get configuration
-        config = self._get_config()
-        if not config:
+        payload = _load_state(state)
+        if not payload:
+            return None
+
+        nonce = request.COOKIES.get(_NONCE_COOKIE)
+        if not nonce or not secrets.compare_digest(nonce, str(payload.get('n', ''))):
             return None
 
-        tenant_id, client_id, client_secret = config
+        return payload
+
+    def _exchange_code_for_token(self, request, code, redirect_uri, config):
+        """
+        Exchange authorization code for access token.
+
+        Args:
+            request: Django request object
+            code: Authorization code
+            redirect_uri: Redirect URI sent with the authorization request
+            config: ResolvedAzureConfig for this callback
+
+        Returns:
+            dict: Token data or None if failed
+        """
+        tenant_id, client_id, client_secret = config.tenant_id, config.client_id, config.client_secret
 
         if not client_secret:
             logger.error("Client secret not configured for admin SSO")
             return None
 
-        # Get redirect URI from session
-        redirect_uri = request.session.get('msal_redirect_uri')
         if not redirect_uri:
-            logger.error("Redirect URI not found in session")
+            logger.error("Redirect URI not found in state")
             return None
 
         # Exchange code for token
@@ -223,44 +271,31 @@ class MSALAdminCallbackView(View):
         }
 
         try:
-            response = requests.post(token_endpoint, data=data, timeout=30)
+            response = requests.post(
+                token_endpoint,
+                data=data,
+                headers={'Accept': 'application/json', 'Accept-Encoding': 'gzip'},
+                timeout=30,
+            )
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except Exception as e:
             logger.exception(f"Error exchanging code for token: {e}")
             return None
 
-    def _validate_id_token(self, id_token):
+    def _validate_id_token(self, id_token, config):
         """
         Validate ID token and return claims.
 
         Args:
             id_token: JWT ID token
+            config: ResolvedAzureConfig for this callback
 
         Returns:
             dict: Token claims or None if invalid
         """
         try:
-            from .config_models import AzureADConfiguration
-            config = AzureADConfiguration.get_active_config()
-
-            if config:
-                validator = config.get_validator()
-            else:
-                from ..validator import MSALTokenValidator
-
-                tenant_id = getattr(settings, 'AZURE_AD_TENANT_ID', None)
-                client_id = getattr(settings, 'AZURE_AD_CLIENT_ID', None)
-
-                if not tenant_id or not client_id:
-                    return None
-
-                validator = MSALTokenValidator(
-                    tenant_id=tenant_id,
-                    client_id=client_id
-                )
-
-            is_valid, claims, error = validator.validate_token(id_token)
+            is_valid, claims, error = config.validator.validate_token(id_token)
 
             if not is_valid:
                 logger.warning(f"ID token validation failed: {error}")
@@ -273,22 +308,10 @@ class MSALAdminCallbackView(View):
             return None
 
     def _get_config(self):
-        """Get Azure AD configuration including client secret."""
-        try:
-            from .config_models import AzureADConfiguration
-            config = AzureADConfiguration.get_active_config()
-
-            if config:
-                return (config.tenant_id, config.client_id, config.client_secret)
-        except Exception:
-            pass
-
-        # Fall back to settings
-        tenant_id = getattr(settings, 'AZURE_AD_TENANT_ID', None)
-        client_id = getattr(settings, 'AZURE_AD_CLIENT_ID', None)
-        client_secret = getattr(settings, 'AZURE_AD_CLIENT_SECRET', None)
-
-        if tenant_id and client_id:
-            return (tenant_id, client_id, client_secret)
+        """
+        Get Azure AD configuration including client secret and a token validator.
 
-        return None
+        Returns:
+            ResolvedAzureConfig or None if not configured
+        """
+        return resolve_azure_config()
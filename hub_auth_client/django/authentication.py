@@ -17,7 +17,6 @@ from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
 
 from ..validators.app import AppTokenValidator
-from ..validators.msal import MSALTokenValidator
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +38,13 @@ class MSALUser:
         self.username = claims.get('upn') or claims.get('unique_name') or claims.get('preferred_username') or self.object_id  # noqa: E501
         self.email = claims.get('email') or claims.get('preferred_username') or claims.get('upn')
         self.name = claims.get('name')
-        self.scopes = claims.get('scp', '').split() if claims.get('scp') else claims.get('scopes', [])
+        scp = claims.get('scp')
+        self.scopes = scp.split() if scp else claims.get('scopes', [])
         self.roles = claims.get('roles', [])
         self.groups = claims.get('groups', [])
+        # Precomputed sets for O(1) membership checks in permission classes
+        self._scope_set = frozenset(self.scopes)
+        self._role_set = frozenset(self.roles)
         self.is_authenticated = True
         self.is_active = True
         self.is_anonymous = False
@@ -57,19 +60,19 @@ class MSALUser:
 
     def has_scope(self, scope: str) -> bool:
         """Check if user has a specific scope."""
-        return scope in self.scopes
+        return scope in self._scope_set
 
     def has_role(self, role: str) -> bool:
         """Check if user has a specific role."""
-        return role in self.roles
+        return role in self._role_set
 
     def has_any_scope(self, scopes: list) -> bool:
         """Check if user has any of the specified scopes."""
-        return any(scope in self.scopes for scope in scopes)
+        return not self._scope_set.isdisjoint(scopes)
 
     def has_all_scopes(self, scopes: list) -> bool:
         """Check if user has all of the specified scopes."""
-        return all(scope in self.scopes for scope in scopes)
+        return self._scope_set.issuperset(scopes)
 
 
 class MSALAuthentication(authentication.BaseAuthentication):
@@ -86,40 +89,23 @@ class MSALAuthentication(authentication.BaseAuthentication):
     def __init__(self):
         super().__init__()
 
-        # Try to get config from database first
-        try:
-            from .config_models import AzureADConfiguration
-            db_config = AzureADConfiguration.get_active_config()
-
-            if db_config:
-                logger.info(f"Using Azure AD configuration '{db_config.name}' from database")
-                self.validator = db_config.create_validator()
-                self.exempt_paths = db_config.get_exempt_paths()
-                self.app_validator = self._build_app_validator()
-                return
-        except Exception as e:
-            logger.debug(f"Could not load config from database: {e}")
-
-        # Fallback to settings.py configuration
-        tenant_id = getattr(settings, 'AZURE_AD_TENANT_ID', None)
-        client_id = getattr(settings, 'AZURE_AD_CLIENT_ID', None)
-
-        if not tenant_id or not client_id:
+        # Database config first, then settings.py
+        from .config_models import resolve_azure_config
+        config = resolve_azure_config()
+
+        if not config:
             raise ValueError(
                 "Either configure Azure AD via Django admin (AzureADConfiguration model) "
                 "or set AZURE_AD_TENANT_ID and AZURE_AD_CLIENT_ID in Django settings"
             )
 
-        logger.info("Using Azure AD configuration from settings.py")
-        self.validator = MSALTokenValidator(
-            tenant_id=tenant_id,
-            client_id=client_id,
-            validate_audience=getattr(settings, 'MSAL_VALIDATE_AUDIENCE', True),
-            validate_issuer=getattr(settings, 'MSAL_VALIDATE_ISSUER', True),
-            leeway=getattr(settings, 'MSAL_TOKEN_LEEWAY', 0),
-        )
-        self.exempt_paths = getattr(settings, 'MSAL_EXEMPT_PATHS', [])
+        if config.name:
+            logger.info(f"Using Azure AD configuration '{config.name}' from database")
+        else:
+            logger.info("Using Azure AD configuration from settings.py")
 
+        self.validator = config.validator
+        self.exempt_paths = config.exempt_paths
         self.app_validator = self._build_app_validator()
 
     def _build_app_validator(self) -> Optional[AppTokenValidator]:
@@ -171,11 +157,9 @@ class MSALAuthentication(authentication.BaseAuthentication):
 
         # Validate token
         is_valid, claims, error = self.validator.validate_token(auth_header)
-        used_app_token = False
 
         if not is_valid and self.app_validator:
             is_valid, claims, error = self.app_validator.validate_token(auth_header)
-            used_app_token = is_valid
 
         if not is_valid:
             # Return None instead of raising AuthenticationFailed to allow other
@@ -185,7 +169,7 @@ class MSALAuthentication(authentication.BaseAuthentication):
             return None
 
         # Create user object from claims
-        user = MSALUser(claims) if not used_app_token else MSALUser(claims)
+        user = MSALUser(claims)
 
         return (user, claims)
 
@@ -4,9 +4,41 @@ Configuration models for storing Azure AD credentials in database.
 This allows managing MSAL configuration through Django admin instead of environment variables.
 """
 
+import functools
+import logging
+from typing import Any, List, NamedTuple, Optional
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+
+from ..utils.json_helpers import loads as json_loads
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONField(models.JSONField):
+    """
+    JSONField that decodes database values with orjson when it is installed.
+
+    Deconstructs as a plain ``models.JSONField`` so migrations are unaffected.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if self.decoder is not None or not isinstance(value, (str, bytes)):
+            return super().from_db_value(value, expression, connection)
+        try:
+            return json_loads(value)
+        except ValueError:
+            return value
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        return name, 'django.db.models.JSONField', args, kwargs
 
 
 class AzureADConfiguration(models.Model):
@@ -81,7 +113,7 @@ class AzureADConfiguration(models.Model):
     )
 
     # Exempt paths (URLs that don't require authentication)
-    exempt_paths = models.JSONField(
+    exempt_paths = FastJSONField(
         default=list,
         blank=True,
         help_text="URL patterns to exempt from authentication (e.g., ['/admin/', '/health/'])"
@@ -103,33 +135,87 @@ class AzureADConfiguration(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.CharField(max_length=100, blank=True)
 
+    # Columns loaded by get_active_config(); audit/metadata fields stay deferred
+    RUNTIME_FIELDS = (
+        'name',
+        'tenant_id',
+        'client_id',
+        'client_secret',
+        'token_version',
+        'validate_audience',
+        'validate_issuer',
+        'token_leeway',
+        'exempt_paths',
+        'is_active',
+    )
+
     class Meta:
         verbose_name = "Azure AD Configuration"
         verbose_name_plural = "Azure AD Configurations"
         ordering = ['-is_active', 'name']
+        constraints = [
+            # Partial unique index: the database enforces "only one active
+            # configuration" in the same statement as the write.
+            models.UniqueConstraint(
+                fields=['is_active'],
+                condition=models.Q(is_active=True),
+                name='only_one_active_config',
+                violation_error_message="Only one configuration can be active at a time.",
+            ),
+        ]
 
     def __str__(self):
         status = "✓ Active" if self.is_active else "Inactive"
         return f"{self.name} ({status})"
 
-    def clean(self):
-        """Ensure only one configuration is active at a time."""
-        if self.is_active:
-            # Check if another active config exists
-            active_configs = AzureADConfiguration.objects.filter(is_active=True)
+    def save(self, *args, **kwargs):
+        """
+        Save the configuration.
+
+        The single-active invariant is enforced by the ``only_one_active_config``
+        constraint, so no existence check is issued before the write. A constraint
+        violation is reported as a ValidationError naming the active configuration.
+        """
+        # Settings may have changed; rebuild the validator on next access
+        self.__dict__.pop('validator', None)
+
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError as e:
+            if not self.is_active or not self._violates_single_active(e):
+                raise
+
+            active_config = AzureADConfiguration.objects.filter(is_active=True)
             if self.pk:
-                active_configs = active_configs.exclude(pk=self.pk)
+                active_config = active_config.exclude(pk=self.pk)
+            active_config = active_config.first()
 
-            if active_configs.exists():
-                raise ValidationError(
-                    f"Configuration '{active_configs.first().name}' is already active. "
-                    f"Only one configuration can be active at a time."
-                )
+            if active_config is None:
+                raise
 
-    def save(self, *args, **kwargs):
-        """Validate before saving."""
-        self.clean()
-        super().save(*args, **kwargs)
+            raise ValidationError(
+                f"Configuration '{active_config.name}' is already active. "
+                f"Only one configuration can be active at a time."
+            )
+
+    @classmethod
+    def _violates_single_active(cls, error):
+        """
+        Whether an IntegrityError comes from the ``only_one_active_config`` constraint.
+
+        PostgreSQL reports the constraint name (also in the message); SQLite only
+        names the indexed column.
+        """
+        diag = getattr(error.__cause__, 'diag', None)
+        constraint_name = getattr(diag, 'constraint_name', None)
+        if constraint_name:
+            return constraint_name == 'only_one_active_config'
+        message = str(error)
+        return (
+            'only_one_active_config' in message
+            or message.endswith(f'{cls._meta.db_table}.is_active')
+        )
 
     def get_exempt_paths(self):
         """Get exempt paths as a list."""
@@ -157,28 +243,39 @@ class AzureADConfiguration(models.Model):
         """
         Get the active Azure AD configuration.
 
+        Single LIMIT 1 query served by the ``only_one_active_config`` partial index,
+        loading only the columns needed at runtime (see ``RUNTIME_FIELDS``).
+
         Returns:
             AzureADConfiguration or None
         """
-        try:
-            return cls.objects.get(is_active=True)
-        except cls.DoesNotExist:
-            return None
-        except cls.MultipleObjectsReturned:
-            # Shouldn't happen due to validation, but handle it
-            return cls.objects.filter(is_active=True).first()
-
-    def create_validator(self):
+        return (
+            cls.objects.filter(is_active=True)
+            .only(*cls.RUNTIME_FIELDS)
+            .order_by('-updated_at')
+            .first()
+        )
+
+    @cached_property
+    def validator(self):
         """
-        Create a configured MSALTokenValidator instance from this config.
+        MSALTokenValidator for this config, built once per instance.
 
-        Returns:
-            MSALTokenValidator instance
+        Reusing the instance keeps its JWKS client (and cached signing keys) warm.
         """
         from hub_auth_client import MSALTokenValidator
 
         return MSALTokenValidator(**self.get_validator_config())
 
+    def create_validator(self):
+        """
+        Get a configured MSALTokenValidator instance from this config.
+
+        Returns:
+            MSALTokenValidator instance (cached on this config)
+        """
+        return self.validator
+
     @classmethod
     def get_validator(cls):
         """
@@ -188,12 +285,80 @@ class AzureADConfiguration(models.Model):
             MSALTokenValidator or None if no active config
         """
         config = cls.get_active_config()
-        if not config:
-            return None
+        return config.validator if config else None
 
-        from hub_auth_client import MSALTokenValidator
 
-        return MSALTokenValidator(**config.get_validator_config())
+class ResolvedAzureConfig(NamedTuple):
+    """Azure AD settings resolved from the active database config or Django settings."""
+
+    tenant_id: str
+    client_id: str
+    client_secret: Optional[str]
+    exempt_paths: List[str]
+    validator: Any
+    name: Optional[str]  # Configuration name when loaded from the database
+
+
+def resolve_azure_config() -> Optional[ResolvedAzureConfig]:
+    """
+    Resolve Azure AD configuration: active database config first, then Django settings.
+
+    Returns:
+        ResolvedAzureConfig or None if neither source is configured
+    """
+    try:
+        config = AzureADConfiguration.get_active_config()
+    except Exception as e:
+        logger.debug(f"Could not load config from database: {e}")
+        config = None
+
+    if config:
+        return ResolvedAzureConfig(
+            tenant_id=config.tenant_id,
+            client_id=config.client_id,
+            client_secret=config.client_secret,
+            exempt_paths=config.get_exempt_paths(),
+            validator=config.validator,
+            name=config.name,
+        )
+
+    return _resolve_settings_config()
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_settings_config() -> Optional[ResolvedAzureConfig]:
+    """Build the settings.py fallback once; settings are immutable at runtime."""
+    tenant_id = getattr(settings, 'AZURE_AD_TENANT_ID', None)
+    client_id = getattr(settings, 'AZURE_AD_CLIENT_ID', None)
+
+    if not tenant_id or not client_id:
+        return None
+
+    from hub_auth_client import MSALTokenValidator
+
+    validator = MSALTokenValidator(
+        tenant_id=tenant_id,
+        client_id=client_id,
+        validate_audience=getattr(settings, 'MSAL_VALIDATE_AUDIENCE', True),
+        validate_issuer=getattr(settings, 'MSAL_VALIDATE_ISSUER', True),
+        leeway=getattr(settings, 'MSAL_TOKEN_LEEWAY', 0),
+    )
+
+    return ResolvedAzureConfig(
+        tenant_id=tenant_id,
+        client_id=client_id,
+        client_secret=getattr(settings, 'AZURE_AD_CLIENT_SECRET', None),
+        exempt_paths=getattr(settings, 'MSAL_EXEMPT_PATHS', []),
+        validator=validator,
+        name=None,
+    )
+
+
+@receiver(setting_changed)
+def _clear_settings_config(setting, **kwargs):
+    """Drop the cached settings fallback when tests override Azure AD settings."""
+    if setting.startswith(('AZURE_AD_', 'MSAL_')):
+        _resolve_settings_config.cache_clear()
 
 
 class AzureADConfigurationHistory(models.Model):
@@ -252,3 +417,42 @@ class AzureADConfigurationHistory(models.Model):
 
     def __str__(self):
         return f"{self.configuration_name} - {self.action} at {self.changed_at}"
+
+    @classmethod
+    def for_configuration(cls, configuration, action, changed_by='', details=''):
+        """
+        Build an unsaved history entry for a configuration.
+
+        Args:
+            configuration: AzureADConfiguration instance
+            action: One of ACTION_CHOICES
+            changed_by: Username of the user who made the change
+            details: Additional details about the change
+
+        Returns:
+            AzureADConfigurationHistory (not yet saved)
+        """
+        return cls(
+            configuration=configuration,
+            configuration_name=configuration.name,
+            action=action,
+            tenant_id=configuration.tenant_id,
+            client_id=configuration.client_id,
+            changed_by=changed_by,
+            details=details,
+        )
+
+    @classmethod
+    def log(cls, entries):
+        """
+        Write history entries with one bulk INSERT after the current transaction commits.
+
+        Entries are dropped if the surrounding transaction rolls back, so the audit
+        log never records a change that was not persisted.
+
+        Args:
+            entries: Iterable of unsaved AzureADConfigurationHistory instances
+        """
+        rows = list(entries)
+        if rows:
+            transaction.on_commit(lambda: cls.objects.bulk_create(rows, batch_size=100))
@@ -16,16 +16,40 @@ Usage:
 """
 
 import functools
+import hashlib
+import time
 from typing import Callable, List
 
 from django.conf import settings
-from django.http import JsonResponse
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, JsonResponse
 
+from ..utils.ttl_cache import TTLCache
 from ..validator import MSALTokenValidator
 
+# Successful validations are reused for a short window so repeated calls with
+# the same bearer token skip signature verification.
+_VERIFY_CACHE_TTL = 30
+_verify_cache = TTLCache(maxsize=10000, ttl=_VERIFY_CACHE_TTL)
 
+# Same bytes JsonResponse would produce, encoded once at import
+_MISSING_AUTH_BODY = b'{"error": "Missing Authorization header"}'
+
+
+def _missing_auth_response():
+    """Build the 401 response for requests without an Authorization header."""
+    return HttpResponse(_MISSING_AUTH_BODY, status=401, content_type='application/json')
+
+
+@functools.lru_cache(maxsize=1)
 def get_validator():
-    """Get or create MSALTokenValidator instance."""
+    """
+    Get the shared MSALTokenValidator instance.
+
+    Built once from Django settings and reused by every decorated view, so the
+    JWKS client and its cached signing keys survive across requests.
+    """
     tenant_id = getattr(settings, 'AZURE_AD_TENANT_ID', None)
     client_id = getattr(settings, 'AZURE_AD_CLIENT_ID', None)
 
@@ -43,17 +67,59 @@ def get_validator():
     )
 
 
-def require_token(view_func: Callable) -> Callable:
+def _reset_validator():
+    """Drop the cached validator so the next call rebuilds it from settings."""
+    get_validator.cache_clear()
+    _verify_cache.clear()
+
+
+def _validate_cached(validator, auth_header: str, requirements_key: tuple = (), **requirements):
     """
-    Decorator that requires a valid MSAL token.
+    Validate a token, reusing a recent successful result for the same token.
 
-    Attaches token claims to request.msal_token and user info to request.msal_user.
+    Only valid results are cached, keyed by a digest of the Authorization
+    header and the decorator's requirements, and never past the token's exp.
+    """
+    key = (
+        id(validator),
+        hashlib.blake2b(auth_header.encode(), digest_size=16).digest(),
+        requirements_key,
+    )
+    result = _verify_cache.get(key)
+    if result is not None:
+        return result
+
+    result = validator.validate_token(auth_header, **requirements)
+    is_valid, claims, _ = result
+    if is_valid and claims:
+        ttl: float = _VERIFY_CACHE_TTL
+        exp = claims.get('exp')
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+        _verify_cache.set(key, result, ttl)
+    return result
+
+
+@receiver(setting_changed)
+def _clear_validator_on_setting_change(setting, **kwargs):
+    """Rebuild the validator when tests override Azure AD settings."""
+    if setting.startswith(('AZURE_AD_', 'MSAL_')):
+        _reset_validator()
+
+
+def _token_required(
+    view_func: Callable,
+    failure_error: str,
+    failure_status: int,
+    requirements_key: tuple = (),
+    **requirements,
+) -> Callable:
+    """
+    Build the validating wrapper for one decorated view.
 
-    Usage:
-        @require_token
-        def my_view(request):
-            user_id = request.msal_user['object_id']
-            ...
+    The failure response and validator requirements are bound once here, so
+    each decorator gets a wrapper specialized to its arguments with no
+    per-request branching on which checks apply.
     """
     @functools.wraps(view_func)
     def wrapper(request, *args, **kwargs):
@@ -61,19 +127,18 @@ def require_token(view_func: Callable) -> Callable:
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
 
         if not auth_header:
-            return JsonResponse(
-                {'error': 'Missing Authorization header'},
-                status=401
-            )
+            return _missing_auth_response()
 
-        # Validate token
+        # Validate token with this decorator's requirements
         validator = get_validator()
-        is_valid, claims, error = validator.validate_token(auth_header)
+        is_valid, claims, error = _validate_cached(
+            validator, auth_header, requirements_key, **requirements
+        )
 
         if not is_valid:
             return JsonResponse(
-                {'error': 'Invalid token', 'message': error},
-                status=401
+                {'error': failure_error, 'message': error},
+                status=failure_status
             )
 
         # Attach to request
@@ -85,6 +150,21 @@ def require_token(view_func: Callable) -> Callable:
     return wrapper
 
 
+def require_token(view_func: Callable) -> Callable:
+    """
+    Decorator that requires a valid MSAL token.
+
+    Attaches token claims to request.msal_token and user info to request.msal_user.
+
+    Usage:
+        @require_token
+        def my_view(request):
+            user_id = request.msal_user['object_id']
+            ...
+    """
+    return _token_required(view_func, 'Invalid token', 401)
+
+
 def require_scopes(required_scopes: List[str], require_all: bool = False) -> Callable:
     """
     Decorator that requires specific scopes.
@@ -104,39 +184,22 @@ def require_scopes(required_scopes: List[str], require_all: bool = False) -> Cal
             # User has both scopes
             ...
     """
-    def decorator(view_func: Callable) -> Callable:
-        @functools.wraps(view_func)
-        def wrapper(request, *args, **kwargs):
-            # Get token from Authorization header
-            auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-
-            if not auth_header:
-                return JsonResponse(
-                    {'error': 'Missing Authorization header'},
-                    status=401
-                )
-
-            # Validate token with scope requirements
-            validator = get_validator()
-            is_valid, claims, error = validator.validate_token(
-                auth_header,
-                required_scopes=required_scopes,
-                require_all_scopes=require_all,
-            )
-
-            if not is_valid:
-                return JsonResponse(
-                    {'error': 'Insufficient scopes', 'message': error},
-                    status=403
-                )
+    if not required_scopes:
+        # Nothing to check beyond a valid token
+        return require_token
 
-            # Attach to request
-            request.msal_token = claims
-            request.msal_user = validator.extract_user_info(claims)
+    scopes = tuple(required_scopes)
+    requirements_key = ('scopes', scopes, require_all)
 
-            return view_func(request, *args, **kwargs)
-
-        return wrapper
+    def decorator(view_func: Callable) -> Callable:
+        return _token_required(
+            view_func,
+            'Insufficient scopes',
+            403,
+            requirements_key,
+            required_scopes=scopes,
+            require_all_scopes=require_all,
+        )
 
     return decorator
 
@@ -155,38 +218,21 @@ def require_roles(required_roles: List[str], require_all: bool = False) -> Calla
             # User has at least one of the required roles
             ...
     """
-    def decorator(view_func: Callable) -> Callable:
-        @functools.wraps(view_func)
-        def wrapper(request, *args, **kwargs):
-            # Get token from Authorization header
-            auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-
-            if not auth_header:
-                return JsonResponse(
-                    {'error': 'Missing Authorization header'},
-                    status=401
-                )
-
-            # Validate token with role requirements
-            validator = get_validator()
-            is_valid, claims, error = validator.validate_token(
-                auth_header,
-                required_roles=required_roles,
-                require_all_roles=require_all,
-            )
-
-            if not is_valid:
-                return JsonResponse(
-                    {'error': 'Insufficient roles', 'message': error},
-                    status=403
-                )
+    if not required_roles:
+        # Nothing to check beyond a valid token
+        return require_token
 
-            # Attach to request
-            request.msal_token = claims
-            request.msal_user = validator.extract_user_info(claims)
+    roles = tuple(required_roles)
+    requirements_key = ('roles', roles, require_all)
 
-            return view_func(request, *args, **kwargs)
-
-        return wrapper
+    def decorator(view_func: Callable) -> Callable:
+        return _token_required(
+            view_func,
+            'Insufficient roles',
+            403,
+            requirements_key,
+            required_roles=roles,
+            require_all_roles=require_all,
+        )
 
     return decorator
@@ -5,13 +5,334 @@ These permission classes check the database for endpoint-specific requirements
 instead of hardcoding scopes/roles.
 """
 
+import functools
 import logging
+import re
+import uuid
 
 from django.core.cache import cache
+from django.db.models import Prefetch
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from rest_framework import permissions
 
+from ..utils.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Bumped whenever endpoint permissions change; kept in the Django cache so
+# every process sharing it drops its in-process lookup results together.
+# Invalidation across processes therefore needs a shared cache backend
+# (Redis, Memcached, database); with a per-process cache such as the default
+# LocMemCache other workers only notice through the timeout below. The
+# timeout also bounds staleness after changes that send no signals
+# (queryset.update(), bulk_create(), raw SQL, fixtures).
+_VERSION_CACHE_KEY = 'endpoint_perm:version'
+_VERSION_TIMEOUT = 60
+
+# Paths with no endpoint permission, kept in-process for the same minute the
+# shared cache used to hold them (a cached None reads back as a miss there).
+# Keyed by (version, path, method) so a permission added in another process
+# takes effect as soon as the shared version changes.
+_negative_cache = TTLCache(maxsize=50000, ttl=60)
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def _permissions_version():
+    """Return the current endpoint permission version token."""
+    return cache.get_or_set(_VERSION_CACHE_KEY, _new_version, _VERSION_TIMEOUT)
+
+
+@receiver([post_save, post_delete], sender='hub_auth_client.EndpointPermission')
+@receiver([post_save, post_delete], sender='hub_auth_client.ScopeDefinition')
+@receiver([post_save, post_delete], sender='hub_auth_client.RoleDefinition')
+@receiver(m2m_changed, sender='hub_auth_client.EndpointPermission_required_scopes')
+@receiver(m2m_changed, sender='hub_auth_client.EndpointPermission_required_roles')
+def _bump_permissions_version(**kwargs):
+    """Invalidate in-process lookups after an endpoint permission changes."""
+    cache.set(_VERSION_CACHE_KEY, _new_version(), _VERSION_TIMEOUT)
+    _negative_cache.clear()
+
+
+# Numbered or named backreferences would point at the wrong group once a
+# pattern is wrapped into the combined alternation.
+_GROUP_REFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+def _combine_patterns(entries):
+    """
+    Join (pattern, permission id) entries into one alternation regex.
+
+    Each pattern is wrapped in a named group p<id> so the winning permission
+    can be read from match.lastgroup. Alternatives are tried left to right,
+    so priority order is preserved. Returns None when the patterns cannot be
+    combined safely (backreferences, clashing group names, inline flags),
+    in which case callers scan the entries one by one.
+    """
+    if not entries or any(_GROUP_REFERENCE.search(pattern.pattern) for pattern, _ in entries):
+        return None
+    try:
+        return re.compile('|'.join(
+            f'(?P<p{perm_id}>{pattern.pattern})' for pattern, perm_id in entries
+        ))
+    except re.error:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _build_matcher_table(version):
+    """
+    Compile the active endpoint permissions into per-method matchers.
+
+    Maps each HTTP method to (combined regex or None, entries), where entries
+    are the priority-ordered (compiled url pattern, permission id) pairs for
+    permissions allowing that method. Patterns that fail to compile are
+    skipped, as in matches_request().
+    """
+    from .models import EndpointPermission
+
+    entries_by_method = {}
+    permissions = EndpointPermission.objects.filter(
+        is_active=True
+    ).order_by('-priority').only('id', 'url_pattern', 'http_methods')
+    for perm in permissions:
+        try:
+            pattern = re.compile(perm.url_pattern)
+        except re.error:
+            logger.warning(f"Skipping endpoint permission {perm.pk} with invalid pattern {perm.url_pattern!r}")
+            continue
+        for method in perm.get_http_methods():
+            entries_by_method.setdefault(method, []).append((pattern, perm.pk))
+
+    return {
+        method: (_combine_patterns(entries), tuple(entries))
+        for method, entries in entries_by_method.items()
+    }
+
+
+def _match_permission_id(matcher, path):
+    """Return the id of the first permission in matcher whose pattern matches path."""
+    combined, entries = matcher
+    if combined is not None:
+        match = combined.match(path)
+        return int(match.lastgroup[1:]) if match else None
+    for pattern, perm_id in entries:
+        if pattern.match(path):
+            return perm_id
+    return None
+
+
+@functools.lru_cache(maxsize=2048)
+def _match_endpoint_permission(path, method, version):
+    """
+    Find the highest-priority active EndpointPermission matching a request.
+
+    The version token is part of the cache key, so results are reused until
+    an endpoint permission is saved or deleted, or the token expires.
+    """
+    matcher = _build_matcher_table(version).get(method.upper())
+    perm_id = _match_permission_id(matcher, path) if matcher else None
+    if perm_id is None:
+        return None
+    return _load_endpoint_permission(perm_id, version)
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_endpoint_permission(perm_id, version):
+    """
+    Load one endpoint permission with its requirements for a version.
+
+    Distinct paths matching the same permission (e.g. detail URLs) share the
+    loaded object instead of querying for it again.
+    """
+    from .models import EndpointPermission, RoleDefinition, ScopeDefinition
+
+    # Only the columns the permission checks read
+    perm = EndpointPermission.objects.only(
+        'id', 'name', 'url_pattern', 'http_methods', 'scope_requirement',
+        'role_requirement', 'is_active', 'priority',
+    ).prefetch_related(
+        Prefetch('required_scopes', queryset=ScopeDefinition.objects.only('id', 'name', 'is_active')),
+        Prefetch('required_roles', queryset=RoleDefinition.objects.only('id', 'name', 'is_active')),
+    ).filter(pk=perm_id).first()
+    return _prepare_requirements(perm) if perm is not None else None
+
+
+def _prepare_requirements(perm):
+    """
+    Attach the scope and role requirements checked on every request.
+
+    Built from the prefetched relations, so cached permissions are checked
+    without further queries. The counts include inactive definitions. Names
+    are kept sorted alongside the frozensets used for membership checks.
+    """
+    scopes = perm.required_scopes.all()
+    roles = perm.required_roles.all()
+    perm._scope_count = len(scopes)
+    perm._scope_names = tuple(sorted(scope.name for scope in scopes if scope.is_active))
+    perm._required_scope_set = frozenset(perm._scope_names)
+    perm._role_count = len(roles)
+    perm._role_names = tuple(sorted(role.name for role in roles if role.is_active))
+    perm._required_role_set = frozenset(perm._role_names)
+    perm._requires_all_scopes = perm.scope_requirement == 'all'
+    perm._requires_all_roles = perm.role_requirement == 'all'
+    return perm
+
+
+def _lookup_endpoint_permission(path, method):
+    """Get the endpoint permission for a request path and method, with caching."""
+    # The version is part of every key so a permission change retires all
+    # cached entries, not just the in-process lookups
+    version = _permissions_version()
+
+    # Known unprotected paths skip the shared path entry
+    if _negative_cache.get((version, path, method)):
+        return None
+
+    cache_key = f"endpoint_perm:{version}:{path}:{method}"
+
+    # Try cache first
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    perm = _match_endpoint_permission(path, method, version)
+    if perm is not None:
+        # Cache for 5 minutes
+        cache.set(cache_key, perm, 300)
+    else:
+        # No match found - remember it in-process for 1 minute
+        _negative_cache.set((version, path, method), True)
+    return perm
+
+
+def _extract_user_scopes(request):
+    """
+    Get user's scopes from token.
+
+    Parsed once per request and memoized on it, so every permission class
+    checked for the request reuses the same set.
+    """
+    cached = getattr(request, '_msal_scopes_set', None)
+    if cached is not None:
+        return cached
+
+    user_scopes = getattr(request.user, 'scopes', None)
+    if user_scopes is not None:
+        scopes = frozenset(user_scopes)
+    else:
+        auth = getattr(request, 'auth', None)
+        if auth:
+            scopes = frozenset(auth.get('scp', '').split() or auth.get('scopes', ()))
+        else:
+            scopes = frozenset()
+
+    request._msal_scopes_set = scopes
+    return scopes
+
+
+def _extract_user_roles(request):
+    """Get user's roles from token, memoized on the request."""
+    cached = getattr(request, '_msal_roles_set', None)
+    if cached is not None:
+        return cached
+
+    user_roles = getattr(request.user, 'roles', None)
+    if user_roles is not None:
+        roles = frozenset(user_roles)
+    else:
+        auth = getattr(request, 'auth', None)
+        roles = frozenset(auth.get('roles', ())) if auth else frozenset()
+
+    request._msal_roles_set = roles
+    return roles
+
+
+def _satisfies(required_set, user_set, requires_all):
+    """Check a user's scopes or roles against a required set (ALL or ANY)."""
+    if requires_all:
+        return required_set.issubset(user_set)
+    return not required_set.isdisjoint(user_set)
+
+
+def _check_scopes(endpoint_perm, request):
+    """Check if the user has the scopes required by an endpoint permission."""
+    # Check if any scopes are configured (even if inactive)
+    total_configured_scopes = endpoint_perm._scope_count
+
+    # Get required scopes (active only)
+    required_scopes = endpoint_perm._scope_names
+
+    if total_configured_scopes > 0 and not required_scopes:
+        # Scopes are configured but none are active - DENY access
+        logger.warning(
+            f"Scope check failed for {request.user.username} on {request.path}. "
+            f"Scopes are configured ({total_configured_scopes}) but none are active/valid."
+        )
+        return False
+
+    if not required_scopes:
+        # No scopes required
+        return True
+
+    # Get user scopes
+    user_scopes = _extract_user_scopes(request)
+
+    # Check scope requirement
+    has_permission = _satisfies(
+        endpoint_perm._required_scope_set, user_scopes, endpoint_perm._requires_all_scopes
+    )
+
+    if not has_permission:
+        logger.warning(
+            f"Scope check failed for {request.user.username} on {request.path}. "
+            f"Required: {required_scopes} ({endpoint_perm.scope_requirement}), "
+            f"User has: {sorted(user_scopes)}"
+        )
+
+    return has_permission
+
+
+def _check_roles(endpoint_perm, request):
+    """Check if the user has the roles required by an endpoint permission."""
+    # Check if any roles are configured (even if inactive)
+    total_configured_roles = endpoint_perm._role_count
+
+    # Get required roles (active only)
+    required_roles = endpoint_perm._role_names
+
+    if total_configured_roles > 0 and not required_roles:
+        # Roles are configured but none are active - DENY access
+        logger.warning(
+            f"Role check failed for {request.user.username} on {request.path}. "
+            f"Roles are configured ({total_configured_roles}) but none are active/valid."
+        )
+        return False
+
+    if not required_roles:
+        # No roles required
+        return True
+
+    # Get user roles
+    user_roles = _extract_user_roles(request)
+
+    # Check role requirement
+    has_permission = _satisfies(
+        endpoint_perm._required_role_set, user_roles, endpoint_perm._requires_all_roles
+    )
+
+    if not has_permission:
+        logger.warning(
+            f"Role check failed for {request.user.username} on {request.path}. "
+            f"Required: {required_roles} ({endpoint_perm.role_requirement}), "
+            f"User has: {sorted(user_roles)}"
+        )
+
+    return has_permission
+
 
 class DynamicScopePermission(permissions.BasePermission):
     """
@@ -37,87 +358,16 @@ class DynamicScopePermission(permissions.BasePermission):
             logger.debug(f"No endpoint permission found for {request.path}")
             return True
 
-        # Check if any scopes are configured (even if inactive)
-        total_configured_scopes = endpoint_perm.required_scopes.count()
-
-        # Get required scopes (active only)
-        required_scopes = endpoint_perm.get_required_scope_names()
-
-        if total_configured_scopes > 0 and not required_scopes:
-            # Scopes are configured but none are active - DENY access
-            logger.warning(
-                f"Scope check failed for {request.user.username} on {request.path}. "
-                f"Scopes are configured ({total_configured_scopes}) but none are active/valid."
-            )
-            return False
-
-        if not required_scopes:
-            # No scopes required
-            return True
-
-        # Get user scopes
-        user_scopes = self._get_user_scopes(request)
-
-        # Check scope requirement
-        if endpoint_perm.scope_requirement == 'all':
-            # User must have ALL scopes
-            has_permission = all(scope in user_scopes for scope in required_scopes)
-        else:
-            # User must have ANY scope
-            has_permission = any(scope in user_scopes for scope in required_scopes)
-
-        if not has_permission:
-            logger.warning(
-                f"Scope check failed for {request.user.username} on {request.path}. "
-                f"Required: {required_scopes} ({endpoint_perm.scope_requirement}), "
-                f"User has: {user_scopes}"
-            )
-
-        return has_permission
+        return _check_scopes(endpoint_perm, request)
 
     def _get_endpoint_permission(self, request):
         """Get endpoint permission from database with caching."""
-        cache_key = f"endpoint_perm:{request.path}:{request.method}"
-
-        # Try cache first
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        # Query database
         try:
-            from .models import EndpointPermission
-
-            # Get all active permissions ordered by priority
-            permissions = EndpointPermission.objects.filter(
-                is_active=True
-            ).order_by('-priority').prefetch_related('required_scopes', 'required_roles')
-
-            # Find first matching permission
-            for perm in permissions:
-                if perm.matches_request(request.path, request.method):
-                    # Cache for 5 minutes
-                    cache.set(cache_key, perm, 300)
-                    return perm
-
-            # No match found - cache None for 1 minute
-            cache.set(cache_key, None, 60)
-            return None
-
+            return _lookup_endpoint_permission(request.path, request.method)
         except Exception as e:
             logger.error(f"Error loading endpoint permission: {e}", exc_info=True)
             return None
 
-    def _get_user_scopes(self, request):
-        """Get user's scopes from token."""
-        if hasattr(request.user, 'scopes'):
-            return request.user.scopes
-
-        if hasattr(request, 'auth') and request.auth:
-            return request.auth.get('scp', '').split() or request.auth.get('scopes', [])
-
-        return []
-
 
 class DynamicRolePermission(permissions.BasePermission):
     """
@@ -142,81 +392,16 @@ class DynamicRolePermission(permissions.BasePermission):
             logger.debug(f"No endpoint permission found for {request.path}")
             return True
 
-        # Check if any roles are configured (even if inactive)
-        total_configured_roles = endpoint_perm.required_roles.count()
-
-        # Get required roles (active only)
-        required_roles = endpoint_perm.get_required_role_names()
-
-        if total_configured_roles > 0 and not required_roles:
-            # Roles are configured but none are active - DENY access
-            logger.warning(
-                f"Role check failed for {request.user.username} on {request.path}. "
-                f"Roles are configured ({total_configured_roles}) but none are active/valid."
-            )
-            return False
-
-        if not required_roles:
-            # No roles required
-            return True
-
-        # Get user roles
-        user_roles = self._get_user_roles(request)
-
-        # Check role requirement
-        if endpoint_perm.role_requirement == 'all':
-            # User must have ALL roles
-            has_permission = all(role in user_roles for role in required_roles)
-        else:
-            # User must have ANY role
-            has_permission = any(role in user_roles for role in required_roles)
-
-        if not has_permission:
-            logger.warning(
-                f"Role check failed for {request.user.username} on {request.path}. "
-                f"Required: {required_roles} ({endpoint_perm.role_requirement}), "
-                f"User has: {user_roles}"
-            )
-
-        return has_permission
+        return _check_roles(endpoint_perm, request)
 
     def _get_endpoint_permission(self, request):
         """Get endpoint permission from database with caching."""
-        cache_key = f"endpoint_perm:{request.path}:{request.method}"
-
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
         try:
-            from .models import EndpointPermission
-
-            permissions = EndpointPermission.objects.filter(
-                is_active=True
-            ).order_by('-priority').prefetch_related('required_scopes', 'required_roles')
-
-            for perm in permissions:
-                if perm.matches_request(request.path, request.method):
-                    cache.set(cache_key, perm, 300)
-                    return perm
-
-            cache.set(cache_key, None, 60)
-            return None
-
+            return _lookup_endpoint_permission(request.path, request.method)
         except Exception as e:
             logger.error(f"Error loading endpoint permission: {e}", exc_info=True)
             return None
 
-    def _get_user_roles(self, request):
-        """Get user's roles from token."""
-        if hasattr(request.user, 'roles'):
-            return request.user.roles
-
-        if hasattr(request, 'auth') and request.auth:
-            return request.auth.get('roles', [])
-
-        return []
-
 
 class DynamicPermission(permissions.BasePermission):
     """
@@ -230,53 +415,40 @@ class DynamicPermission(permissions.BasePermission):
             permission_classes = [DynamicPermission]
     """
 
-    def __init__(self):
-        self.scope_permission = DynamicScopePermission()
-        self.role_permission = DynamicRolePermission()
-
     def has_permission(self, request, view):
         """Check if user has required scopes AND roles for this endpoint."""
         if not hasattr(request, 'user') or not request.user.is_authenticated:
             return False
 
         # Get endpoint permission from database
-        cache_key = f"endpoint_perm:{request.path}:{request.method}"
-        endpoint_perm = cache.get(cache_key)
+        try:
+            endpoint_perm = _lookup_endpoint_permission(request.path, request.method)
+        except Exception as e:
+            logger.error(f"Error loading endpoint permission: {e}", exc_info=True)
+            return False
 
         if endpoint_perm is None:
-            try:
-                from .models import EndpointPermission
-
-                permissions = EndpointPermission.objects.filter(
-                    is_active=True
-                ).order_by('-priority').prefetch_related('required_scopes', 'required_roles')
-
-                for perm in permissions:
-                    if perm.matches_request(request.path, request.method):
-                        endpoint_perm = perm
-                        cache.set(cache_key, perm, 300)
-                        break
-
-                if endpoint_perm is None:
-                    cache.set(cache_key, None, 60)
-                    return True  # No permission defined
-
-            except Exception as e:
-                logger.error(f"Error loading endpoint permission: {e}", exc_info=True)
-                return False
-
-        # Check scopes if required
-        required_scopes = endpoint_perm.get_required_scope_names()
-        if required_scopes:
-            has_scopes = self.scope_permission.has_permission(request, view)
-            if not has_scopes:
-                return False
-
-        # Check roles if required
-        required_roles = endpoint_perm.get_required_role_names()
-        if required_roles:
-            has_roles = self.role_permission.has_permission(request, view)
-            if not has_roles:
-                return False
+            return True  # No permission defined
+
+        # Check scopes and roles in one pass over the request's claims
+        scopes_ok = not endpoint_perm._scope_names or _satisfies(
+            endpoint_perm._required_scope_set,
+            _extract_user_scopes(request),
+            endpoint_perm._requires_all_scopes,
+        )
+        roles_ok = scopes_ok and (not endpoint_perm._role_names or _satisfies(
+            endpoint_perm._required_role_set,
+            _extract_user_roles(request),
+            endpoint_perm._requires_all_roles,
+        ))
+
+        if not roles_ok:
+            logger.warning(
+                f"Permission check failed for {request.user.username} on {request.path}. "
+                f"Required scopes: {endpoint_perm._scope_names} ({endpoint_perm.scope_requirement}), "
+                f"required roles: {endpoint_perm._role_names} ({endpoint_perm.role_requirement}), "
+                f"user scopes: {sorted(_extract_user_scopes(request))}, "
+                f"user roles: {sorted(_extract_user_roles(request))}"
+            )
 
-        return True
+        return roles_ok
@@ -12,15 +12,53 @@ Usage:
 """
 
 import json
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+from urllib.parse import quote, urlencode
 
 import requests
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from hub_auth_client.utils.http import build_session, get_client_credentials_token, odata_str
+from hub_auth_client.utils.json_helpers import loads as json_loads
+
+
+# Microsoft Graph endpoints used by this command
+_GRAPH_APP_URL = 'https://graph.microsoft.com/v1.0/applications'
+_GRAPH_SP_URL = 'https://graph.microsoft.com/v1.0/servicePrincipals'
+_GRAPH_BATCH_URL = 'https://graph.microsoft.com/v1.0/$batch'
+
+# Microsoft Graph's own service principal
+_MS_GRAPH_APP_ID = '00000003-0000-0000-c000-000000000000'
+_MS_GRAPH_FILTER = f"appId eq '{_MS_GRAPH_APP_ID}'"
+
+# Only the fields this command reads, to keep Graph payloads small
+_ROLE_FIELDS = 'id,appId,displayName,appRoles'
+
+# Encoder fragments joined per stdout write when streaming JSON output
+_JSON_WRITE_CHUNKS = 1024
+
+
+@lru_cache(maxsize=None)
+def _role_model():
+    """Import RoleDefinition on first use; raises ImportError if the app is missing."""
+    from hub_auth_client.django.models import RoleDefinition
+    return RoleDefinition
 
 
 class Command(BaseCommand):
     help = 'Fetch App Roles from Azure AD App Registration'
 
+    @cached_property
+    def session(self):
+        """Pooled HTTP session shared by the token and Graph requests."""
+        return build_session()
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--format',
@@ -55,6 +93,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Include Microsoft Graph roles (e.g., User.Read, Mail.Send)'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per INSERT/UPDATE statement when importing (default: 500)'
+        )
 
     def handle(self, *args, **options):
         # Get Azure AD configuration
@@ -72,10 +116,14 @@ class Command(BaseCommand):
             return
 
         # Fetch roles from Azure AD
-        roles = self.fetch_roles_from_azure(config, options.get('include_microsoft', False))
+        # Progress output would corrupt JSON piped to other tools
+        verbose = options['format'] != 'json'
+        roles = self.fetch_roles_from_azure(config, options.get('include_microsoft', False), verbose)
 
         if not roles:
-            self.stdout.write(self.style.WARNING('No App Roles found in Azure AD App Registration.'))
+            # Keep stdout empty rather than non-JSON in --format=json
+            out = self.stdout if verbose else self.stderr
+            out.write(self.style.WARNING('No App Roles found in Azure AD App Registration.'))
             return
 
         # Output roles
@@ -86,7 +134,7 @@ class Command(BaseCommand):
 
         # Import to database if requested
         if options['import_roles']:
-            self.import_roles(roles)
+            self.import_roles(roles, batch_size=options['batch_size'], verbose=verbose)
 
     def get_azure_config(self, options):
         """Get Azure AD configuration from various sources."""
@@ -105,14 +153,14 @@ class Command(BaseCommand):
         # Try database configuration
         try:
             from hub_auth_client.django.config_models import AzureADConfiguration
-            active_config = AzureADConfiguration.objects.filter(is_active=True).first()
+            # Only the credential columns, straight into the config dict
+            active_config = AzureADConfiguration.objects.filter(is_active=True).values(
+                'tenant_id', 'client_id', 'client_secret'
+            ).first()
             if active_config:
-                return {
-                    'tenant_id': active_config.tenant_id,
-                    'client_id': active_config.client_id,
-                    'client_secret': active_config.client_secret
-                }
-        except Exception:
+                return active_config
+        except (ImportError, RuntimeError, DatabaseError):
+            # App not installed or configuration table not migrated yet
             pass
 
         # Try settings
@@ -125,45 +173,47 @@ class Command(BaseCommand):
 
         return None
 
-    def fetch_roles_from_azure(self, config, include_microsoft=False):
+    def fetch_roles_from_azure(self, config, include_microsoft=False, verbose=True):
         """Fetch App Roles from Azure AD using Microsoft Graph API."""
-        tenant_id = config['tenant_id']
         client_id = config['client_id']
-        client_secret = config['client_secret']
-
-        # Get access token for Microsoft Graph
-        token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-        token_data = {
-            'grant_type': 'client_credentials',
-            'client_id': client_id,
-            'client_secret': client_secret,
-            'scope': 'https://graph.microsoft.com/.default'
-        }
 
         try:
-            self.stdout.write('Authenticating with Azure AD...')
-            token_response = requests.post(token_url, data=token_data, timeout=30)
-            token_response.raise_for_status()
-            access_token = token_response.json()['access_token']
+            if verbose:
+                self.stdout.write('Authenticating with Azure AD...')
+            access_token = self._get_access_token(config)
 
             headers = {
                 'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                # Compressed bodies without per-item @odata annotations
+                'Accept': 'application/json;odata.metadata=none',
+                'Accept-Encoding': 'gzip, deflate',
             }
 
             roles = []
 
             # Get application details from Microsoft Graph
-            graph_url = "https://graph.microsoft.com/v1.0/applications"
             params = {
-                '$filter': f"appId eq '{client_id}'"
+                '$filter': f"appId eq '{odata_str(client_id)}'",
+                '$select': _ROLE_FIELDS,
             }
 
-            self.stdout.write('Fetching application details from Microsoft Graph...')
-            app_response = requests.get(graph_url, headers=headers, params=params, timeout=30)
-            app_response.raise_for_status()
-
-            app_data = app_response.json()
+            if verbose:
+                self.stdout.write('Fetching application details from Microsoft Graph...')
+            batched = {}
+            if include_microsoft:
+                # Fetch the app and Microsoft Graph's roles in one round trip
+                batched = self._graph_batch(headers, {
+                    'app': ('/applications', params),
+                    'ms_graph': ('/servicePrincipals', {'$filter': _MS_GRAPH_FILTER, '$select': _ROLE_FIELDS}),
+                })
+
+            if 'app' in batched:
+                app_data = batched['app']
+            else:
+                app_response = self.session.get(_GRAPH_APP_URL, headers=headers, params=params, timeout=30)
+                app_response.raise_for_status()
+                app_data = json_loads(app_response.content)
 
             if not app_data.get('value'):
                 self.stderr.write(
@@ -174,38 +224,31 @@ class Command(BaseCommand):
             app = app_data['value'][0]
 
             # Display app info
-            self.stdout.write(self.style.SUCCESS("\n✓ Found Application:"))
-            self.stdout.write(f"  Display Name: {app.get('displayName', 'N/A')}")
-            self.stdout.write(f"  App ID: {app.get('appId', 'N/A')}")
-            self.stdout.write(f"  Object ID: {app.get('id', 'N/A')}")
+            if verbose:
+                self.stdout.write(self.style.SUCCESS("\n✓ Found Application:"))
+                self.stdout.write(f"  Display Name: {app.get('displayName', 'N/A')}")
+                self.stdout.write(f"  App ID: {app.get('appId', 'N/A')}")
+                self.stdout.write(f"  Object ID: {app.get('id', 'N/A')}")
 
             # Extract App Roles
             if 'appRoles' in app and app['appRoles']:
                 app_roles = app['appRoles']
-                self.stdout.write(self.style.SUCCESS(f"\n✓ Found {len(app_roles)} App Roles"))
-
-                for role in app_roles:
-                    if not role.get('isEnabled', True):
-                        self.stdout.write(self.style.WARNING(f"  ⚠ Skipping disabled role: {role.get('value', 'N/A')}"))
-                        continue
-
-                    role_value = role.get('value', '')
-                    if not role_value:
-                        continue
-
-                    self.stdout.write(f"  - {role_value}")
-
-                    roles.append({
-                        'name': role_value,
-                        'description': role.get('description', role.get('displayName', '')),
-                        'display_name': role.get('displayName', role_value),
-                        'is_enabled': role.get('isEnabled', True),
-                        'allowed_member_types': role.get('allowedMemberTypes', []),
-                        'id': role.get('id', ''),
-                        'source': 'app_registration',
-                        'category': self.get_role_category(role)
-                    })
-            else:
+                roles = [
+                    self._normalize_role(role, 'app_registration')
+                    for role in app_roles
+                    if role.get('isEnabled', True) and role.get('value')
+                ]
+
+                if verbose:
+                    self.stdout.write(self.style.SUCCESS(f"\n✓ Found {len(app_roles)} App Roles"))
+                    for role in app_roles:
+                        if not role.get('isEnabled', True):
+                            self.stdout.write(self.style.WARNING(
+                                f"  ⚠ Skipping disabled role: {role.get('value', 'N/A')}"
+                            ))
+                        elif role.get('value'):
+                            self.stdout.write(f"  - {role['value']}")
+            elif verbose:
                 self.stdout.write(self.style.WARNING("\n⚠ No App Roles defined in this application"))
                 self.stdout.write(self.style.HTTP_INFO(
                     "\nTo add App Roles:\n"
@@ -217,13 +260,15 @@ class Command(BaseCommand):
 
             # Optionally fetch Microsoft Graph roles
             if include_microsoft:
-                self.stdout.write('\nFetching Microsoft Graph API roles...')
-                ms_roles = self.fetch_microsoft_graph_roles(headers)
+                if verbose:
+                    self.stdout.write('\nFetching Microsoft Graph API roles...')
+                ms_roles = self.fetch_microsoft_graph_roles(headers, batched.get('ms_graph'), verbose)
                 roles.extend(ms_roles)
 
             return roles
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError covers undecodable Graph responses
             self.stderr.write(
                 self.style.ERROR(f'Error fetching roles from Azure AD: {e}')
             )
@@ -233,49 +278,86 @@ class Command(BaseCommand):
                     self.stderr.write(
                         self.style.ERROR(f'Response: {json.dumps(error_data, indent=2)}')
                     )
-                except Exception:
+                except ValueError:
                     self.stderr.write(
                         self.style.ERROR(f'Response: {e.response.text}')
                     )
             return []
 
-    def fetch_microsoft_graph_roles(self, headers):
-        """Fetch available Microsoft Graph App Roles."""
-        roles = []
+    def _get_access_token(self, config):
+        """Get a Microsoft Graph access token, reusing a cached one when still valid."""
+        return get_client_credentials_token(
+            self.session, config['tenant_id'], config['client_id'], config['client_secret']
+        )
+
+    def _graph_batch(self, headers, queries):
+        """
+        Run several Graph GETs in one $batch request.
+
+        Takes {id: (relative path, params)} and returns {id: body} for the
+        sub-requests that succeeded. Returns an empty dict if the batch itself
+        fails, so callers fall back to individual requests.
+        """
+        body = {'requests': [
+            {'id': request_id, 'method': 'GET', 'url': f"{path}?{urlencode(params, quote_via=quote, safe='$')}"}
+            for request_id, (path, params) in queries.items()
+        ]}
         try:
-            # Microsoft Graph Service Principal ID
-            ms_graph_sp_url = "https://graph.microsoft.com/v1.0/servicePrincipals"
-            params = {
-                '$filter': "appId eq '00000003-0000-0000-c000-000000000000'"  # Microsoft Graph
+            response = self.session.post(_GRAPH_BATCH_URL, headers=headers, json=body, timeout=30)
+            response.raise_for_status()
+            return {
+                item['id']: item.get('body') or {}
+                for item in json_loads(response.content).get('responses', [])
+                if item.get('status') == 200
             }
+        except (requests.exceptions.RequestException, ValueError):
+            return {}
 
-            response = requests.get(ms_graph_sp_url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
+    def fetch_microsoft_graph_roles(self, headers, data=None, verbose=True):
+        """Fetch available Microsoft Graph App Roles (or extract them from an already fetched body)."""
+        roles = []
+        try:
+            if data is None:
+                params = {'$filter': _MS_GRAPH_FILTER, '$select': _ROLE_FIELDS}
+
+                response = self.session.get(_GRAPH_SP_URL, headers=headers, params=params, timeout=30)
+                response.raise_for_status()
+
+                data = json_loads(response.content)
 
-            data = response.json()
             if data.get('value'):
                 ms_graph = data['value'][0]
 
                 if 'appRoles' in ms_graph:
-                    self.stdout.write(self.style.SUCCESS(f"\n✓ Found {len(ms_graph['appRoles'])} Microsoft Graph roles"))  # noqa: E501
-
-                    for role in ms_graph['appRoles']:
-                        if role.get('isEnabled', True) and role.get('value'):
-                            roles.append({
-                                'name': role.get('value', ''),
-                                'description': role.get('description', role.get('displayName', '')),
-                                'display_name': role.get('displayName', role.get('value', '')),
-                                'is_enabled': role.get('isEnabled', True),
-                                'allowed_member_types': role.get('allowedMemberTypes', []),
-                                'id': role.get('id', ''),
-                                'source': 'microsoft_graph',
-                                'category': 'microsoft_graph'
-                            })
+                    if verbose:
+                        self.stdout.write(self.style.SUCCESS(f"\n✓ Found {len(ms_graph['appRoles'])} Microsoft Graph roles"))  # noqa: E501
+
+                    roles = [
+                        self._normalize_role(role, 'microsoft_graph', 'microsoft_graph')
+                        for role in ms_graph['appRoles']
+                        if role.get('isEnabled', True) and role.get('value')
+                    ]
         except Exception as e:
-            self.stdout.write(self.style.WARNING(f"Could not fetch Microsoft Graph roles: {e}"))
+            self.stderr.write(self.style.WARNING(f"Could not fetch Microsoft Graph roles: {e}"))
 
         return roles
 
+    def _normalize_role(self, role, source, category=None):
+        """Convert a Graph appRole into the role dict used for output and import."""
+        get = role.get
+        value = get('value') or ''
+        display_name = get('displayName') or ''
+        return {
+            'name': value,
+            'description': get('description') or display_name,
+            'display_name': display_name or value,
+            'is_enabled': get('isEnabled', True),
+            'allowed_member_types': get('allowedMemberTypes') or [],
+            'id': get('id') or '',
+            'source': source,
+            'category': category or self.get_role_category(role),
+        }
+
     def get_role_category(self, role):
         """Determine role category based on allowed member types."""
         member_types = role.get('allowedMemberTypes', [])
@@ -291,68 +373,91 @@ class Command(BaseCommand):
 
     def output_table(self, roles):
         """Output roles as a formatted table."""
-        self.stdout.write(self.style.SUCCESS(f'\n{"="*80}'))
-        self.stdout.write(self.style.SUCCESS(f'Found {len(roles)} App Roles'))
-        self.stdout.write(self.style.SUCCESS(f'{"="*80}\n'))
-
-        # Header
-        header = f"{'Role Name':<30} {'Category':<20} {'Source':<20} {'Enabled':<10}"
-        self.stdout.write(self.style.HTTP_INFO(header))
-        self.stdout.write(self.style.HTTP_INFO('─' * 80))
-
-        # Sort by source then name
-        roles.sort(key=lambda x: (x.get('source', ''), x['name']))
+        success = self.style.SUCCESS
+        warning = self.style.WARNING
+        info = self.style.HTTP_INFO
+
+        lines = [
+            success(f'\n{"="*80}'),
+            success(f'Found {len(roles)} App Roles'),
+            success(f'{"="*80}\n'),
+            # Header
+            info(f"{'Role Name':<30} {'Category':<20} {'Source':<20} {'Enabled':<10}"),
+            info('─' * 80),
+        ]
+
+        # Sort by source then name; a single source only needs the name order
+        if len({role.get('source', '') for role in roles}) > 1:
+            roles.sort(key=lambda x: (x.get('source', ''), x['name']))
+        else:
+            roles.sort(key=itemgetter('name'))
 
         # Rows
         for role in roles:
             name = role['name'][:28]
             category = role.get('category', 'N/A')[:18]
             source = role.get('source', 'N/A')[:18]
-            enabled = '✓' if role.get('is_enabled', True) else '✗'
+            is_enabled = role.get('is_enabled', True)
+            enabled = '✓' if is_enabled else '✗'
 
             row = f"{name:<30} {category:<20} {source:<20} {enabled:<10}"
-
-            if role.get('is_enabled', True):
-                self.stdout.write(self.style.SUCCESS(row))
-            else:
-                self.stdout.write(self.style.WARNING(row))
+            lines.append(success(row) if is_enabled else warning(row))
 
             # Show description
             if role.get('description'):
-                desc = role['description'][:100]
-                self.stdout.write(f"  → {desc}")
+                lines.append(f"  → {role['description'][:100]}")
 
             # Show allowed member types
             if role.get('allowed_member_types'):
                 members = ', '.join(role['allowed_member_types'])
-                self.stdout.write(self.style.HTTP_INFO(f"  ↳ Assignable to: {members}"))
+                lines.append(info(f"  ↳ Assignable to: {members}"))
 
         # Summary by category
-        self.stdout.write('\n' + self.style.SUCCESS('─' * 80))
-        self.stdout.write(self.style.SUCCESS('Summary:'))
-        categories = {}
-        for role in roles:
-            cat = role.get('category', 'unknown')
-            categories[cat] = categories.get(cat, 0) + 1
+        lines.append('\n' + success('─' * 80))
+        lines.append(success('Summary:'))
+        categories = Counter(role.get('category', 'unknown') for role in roles)
 
         for cat, count in sorted(categories.items()):
-            self.stdout.write(f"  {cat}: {count}")
+            lines.append(f"  {cat}: {count}")
 
-        self.stdout.write(self.style.SUCCESS('─' * 80))
+        lines.append(success('─' * 80))
 
-    def output_json(self, roles):
-        """Output roles as JSON."""
-        self.stdout.write(json.dumps(roles, indent=2))
+        self.stdout.write('\n'.join(lines))
 
-    def import_roles(self, roles):
-        """Import roles into RoleDefinition model."""
+    def output_json(self, roles):
+        """Output roles as JSON, streamed in chunks instead of one large string."""
+        write = self.stdout.write
+        pending = []
+        for chunk in json.JSONEncoder(indent=2).iterencode(roles):
+            pending.append(chunk)
+            if len(pending) >= _JSON_WRITE_CHUNKS:
+                write(''.join(pending), ending='')
+                pending.clear()
+        write(''.join(pending))
+
+    def import_roles(self, roles, batch_size=500, verbose=True):
+        """
+        Import roles into RoleDefinition model.
+
+        Without verbose the per-role lines and summary go to stderr, so they
+        don't follow JSON output on stdout.
+        """
+        write = (self.stdout if verbose else self.stderr).write
         try:
-            from hub_auth_client.django.models import RoleDefinition
+            RoleDefinition = _role_model()
 
             created_count = 0
             updated_count = 0
             skipped_count = 0
 
+            # Load every existing role we might touch in one query
+            names = {role_data['name'] for role_data in roles if role_data['name']}
+            known = RoleDefinition.objects.filter(name__in=names).only(
+                'id', 'name', 'description'
+            ).in_bulk(field_name='name')
+            to_create = {}
+            to_update = {}
+
             for role_data in roles:
                 name = role_data['name']
 
@@ -360,49 +465,50 @@ class Command(BaseCommand):
                     skipped_count += 1
                     continue
 
-                # Check if role exists
-                role, created = RoleDefinition.objects.get_or_create(
-                    name=name,
-                    defaults={
-                        'description': role_data.get('description', ''),
-                        'category': role_data.get('category', 'custom'),
-                        'is_active': role_data.get('is_enabled', True)
-                    }
-                )
+                description = role_data.get('description', '')
+                role = known.get(name)
 
-                if created:
+                if role is None:
+                    role = RoleDefinition(
+                        name=name,
+                        description=description,
+                        is_active=role_data.get('is_enabled', True),
+                    )
+                    known[name] = to_create[name] = role
                     created_count += 1
-                    self.stdout.write(
+                    write(
                         self.style.SUCCESS(f'✓ Created role: {name}')
                     )
-                else:
+                elif role.description != description:
                     # Update description if changed
-                    changed = False
-                    if role.description != role_data.get('description', ''):
-                        role.description = role_data.get('description', '')
-                        changed = True
-
-                    if role.category != role_data.get('category', 'custom'):
-                        role.category = role_data.get('category', 'custom')
-                        changed = True
-
-                    if changed:
-                        role.save()
-                        updated_count += 1
-                        self.stdout.write(
-                            self.style.WARNING(f'↻ Updated role: {name}')
-                        )
-                    else:
-                        skipped_count += 1
+                    role.description = description
+                    if name not in to_create:
+                        role.updated_at = timezone.now()
+                        to_update[name] = role
+                    updated_count += 1
+                    write(
+                        self.style.WARNING(f'↻ Updated role: {name}')
+                    )
+                else:
+                    skipped_count += 1
+
+            # Commit creates and updates together
+            with transaction.atomic():
+                RoleDefinition.objects.bulk_create(
+                    to_create.values(), batch_size=batch_size, ignore_conflicts=True
+                )
+                RoleDefinition.objects.bulk_update(
+                    to_update.values(), ['description', 'updated_at'], batch_size=batch_size
+                )
 
             # Summary
-            self.stdout.write('\n' + self.style.SUCCESS('═' * 80))
-            self.stdout.write(self.style.SUCCESS('Import Summary:'))
-            self.stdout.write(self.style.SUCCESS('═' * 80))
-            self.stdout.write(f'  ✓ Created: {created_count}')
-            self.stdout.write(f'  ↻ Updated: {updated_count}')
-            self.stdout.write(f'  ─ Skipped: {skipped_count}')
-            self.stdout.write(self.style.SUCCESS('═' * 80))
+            write('\n' + self.style.SUCCESS('═' * 80))
+            write(self.style.SUCCESS('Import Summary:'))
+            write(self.style.SUCCESS('═' * 80))
+            write(f'  ✓ Created: {created_count}')
+            write(f'  ↻ Updated: {updated_count}')
+            write(f'  ─ Skipped: {skipped_count}')
+            write(self.style.SUCCESS('═' * 80))
 
         except ImportError:
             self.stderr.write(
@@ -6,25 +6,67 @@ Usage:
     python manage.py fetch_azure_scopes
     python manage.py fetch_azure_scopes --import  # Import to database
     python manage.py fetch_azure_scopes --format=json
+    python manage.py fetch_azure_scopes --format=jsonl  # One scope per line
 """
 
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from itertools import islice
+from operator import itemgetter
 
 import requests
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, OutputWrapper
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from hub_auth_client.utils.http import build_session, get_client_credentials_token, odata_str
+from hub_auth_client.utils.json_helpers import loads as json_loads
+
+logger = logging.getLogger(__name__)
+
+# Only the application fields this command reads, to keep Graph payloads small
+_APP_FIELDS = 'id,displayName,appId,identifierUris,api,appRoles,requiredResourceAccess'
+
+_TABLE_HEADER = f"{'Scope Name':<40} {'Category':<15} {'Type':<15} {'Enabled':<10}"
+
+# Encoder fragments joined per stdout write when streaming JSON output
+_JSON_WRITE_CHUNKS = 1024
+
+# Concurrent application lookups for --client-ids; matches the session's pool size
+_MAX_PARALLEL_FETCHES = 20
+
+
+def _discard(*args, **kwargs):
+    """Stand-in for stdout.write when progress output is turned off."""
+
+
+def _permission_keys(obj):
+    """Keys of a Graph object that look related to APIs, scopes or permissions."""
+    return [
+        key for key in obj
+        if 'api' in key.lower() or 'scope' in key.lower() or 'permission' in key.lower()
+    ]
 
 
 class Command(BaseCommand):
     help = 'Fetch available scopes from Azure AD App Registration'
 
+    @cached_property
+    def session(self):
+        """Pooled HTTP session shared by the token and Graph requests."""
+        return build_session()
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--format',
             type=str,
             default='table',
-            choices=['table', 'json'],
-            help='Output format (table, json)'
+            choices=['table', 'json', 'jsonl'],
+            help='Output format (table, json, jsonl)'
         )
         parser.add_argument(
             '--import',
@@ -47,6 +89,21 @@ class Command(BaseCommand):
             type=str,
             help='Azure AD Client Secret (overrides settings)'
         )
+        parser.add_argument(
+            '--client-ids',
+            nargs='+',
+            help='Fetch scopes for these application client IDs instead of the configured one'
+        )
+        parser.add_argument(
+            '--count-only',
+            action='store_true',
+            help='Only report how many scopes of each category the application exposes'
+        )
+        parser.add_argument(
+            '--verbose-import',
+            action='store_true',
+            help='List every created or updated scope during --import, not just the summary'
+        )
 
     def handle(self, *args, **options):
         # Get Azure AD configuration
@@ -63,22 +120,36 @@ class Command(BaseCommand):
             )
             return
 
+        if options.get('count_only'):
+            self.fetch_scopes_from_azure(config, count_only=True)
+            return
+
         # Fetch scopes from Azure AD
-        scopes = self.fetch_scopes_from_azure(config)
+        # Progress output would corrupt JSON piped to other tools
+        verbose = options['format'] == 'table'
+        if options.get('client_ids'):
+            scopes = self.fetch_scopes_for_clients(config, options['client_ids'], verbose)
+        else:
+            scopes = self.fetch_scopes_from_azure(config, verbose=verbose)
+
+        # Messages that aren't part of a JSON document go to stderr
+        report = self.stdout if verbose else self.stderr
 
         if not scopes:
-            self.stdout.write(self.style.WARNING('No scopes found in Azure AD App Registration.'))
+            report.write(self.style.WARNING('No scopes found in Azure AD App Registration.'))
             return
 
         # Output scopes
         if options['format'] == 'json':
             self.output_json(scopes)
+        elif options['format'] == 'jsonl':
+            self.output_jsonl(scopes)
         else:
             self.output_table(scopes)
 
         # Import to database if requested
         if options['import_scopes']:
-            self.import_scopes(scopes)
+            self.import_scopes(scopes, verbose=options['verbose_import'], stdout=report)
 
     def get_azure_config(self, options):
         """Get Azure AD configuration from various sources."""
@@ -97,14 +168,14 @@ class Command(BaseCommand):
         # Try database configuration
         try:
             from hub_auth_client.django.config_models import AzureADConfiguration
-            active_config = AzureADConfiguration.objects.filter(is_active=True).first()
+            # Only the credential columns, straight into the config dict
+            active_config = AzureADConfiguration.objects.filter(is_active=True).values(
+                'tenant_id', 'client_id', 'client_secret'
+            ).first()
             if active_config:
-                return {
-                    'tenant_id': active_config.tenant_id,
-                    'client_id': active_config.client_id,
-                    'client_secret': active_config.client_secret
-                }
-        except Exception:
+                return active_config
+        except (ImportError, RuntimeError, DatabaseError):
+            # App not installed or configuration table not migrated yet
             pass
 
         # Try settings
@@ -117,26 +188,58 @@ class Command(BaseCommand):
 
         return None
 
-    def fetch_scopes_from_azure(self, config):
-        """Fetch scopes from Azure AD using Microsoft Graph API."""
-        tenant_id = config['tenant_id']
-        client_id = config['client_id']
-        client_secret = config['client_secret']
-
-        # Get access token for Microsoft Graph
-        token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-        token_data = {
-            'grant_type': 'client_credentials',
-            'client_id': client_id,
-            'client_secret': client_secret,
-            'scope': 'https://graph.microsoft.com/.default'
-        }
+    def fetch_scopes_for_clients(self, config, client_ids, verbose=True):
+        """Fetch scopes for several applications concurrently, dropping duplicates."""
+        # Build the session and cache the token before the workers share them
+        get_client_credentials_token(
+            self.session, config['tenant_id'], config['client_id'], config['client_secret']
+        )
+
+        def fetch(client_id):
+            # Each worker reports into its own buffer so clients don't interleave
+            buffer = StringIO()
+            app_scopes = self.fetch_scopes_from_azure(
+                config, client_id, verbose=verbose, stdout=OutputWrapper(buffer)
+            )
+            return app_scopes, buffer.getvalue()
+
+        workers = min(len(client_ids), _MAX_PARALLEL_FETCHES)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, client_ids))
+
+        # One report per client, in the order they were given
+        scopes = []
+        seen = set()
+        for client_id, (app_scopes, report) in zip(client_ids, results):
+            if verbose:
+                self.stdout.write(self.style.HTTP_INFO(f'\n=== {client_id} ==='))
+                self.stdout.write(report, ending='')
+            for scope in app_scopes:
+                key = (scope['id'], scope['name'])
+                if key not in seen:
+                    seen.add(key)
+                    scopes.append(scope)
+        return scopes
+
+    def fetch_scopes_from_azure(self, config, client_id=None, count_only=False, verbose=True,
+                                stdout=None):
+        """
+        Fetch scopes from Azure AD using Microsoft Graph API.
+
+        With count_only, print per-category counts from the v1.0 response
+        instead, skipping the beta fallback, and return an empty list.
+        Progress lines go to stdout (self.stdout by default) and are dropped
+        without verbose; errors still go to stderr.
+        """
+        client_id = client_id or config['client_id']
+        write = (stdout or self.stdout).write if verbose else _discard
 
         try:
-            self.stdout.write('Authenticating with Azure AD...')
-            token_response = requests.post(token_url, data=token_data, timeout=30)
-            token_response.raise_for_status()
-            access_token = token_response.json()['access_token']
+            write('Authenticating with Azure AD...')
+            # Cached per (tenant, client) until shortly before expiry
+            access_token = get_client_credentials_token(
+                self.session, config['tenant_id'], config['client_id'], config['client_secret']
+            )
 
             # Get application details from Microsoft Graph
             graph_url = "https://graph.microsoft.com/v1.0/applications"
@@ -147,14 +250,15 @@ class Command(BaseCommand):
 
             # Filter by client ID
             params = {
-                '$filter': f"appId eq '{client_id}'"
+                '$filter': f"appId eq '{odata_str(client_id)}'",
+                '$select': _APP_FIELDS,
             }
 
-            self.stdout.write('Fetching application details from Microsoft Graph...')
-            app_response = requests.get(graph_url, headers=headers, params=params, timeout=30)
+            write('Fetching application details from Microsoft Graph...')
+            app_response = self.session.get(graph_url, headers=headers, params=params, timeout=30)
             app_response.raise_for_status()
 
-            app_data = app_response.json()
+            app_data = json_loads(app_response.content)
 
             if not app_data.get('value'):
                 self.stderr.write(
@@ -165,110 +269,97 @@ class Command(BaseCommand):
             app = app_data['value'][0]
 
             # Debug: Show what we found
-            self.stdout.write(f"Application ID: {app.get('id', 'N/A')}")
-            self.stdout.write(f"Display Name: {app.get('displayName', 'N/A')}")
-            self.stdout.write(f"App ID: {app.get('appId', 'N/A')}")
+            write(f"Application ID: {app.get('id', 'N/A')}")
+            write(f"Display Name: {app.get('displayName', 'N/A')}")
+            write(f"App ID: {app.get('appId', 'N/A')}")
+
+            if count_only:
+                self.output_counts(app)
+                return []
 
             # Debug: Show full app structure keys
-            self.stdout.write(self.style.WARNING(f"DEBUG: Top-level app keys: {list(app.keys())}"))
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("Top-level app keys: %s", list(app))
 
             # Get identifier URIs
             identifier_uris = app.get('identifierUris', [])
             if identifier_uris:
-                self.stdout.write(f"Identifier URIs: {', '.join(identifier_uris)}")
+                write(f"Identifier URIs: {', '.join(identifier_uris)}")
             else:
-                self.stdout.write(self.style.WARNING("No identifier URIs found"))
+                write(self.style.WARNING("No identifier URIs found"))
+
+            # Scope names are qualified with the first identifier URI, if any
+            identifier_uri = identifier_uris[0] if identifier_uris else None
+            prefix = f"{identifier_uri}/" if identifier_uri else ''
 
             # Extract scopes from API permissions
             scopes = []
 
             # OAuth2 Permission Scopes (delegated permissions) - This is where exposed API scopes are
             if 'api' in app:
-                self.stdout.write(self.style.SUCCESS("✓ Found 'api' key in app object"))
-                self.stdout.write(self.style.WARNING(f"DEBUG: app['api'] keys: {list(app['api'].keys())}"))
+                write(self.style.SUCCESS("✓ Found 'api' key in app object"))
+                if debug:
+                    logger.debug("app['api'] keys: %s", list(app['api']))
 
                 if 'oauth2PermissionScopes' in app['api']:
                     oauth_scopes = app['api']['oauth2PermissionScopes']
-                    self.stdout.write(self.style.SUCCESS(f"✓ Found {len(oauth_scopes)} OAuth2 permission scopes"))
-
-                    for scope in oauth_scopes:
-                        scope_value = scope.get('value', '')
-
-                        # Build full scope name with identifier URI if available
-                        full_scope_name = scope_value
-                        if identifier_uris and scope_value:
-                            # Use first identifier URI as base
-                            full_scope_name = f"{identifier_uris[0]}/{scope_value}"
-
-                        self.stdout.write(f"  - {full_scope_name} (enabled: {scope.get('isEnabled', True)})")
+                    write(self.style.SUCCESS(f"✓ Found {len(oauth_scopes)} OAuth2 permission scopes"))
 
-                        scopes.append({
-                            'name': full_scope_name,
-                            'short_name': scope_value,
-                            'description': scope.get('adminConsentDescription', scope.get('userConsentDescription', '')),  # noqa: E501
-                            'category': 'delegated',
-                            'type': 'oauth2',
-                            'enabled': scope.get('isEnabled', True),
-                            'admin_consent_required': scope.get('type', '') == 'Admin',
-                            'id': scope.get('id', ''),
-                            'identifier_uri': identifier_uris[0] if identifier_uris else None
-                        })
+                    scopes.extend(
+                        self._oauth_scope_to_dict(scope, prefix, identifier_uri, write)
+                        for scope in oauth_scopes
+                    )
                 else:
-                    self.stdout.write(self.style.ERROR("✗ No oauth2PermissionScopes found in app['api']"))
+                    write(self.style.ERROR("✗ No oauth2PermissionScopes found in app['api']"))
             else:
-                self.stdout.write(self.style.ERROR("✗ No 'api' key found in app object"))
-                self.stdout.write(self.style.WARNING(f"DEBUG: Available top-level keys: {list(app.keys())}"))
-                self.stdout.write(self.style.WARNING(f"DEBUG: Keys containing 'api', 'scope', or 'permission': {[k for k in app.keys() if 'api' in k.lower() or 'scope' in k.lower() or 'permission' in k.lower()]}"))  # noqa: E501
+                write(self.style.ERROR("✗ No 'api' key found in app object"))
+                if debug:
+                    logger.debug("Available top-level keys: %s", list(app))
+                    logger.debug("Keys containing 'api', 'scope', or 'permission': %s",
+                                 _permission_keys(app))
 
                 # Try alternative: use beta endpoint which has more details
-                self.stdout.write(self.style.WARNING("\nTrying Microsoft Graph beta endpoint for more details..."))
+                write(self.style.WARNING("\nTrying Microsoft Graph beta endpoint for more details..."))
                 try:
                     beta_url = f"https://graph.microsoft.com/beta/applications/{app['id']}"
-                    beta_response = requests.get(beta_url, headers=headers, timeout=30)
+                    beta_response = self.session.get(
+                        beta_url, headers=headers, params={'$select': _APP_FIELDS}, timeout=30
+                    )
                     beta_response.raise_for_status()
-                    beta_app = beta_response.json()
+                    beta_app = json_loads(beta_response.content)
 
-                    self.stdout.write(self.style.WARNING(f"DEBUG: Beta endpoint keys: {list(beta_app.keys())}"))
+                    if debug:
+                        logger.debug("Beta endpoint keys: %s", list(beta_app))
 
                     if 'api' in beta_app:
-                        self.stdout.write(self.style.SUCCESS("✓ Found 'api' key in beta endpoint"))
-                        self.stdout.write(self.style.WARNING(f"DEBUG: beta_app['api'] keys: {list(beta_app['api'].keys())}"))  # noqa: E501
+                        write(self.style.SUCCESS("✓ Found 'api' key in beta endpoint"))
+                        if debug:
+                            logger.debug("beta_app['api'] keys: %s", list(beta_app['api']))
 
                         if 'oauth2PermissionScopes' in beta_app['api']:
                             oauth_scopes = beta_app['api']['oauth2PermissionScopes']
-                            self.stdout.write(self.style.SUCCESS(f"✓ Found {len(oauth_scopes)} OAuth2 permission scopes in beta endpoint"))  # noqa: E501
-
-                            for scope in oauth_scopes:
-                                scope_value = scope.get('value', '')
-
-                                # Build full scope name with identifier URI if available
-                                full_scope_name = scope_value
-                                if identifier_uris and scope_value:
-                                    full_scope_name = f"{identifier_uris[0]}/{scope_value}"
-
-                                self.stdout.write(f"  - {full_scope_name} (enabled: {scope.get('isEnabled', True)})")
-
-                                scopes.append({
-                                    'name': full_scope_name,
-                                    'short_name': scope_value,
-                                    'description': scope.get('adminConsentDescription', scope.get('userConsentDescription', '')),  # noqa: E501
-                                    'category': 'delegated',
-                                    'type': 'oauth2',
-                                    'enabled': scope.get('isEnabled', True),
-                                    'admin_consent_required': scope.get('type', '') == 'Admin',
-                                    'id': scope.get('id', ''),
-                                    'identifier_uri': identifier_uris[0] if identifier_uris else None
-                                })
+                            write(self.style.SUCCESS(f"✓ Found {len(oauth_scopes)} OAuth2 permission scopes in beta endpoint"))  # noqa: E501
+
+                            scopes.extend(
+                                self._oauth_scope_to_dict(scope, prefix, identifier_uri, write)
+                                for scope in oauth_scopes
+                            )
                         else:
-                            self.stdout.write(self.style.ERROR("✗ No oauth2PermissionScopes in beta endpoint either"))
-                            # Dump full beta app JSON for debugging
-                            self.stdout.write(self.style.WARNING("\nDEBUG: Full beta app JSON:"))
-                            self.stdout.write(json.dumps(beta_app, indent=2)[:2000])  # First 2000 chars
+                            write(self.style.ERROR("✗ No oauth2PermissionScopes in beta endpoint either"))
+                            if debug:
+                                # Dump only the first keys instead of serializing the whole app
+                                preview = {key: beta_app[key] for key in islice(beta_app, 5)}
+                                logger.debug(
+                                    "Beta app JSON (first 5 keys):\n%s",
+                                    json.dumps(preview, indent=2, default=str),
+                                )
                     else:
-                        self.stdout.write(self.style.ERROR("✗ No 'api' key in beta endpoint either"))
-                        self.stdout.write(self.style.WARNING(f"DEBUG: Beta keys: {[k for k in beta_app.keys() if 'api' in k.lower() or 'scope' in k.lower() or 'permission' in k.lower()]}"))  # noqa: E501
+                        write(self.style.ERROR("✗ No 'api' key in beta endpoint either"))
+                        if debug:
+                            logger.debug("Beta keys: %s", _permission_keys(beta_app))
                 except Exception as beta_error:
-                    self.stdout.write(self.style.ERROR(f"Error trying beta endpoint: {beta_error}"))
+                    self.stderr.write(self.style.ERROR(f"Error trying beta endpoint: {beta_error}"))
 
             # App Roles (application permissions)
             if 'appRoles' in app:
@@ -301,7 +392,8 @@ class Command(BaseCommand):
 
             return scopes
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError covers undecodable Graph responses
             self.stderr.write(
                 self.style.ERROR(f'Error fetching scopes from Azure AD: {e}')
             )
@@ -317,94 +409,167 @@ class Command(BaseCommand):
                     )
             return []
 
+    def _oauth_scope_to_dict(self, scope, prefix, identifier_uri, write):
+        """Convert an oauth2PermissionScope into a scope dict, listing it with write."""
+        scope_value = scope.get('value', '')
+        full_scope_name = f"{prefix}{scope_value}" if scope_value else scope_value
+        enabled = scope.get('isEnabled', True)
+
+        write(f"  - {full_scope_name} (enabled: {enabled})")
+
+        return {
+            'name': full_scope_name,
+            'short_name': scope_value,
+            'description': scope.get('adminConsentDescription', scope.get('userConsentDescription', '')),  # noqa: E501
+            'category': 'delegated',
+            'type': 'oauth2',
+            'enabled': enabled,
+            'admin_consent_required': scope.get('type', '') == 'Admin',
+            'id': scope.get('id', ''),
+            'identifier_uri': identifier_uri,
+        }
+
     def output_table(self, scopes):
         """Output scopes as a formatted table."""
-        self.stdout.write(self.style.SUCCESS(f'\nFound {len(scopes)} scopes in Azure AD:\n'))
+        success = self.style.SUCCESS
+        info = self.style.HTTP_INFO
 
-        # Header
-        header = f"{'Scope Name':<40} {'Category':<15} {'Type':<15} {'Enabled':<10}"
-        self.stdout.write(self.style.HTTP_INFO(header))
-        self.stdout.write(self.style.HTTP_INFO('-' * len(header)))
+        lines = [
+            success(f'\nFound {len(scopes)} scopes in Azure AD:\n'),
+            info(_TABLE_HEADER),
+            info('-' * len(_TABLE_HEADER)),
+        ]
 
-        # Sort by category then name
-        scopes.sort(key=lambda x: (x['category'], x['name']))
+        # Group by category, then sort each group by name
+        buckets = {}
+        for scope in scopes:
+            buckets.setdefault(scope['category'], []).append(scope)
+        categories = sorted(buckets)
+        by_name = itemgetter('name')
+        for cat in categories:
+            buckets[cat].sort(key=by_name)
 
         # Rows
-        for scope in scopes:
-            name = scope['name'][:38]
-            category = scope['category'][:13]
-            scope_type = scope['type'][:13]
-            enabled = '✓' if scope['enabled'] else '✗'
+        for cat in categories:
+            for scope in buckets[cat]:
+                name = scope['name'][:38]
+                category = scope['category'][:13]
+                scope_type = scope['type'][:13]
+                enabled = '✓' if scope['enabled'] else '✗'
 
-            row = f"{name:<40} {category:<15} {scope_type:<15} {enabled:<10}"
-            self.stdout.write(row)
+                lines.append(f"{name:<40} {category:<15} {scope_type:<15} {enabled:<10}")
 
-            # Show description
-            if scope['description']:
-                self.stdout.write(f"  → {scope['description'][:100]}")
+                # Show description
+                if scope['description']:
+                    lines.append(f"  → {scope['description'][:100]}")
 
         # Summary by category
-        self.stdout.write('\n' + self.style.SUCCESS('Summary:'))
-        categories = {}
-        for scope in scopes:
-            cat = scope['category']
-            categories[cat] = categories.get(cat, 0) + 1
-
-        for cat, count in categories.items():
-            self.stdout.write(f"  {cat}: {count}")
+        lines.append('\n' + success('Summary:'))
+        for cat in categories:
+            lines.append(f"  {cat}: {len(buckets[cat])}")
+
+        self.stdout.write('\n'.join(lines))
+
+    def output_counts(self, app):
+        """Output how many scopes of each category an application exposes."""
+        counts = {
+            'delegated': len((app.get('api') or {}).get('oauth2PermissionScopes') or []),
+            'application': sum(1 for role in app.get('appRoles') or [] if role.get('value')),
+            'required': sum(
+                len(resource.get('resourceAccess') or [])
+                for resource in app.get('requiredResourceAccess') or []
+            ),
+        }
+        lines = ['\n' + self.style.SUCCESS('Scope counts:')]
+        lines.extend(f"  {cat}: {count}" for cat, count in counts.items())
+        self.stdout.write('\n'.join(lines))
 
     def output_json(self, scopes):
-        """Output scopes as JSON."""
-        self.stdout.write(json.dumps(scopes, indent=2))
+        """Output scopes as JSON, streamed in chunks instead of one large string."""
+        write = self.stdout.write
+        pending = []
+        for chunk in json.JSONEncoder(indent=2).iterencode(scopes):
+            pending.append(chunk)
+            if len(pending) >= _JSON_WRITE_CHUNKS:
+                write(''.join(pending), ending='')
+                pending.clear()
+        write(''.join(pending))
+
+    def output_jsonl(self, scopes):
+        """Output scopes as JSON Lines, one compact object per line."""
+        write = self.stdout.write
+        for scope in scopes:
+            write(json.dumps(scope))
 
-    def import_scopes(self, scopes):
-        """Import scopes into ScopeDefinition model."""
+    def import_scopes(self, scopes, verbose=False, stdout=None):
+        """Import scopes into ScopeDefinition model, reporting to stdout (self.stdout by default)."""
         try:
             from hub_auth_client.django.models import ScopeDefinition
 
+            write = (stdout or self.stdout).write
+            success = self.style.SUCCESS
+            warning = self.style.WARNING
+
             created_count = 0
             updated_count = 0
             skipped_count = 0
 
+            # One entry per name (the last occurrence wins); nameless entries are skipped
+            unique = {}
             for scope_data in scopes:
-                name = scope_data['name']
-
-                if not name:
+                if scope_data['name']:
+                    unique[scope_data['name']] = scope_data
+                else:
                     skipped_count += 1
-                    continue
-
-                # Check if scope exists
-                scope, created = ScopeDefinition.objects.get_or_create(
-                    name=name,
-                    defaults={
-                        'description': scope_data.get('description', ''),
-                        'category': scope_data.get('category', 'api'),
-                        'is_active': scope_data.get('enabled', True)
-                    }
-                )
 
-                if created:
+            # Load every existing scope we might touch in one query
+            known = ScopeDefinition.objects.filter(name__in=unique).only(
+                'id', 'name', 'description'
+            ).in_bulk(field_name='name')
+            to_create = []
+            to_update = []
+
+            for name, scope_data in unique.items():
+                description = scope_data.get('description', '')
+                scope = known.get(name)
+
+                if scope is None:
+                    to_create.append(ScopeDefinition(
+                        name=name,
+                        description=description,
+                        category=scope_data.get('category', 'api'),
+                        is_active=scope_data.get('enabled', True),
+                    ))
                     created_count += 1
-                    self.stdout.write(
-                        self.style.SUCCESS(f'✓ Created scope: {name}')
-                    )
-                else:
+                    if verbose:
+                        write(success(f'✓ Created scope: {name}'))
+                elif scope.description != description:
                     # Update description if changed
-                    if scope.description != scope_data.get('description', ''):
-                        scope.description = scope_data.get('description', '')
-                        scope.save()
-                        updated_count += 1
-                        self.stdout.write(
-                            self.style.WARNING(f'↻ Updated scope: {name}')
-                        )
-                    else:
-                        skipped_count += 1
+                    scope.description = description
+                    scope.updated_at = timezone.now()
+                    to_update.append(scope)
+                    updated_count += 1
+                    if verbose:
+                        write(warning(f'↻ Updated scope: {name}'))
+                else:
+                    skipped_count += 1
+
+            # Commit creates and updates together
+            with transaction.atomic():
+                ScopeDefinition.objects.bulk_create(
+                    to_create, batch_size=500, ignore_conflicts=True
+                )
+                ScopeDefinition.objects.bulk_update(
+                    to_update, ['description', 'updated_at'], batch_size=500
+                )
 
             # Summary
-            self.stdout.write('\n' + self.style.SUCCESS('Import Summary:'))
-            self.stdout.write(f'  Created: {created_count}')
-            self.stdout.write(f'  Updated: {updated_count}')
-            self.stdout.write(f'  Skipped: {skipped_count}')
+            write('\n'.join([
+                '\n' + success('Import Summary:'),
+                f'  Created: {created_count}',
+                f'  Updated: {updated_count}',
+                f'  Skipped: {skipped_count}',
+            ]))
 
         except ImportError:
             self.stderr.write(
@@ -59,19 +59,25 @@ class Command(BaseCommand):
                 ('Admin.Write', 'Admin', 'Manage admin settings'),
             ]
 
-            for name, category, description in scopes:
-                scope, created = ScopeDefinition.objects.get_or_create(
-                    name=name,
-                    defaults={
-                        'category': category,
-                        'description': description,
-                        'is_active': True,
-                    }
-                )
-                if created:
-                    self.stdout.write(f'  Created scope: {name}')
-                else:
+            existing = set(
+                ScopeDefinition.objects.filter(
+                    name__in=[name for name, _, _ in scopes]
+                ).values_list('name', flat=True)
+            )
+            ScopeDefinition.objects.bulk_create(
+                [
+                    ScopeDefinition(name=name, category=category, description=description, is_active=True)
+                    for name, category, description in scopes
+                    if name not in existing
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
+            )
+            for name, _, _ in scopes:
+                if name in existing:
                     self.stdout.write(f'  Scope exists: {name}')
+                else:
+                    self.stdout.write(f'  Created scope: {name}')
 
             # Common roles
             roles = [
@@ -83,18 +89,25 @@ class Command(BaseCommand):
                 ('Guest', 'Guest user with limited access'),
             ]
 
-            for name, description in roles:
-                role, created = RoleDefinition.objects.get_or_create(
-                    name=name,
-                    defaults={
-                        'description': description,
-                        'is_active': True,
-                    }
-                )
-                if created:
-                    self.stdout.write(f'  Created role: {name}')
-                else:
+            existing = set(
+                RoleDefinition.objects.filter(
+                    name__in=[name for name, _ in roles]
+                ).values_list('name', flat=True)
+            )
+            RoleDefinition.objects.bulk_create(
+                [
+                    RoleDefinition(name=name, description=description, is_active=True)
+                    for name, description in roles
+                    if name not in existing
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
+            )
+            for name, _ in roles:
+                if name in existing:
                     self.stdout.write(f'  Role exists: {name}')
+                else:
+                    self.stdout.write(f'  Created role: {name}')
 
         self.stdout.write(self.style.SUCCESS('\nInitialization complete!'))
         self.stdout.write('\nNext steps:')
@@ -10,11 +10,74 @@ Usage:
 """
 
 import json
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from django.core.management.base import BaseCommand
 from django.urls import get_resolver
 from django.urls.resolvers import URLPattern, URLResolver
 
+# (resolver, endpoints) from the last URL tree walk. get_resolver() returns a
+# new resolver when the URLconf changes or URL caches are cleared.
+_endpoint_cache: Tuple[Optional[URLResolver], List[dict]] = (None, [])
+
+# Encoder fragments joined per stdout write when streaming JSON output
+_JSON_WRITE_CHUNKS = 1024
+
+
+@lru_cache(maxsize=2048)
+def _introspect_view(view_class):
+    """
+    Return (methods, permission_classes, authentication_classes, description) for a view class.
+
+    View classes live for the whole process, so each one is introspected once
+    however many URL patterns route to it; the name collections are tuples
+    so endpoints can share them.
+    """
+    http_method_names = getattr(view_class, 'http_method_names', None)
+    if http_method_names is not None:
+        methods = tuple(m.upper() for m in http_method_names if hasattr(view_class, m))
+    else:
+        methods = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+    permission_classes = tuple(
+        p.__name__ for p in getattr(view_class, 'permission_classes', ())
+    )
+    authentication_classes = tuple(
+        a.__name__ for a in getattr(view_class, 'authentication_classes', ())
+    )
+    description = (view_class.__doc__ or '').strip().split('\n')[0]
+
+    return methods, permission_classes, authentication_classes, description
+
+
+@lru_cache(maxsize=2048)
+def _view_serializer_class(view_class):
+    """Return the serializer class a view class uses, or None."""
+    if hasattr(view_class, 'serializer_class'):
+        return view_class.serializer_class
+    if hasattr(view_class, 'get_serializer_class'):
+        try:
+            # Try to get serializer class without a request
+            return view_class().get_serializer_class()
+        except Exception:
+            pass
+    return None
+
+
+@lru_cache(maxsize=2048)
+def _serializer_fields(serializer_class):
+    """
+    Return the field names of a serializer class.
+
+    Building ``fields`` instantiates the serializer (and, for model
+    serializers, introspects the model), so it is done once per class.
+    """
+    try:
+        return tuple(serializer_class().fields.keys())
+    except Exception:
+        return ()
+
 
 class Command(BaseCommand):
     help = 'List all available endpoints, views, URLs, and serializers to help identify what needs securing'
@@ -68,23 +131,35 @@ class Command(BaseCommand):
             self.output_table(endpoints, options['show_serializers'])
 
     def collect_endpoints(self):
-        """Collect all URL patterns and their views."""
-        endpoints = []
+        """Collect all URL patterns and their views, reusing the last walk of the same resolver."""
+        global _endpoint_cache
+        resolver = get_resolver()
+        cached_resolver, endpoints = _endpoint_cache
+        if cached_resolver is not resolver:
+            endpoints = self._walk_url_patterns(resolver)
+            _endpoint_cache = (resolver, endpoints)
 
-        def extract_endpoints(patterns, prefix=''):
-            for pattern in patterns:
-                if isinstance(pattern, URLResolver):
-                    # Recursively extract from included URL configs
-                    new_prefix = prefix + str(pattern.pattern)
-                    extract_endpoints(pattern.url_patterns, new_prefix)
-                elif isinstance(pattern, URLPattern):
-                    # Extract endpoint information
-                    endpoint_info = self.extract_endpoint_info(pattern, prefix)
-                    if endpoint_info:
-                        endpoints.append(endpoint_info)
+        # Callers filter, sort and annotate the dicts, so hand out copies
+        return [dict(endpoint) for endpoint in endpoints]
 
-        resolver = get_resolver()
-        extract_endpoints(resolver.url_patterns)
+    def _walk_url_patterns(self, resolver):
+        """Flatten the resolver's URL tree into endpoint dicts."""
+        endpoints = []
+
+        # Explicit worklist instead of recursion; children are pushed in
+        # reverse so endpoints come out in URLconf order
+        stack = [(pattern, '') for pattern in reversed(resolver.url_patterns)]
+        while stack:
+            pattern, prefix = stack.pop()
+            if isinstance(pattern, URLResolver):
+                # Included URL configs extend the prefix
+                new_prefix = prefix + str(pattern.pattern)
+                stack.extend((child, new_prefix) for child in reversed(pattern.url_patterns))
+            elif isinstance(pattern, URLPattern):
+                # Extract endpoint information
+                endpoint_info = self.extract_endpoint_info(pattern, prefix)
+                if endpoint_info:
+                    endpoints.append(endpoint_info)
 
         return endpoints
 
@@ -116,36 +191,16 @@ class Command(BaseCommand):
             # Get URL pattern
             url_pattern = prefix + str(pattern.pattern)
 
-            # Get HTTP methods
-            methods = []
+            # Get HTTP methods, permission/authentication classes and description;
+            # the read-only tuples are shared with the introspection cache
             if view_class:
-                if hasattr(view_class, 'http_method_names'):
-                    methods = [m.upper() for m in view_class.http_method_names
-                               if hasattr(view_class, m)]
-                else:
-                    methods = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+                methods, permission_classes, authentication_classes, description = (
+                    _introspect_view(view_class)
+                )
             else:
-                methods = ['GET']  # Function-based views default to GET
-
-            # Get permission classes
-            permission_classes = []
-            if view_class and hasattr(view_class, 'permission_classes'):
-                permission_classes = [
-                    p.__name__ for p in view_class.permission_classes
-                ]
-
-            # Get authentication classes
-            authentication_classes = []
-            if view_class and hasattr(view_class, 'authentication_classes'):
-                authentication_classes = [
-                    a.__name__ for a in view_class.authentication_classes
-                ]
-
-            # Get view name/description
-            description = ''
-            if view_class and hasattr(view_class, '__doc__'):
-                description = (view_class.__doc__ or '').strip().split('\n')[0]
-            elif hasattr(view_func, '__doc__'):
+                methods = ('GET',)  # Function-based views default to GET
+                permission_classes = ()
+                authentication_classes = ()
                 description = (view_func.__doc__ or '').strip().split('\n')[0]
 
             return {
@@ -169,27 +224,13 @@ class Command(BaseCommand):
         for endpoint in endpoints:
             view_class = endpoint.get('view_class')
             if view_class:
-                # Get serializer class
-                serializer_class = None
-                if hasattr(view_class, 'serializer_class'):
-                    serializer_class = view_class.serializer_class
-                elif hasattr(view_class, 'get_serializer_class'):
-                    try:
-                        # Try to get serializer class without instantiating
-                        serializer_class = view_class().get_serializer_class()
-                    except Exception:
-                        pass
+                # Get serializer class and its fields, cached per class
+                serializer_class = _view_serializer_class(view_class)
 
                 if serializer_class:
                     endpoint['serializer'] = serializer_class.__name__
                     endpoint['serializer_module'] = serializer_class.__module__
-
-                    # Get serializer fields
-                    try:
-                        serializer_fields = list(serializer_class().fields.keys())
-                        endpoint['serializer_fields'] = serializer_fields
-                    except Exception:
-                        endpoint['serializer_fields'] = []
+                    endpoint['serializer_fields'] = list(_serializer_fields(serializer_class))
                 else:
                     endpoint['serializer'] = None
                     endpoint['serializer_module'] = None
@@ -203,72 +244,92 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('No endpoints found.'))
             return
 
-        self.stdout.write(self.style.SUCCESS(f'\nFound {len(endpoints)} endpoints:\n'))
+        info = self.style.HTTP_INFO
 
         # Header
         header = f"{'URL Pattern':<50} {'Methods':<20} {'View':<30} {'Permissions':<30}"
         if show_serializers:
             header += f" {'Serializer':<30}"
 
-        self.stdout.write(self.style.HTTP_INFO(header))
-        self.stdout.write(self.style.HTTP_INFO('-' * len(header)))
+        # Collected and written once instead of one stdout write per line
+        lines = [
+            self.style.SUCCESS(f'\nFound {len(endpoints)} endpoints:\n'),
+            info(header),
+            info('-' * len(header)),
+        ]
+        append = lines.append
 
         # Sort by URL pattern
         endpoints.sort(key=lambda x: x['url_pattern'])
 
-        # Rows
+        # Rows: one prebuilt template; ".N" precisions do the truncation
+        row_fmt = '{url:<50.48} {methods:<20.18} {view:<30.28} {perms}'
+        if show_serializers:
+            row_fmt += ' {serializer:<30.28}'
+        format_row = row_fmt.format
+        # Highlight unsecured endpoints
+        unsecured_perms = self.style.ERROR(f"{'NONE':<30}")
+        unsecured_count = 0
+
         for endpoint in endpoints:
-            url = endpoint['url_pattern'][:48]
-            methods = ','.join(endpoint['methods'][:3])[:18]
-            view = endpoint['view_name'][:28]
-
-            # Highlight unsecured endpoints
-            perms = ','.join(endpoint['permission_classes'][:2])[:28] if endpoint['permission_classes'] else 'NONE'
-            if not endpoint['permission_classes']:
-                perms_display = self.style.ERROR(f'{perms:<30}')
+            permission_classes = endpoint['permission_classes']
+            if permission_classes:
+                perms = f"{','.join(permission_classes[:2]):<30.28}"
             else:
-                perms_display = f'{perms:<30}'
-
-            row = f"{url:<50} {methods:<20} {view:<30} {perms_display}"
-
-            if show_serializers:
-                serializer = endpoint.get('serializer', 'N/A')[:28]
-                row += f" {serializer:<30}"
+                perms = unsecured_perms
+                unsecured_count += 1
 
-            self.stdout.write(row)
+            append(format_row(
+                url=endpoint['url_pattern'],
+                methods=','.join(endpoint['methods'][:3]),
+                view=endpoint['view_name'],
+                perms=perms,
+                serializer=endpoint.get('serializer') or 'N/A',
+            ))
 
             # Show description if available
-            if endpoint['description']:
-                self.stdout.write(f"  → {endpoint['description'][:100]}")
+            description = endpoint['description']
+            if description:
+                append(f"  → {description[:100]}")
 
         # Summary
-        unsecured_count = len([e for e in endpoints if not e['permission_classes']])
-        self.stdout.write(f"\n{self.style.WARNING(f'Unsecured endpoints: {unsecured_count}/{len(endpoints)}')}")
+        append(f"\n{self.style.WARNING(f'Unsecured endpoints: {unsecured_count}/{len(endpoints)}')}")
 
         if unsecured_count > 0:
-            self.stdout.write(
+            append(
                 self.style.ERROR(
                     f'\n⚠ Warning: {unsecured_count} endpoints have no permission classes!\n'
                     'Consider securing them with scopes/roles using EndpointPermission.'
                 )
             )
 
+        self.stdout.write('\n'.join(lines))
+
     def output_json(self, endpoints):
-        """Output endpoints as JSON."""
+        """Output endpoints as JSON, streamed in chunks instead of one large string."""
         # Remove view_class from output (not JSON serializable)
-        clean_endpoints = []
-        for e in endpoints:
-            clean_e = {k: v for k, v in e.items() if k != 'view_class'}
-            clean_endpoints.append(clean_e)
-
-        self.stdout.write(json.dumps(clean_endpoints, indent=2))
+        clean_endpoints = [
+            {k: v for k, v in e.items() if k != 'view_class'}
+            for e in endpoints
+        ]
+
+        write = self.stdout.write
+        pending = []
+        for chunk in json.JSONEncoder(indent=2).iterencode(clean_endpoints):
+            pending.append(chunk)
+            if len(pending) >= _JSON_WRITE_CHUNKS:
+                write(''.join(pending), ending='')
+                pending.clear()
+        write(''.join(pending))
 
     def output_csv(self, endpoints):
         """Output endpoints as CSV."""
         import csv
-        import sys
+        import io
 
-        writer = csv.writer(sys.stdout)
+        # Rendered into memory and written once through self.stdout
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
 
         # Header
         writer.writerow([
@@ -282,8 +343,8 @@ class Command(BaseCommand):
         ])
 
         # Rows
-        for endpoint in endpoints:
-            writer.writerow([
+        writer.writerows(
+            [
                 endpoint['url_pattern'],
                 ','.join(endpoint['methods']),
                 endpoint['view_name'],
@@ -291,4 +352,8 @@ class Command(BaseCommand):
                 ','.join(endpoint['permission_classes']),
                 ','.join(endpoint['authentication_classes']),
                 endpoint['description']
-            ])
+            ]
+            for endpoint in endpoints
+        )
+
+        self.stdout.write(buffer.getvalue(), ending='')
@@ -10,7 +10,16 @@ Usage:
 """
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import connection
+from django.db import connection, transaction
+
+
+def _apply_policy_sql(policy):
+    """Drop, enable and create statements for a policy as one script."""
+    return '\n'.join((
+        policy.generate_drop_policy_sql(),
+        policy.generate_enable_rls_sql(),
+        policy.generate_create_policy_sql(),
+    ))
 
 
 class Command(BaseCommand):
@@ -98,11 +107,13 @@ class Command(BaseCommand):
         if table_name:
             policies = policies.filter(table_name=table_name)
 
-        if not policies.exists():
+        # One query for the rows instead of exists() + count() + iteration
+        policies = list(policies)
+        if not policies:
             self.stdout.write(self.style.WARNING('No active policies found.'))
             return
 
-        self.stdout.write(self.style.SUCCESS(f'\nFound {policies.count()} active policies:\n'))
+        self.stdout.write(self.style.SUCCESS(f'\nFound {len(policies)} active policies:\n'))
 
         for policy in policies:
             self.stdout.write(self.style.HTTP_INFO(f'\n--- {policy.name} on {policy.table_name} ---'))
@@ -116,28 +127,25 @@ class Command(BaseCommand):
         if table_name:
             policies = policies.filter(table_name=table_name)
 
-        if not policies.exists():
+        policies = list(policies)
+        if not policies:
             self.stdout.write(self.style.WARNING('No active policies found.'))
             return
 
-        self.stdout.write(f'Applying {policies.count()} RLS policies...\n')
+        self.stdout.write(f'Applying {len(policies)} RLS policies...\n')
 
         applied_count = 0
         errors = []
 
-        with connection.cursor() as cursor:
+        # One transaction for the run and one round trip per policy; the
+        # per-policy savepoint lets a failing policy roll back on its own
+        with transaction.atomic(), connection.cursor() as cursor:
             for policy in policies:
                 try:
                     self.stdout.write(f'  Applying {policy.name} on {policy.table_name}...', ending='')
 
-                    # Drop existing policy
-                    cursor.execute(policy.generate_drop_policy_sql())
-
-                    # Enable RLS on table
-                    cursor.execute(policy.generate_enable_rls_sql())
-
-                    # Create policy
-                    cursor.execute(policy.generate_create_policy_sql())
+                    with transaction.atomic():
+                        cursor.execute(_apply_policy_sql(policy))
 
                     self.stdout.write(self.style.SUCCESS(' ✓'))
                     applied_count += 1
@@ -162,11 +170,12 @@ class Command(BaseCommand):
         if table_name:
             policies = policies.filter(table_name=table_name)
 
-        if not policies.exists():
+        policies = list(policies)
+        if not policies:
             self.stdout.write(self.style.WARNING('No policies found.'))
             return
 
-        self.stdout.write(f'Removing {policies.count()} RLS policies...\n')
+        self.stdout.write(f'Removing {len(policies)} RLS policies...\n')
 
         removed_count = 0
         errors = []
@@ -245,15 +254,8 @@ class Command(BaseCommand):
             raise CommandError(f'Policy "{policy_name}" not found')
 
         try:
-            with connection.cursor() as cursor:
-                # Drop existing
-                cursor.execute(policy.generate_drop_policy_sql())
-
-                # Enable RLS
-                cursor.execute(policy.generate_enable_rls_sql())
-
-                # Create policy
-                cursor.execute(policy.generate_create_policy_sql())
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(_apply_policy_sql(policy))
 
             self.stdout.write(self.style.SUCCESS(f'✓ Applied policy "{policy_name}" on {policy.table_name}'))
 
@@ -266,8 +268,8 @@ class Command(BaseCommand):
         self.stdout.write(self.style.HTTP_INFO('\n=== RLS Status ===\n'))
 
         # Show table configs
-        configs = RLSTableConfig.objects.all()
-        if configs.exists():
+        configs = list(RLSTableConfig.objects.all())
+        if configs:
             self.stdout.write(self.style.SUCCESS('Tables with RLS:'))
             for config in configs:
                 status = '✓ Enabled' if config.rls_enabled else '✗ Disabled'
@@ -278,21 +280,23 @@ class Command(BaseCommand):
 
         self.stdout.write('')
 
-        # Show policies
-        policies = RLSPolicy.objects.all()
-        if policies.exists():
-            active = policies.filter(is_active=True).count()
-            inactive = policies.filter(is_active=False).count()
+        # Show policies, split in Python from a single query
+        policies = list(RLSPolicy.objects.all())
+        if policies:
+            active = [policy for policy in policies if policy.is_active]
+            inactive = [policy for policy in policies if not policy.is_active]
 
-            self.stdout.write(self.style.SUCCESS(f'RLS Policies: {active} active, {inactive} inactive'))
+            self.stdout.write(self.style.SUCCESS(
+                f'RLS Policies: {len(active)} active, {len(inactive)} inactive'
+            ))
 
-            for policy in policies.filter(is_active=True):
+            for policy in active:
                 self.stdout.write(
                     f'  ✓ {policy.name} on {policy.table_name} '
                     f'({policy.policy_command}, {policy.policy_type})'
                 )
 
-            for policy in policies.filter(is_active=False):
+            for policy in inactive:
                 self.stdout.write(
                     f'  ✗ {policy.name} on {policy.table_name} '
                     f'({policy.policy_command}, {policy.policy_type}) - INACTIVE'
@@ -8,17 +8,26 @@ Add to MIDDLEWARE in settings.py:
     ]
 """
 
+import hashlib
 import logging
+import re
+import threading
+import time
 from typing import Optional
 
 from django.conf import settings
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
 
+from ..utils.ttl_cache import TTLCache
 from ..validator import AppTokenValidator, MSALTokenValidator
 
 logger = logging.getLogger(__name__)
 
+# Successful validations are reused for a short window so repeated requests
+# with the same bearer token skip signature verification.
+_VALIDATION_CACHE_TTL = 30
+
 
 class MSALAuthenticationMiddleware(MiddlewareMixin):
     """
@@ -48,23 +57,44 @@ class MSALAuthenticationMiddleware(MiddlewareMixin):
                 "AZURE_AD_TENANT_ID and AZURE_AD_CLIENT_ID must be set in Django settings"
             )
 
-        self.validator = MSALTokenValidator(
+        # The validator itself is built on first use (see ``validator``)
+        self._validator_kwargs = dict(
             tenant_id=tenant_id,
             client_id=client_id,
             validate_audience=getattr(settings, 'MSAL_VALIDATE_AUDIENCE', True),
             validate_issuer=getattr(settings, 'MSAL_VALIDATE_ISSUER', True),
             leeway=getattr(settings, 'MSAL_TOKEN_LEEWAY', 0),
         )
+        self._validator = None
+        self._validator_lock = threading.Lock()
 
         self.app_validator = self._build_app_validator()
+        self._token_cache = TTLCache(maxsize=4096, ttl=_VALIDATION_CACHE_TTL)
 
         # Get exempt paths
         self.exempt_paths = getattr(settings, 'MSAL_EXEMPT_PATHS', [])
+        # One anchored alternation instead of a startswith() per exempt path
+        self._exempt_re = (
+            re.compile('|'.join(re.escape(path) for path in self.exempt_paths))
+            if self.exempt_paths else None
+        )
+
+    @property
+    def validator(self) -> MSALTokenValidator:
+        """MSALTokenValidator for this middleware, built once on first use."""
+        validator = self._validator
+        if validator is None:
+            with self._validator_lock:
+                if self._validator is None:
+                    self._validator = MSALTokenValidator(**self._validator_kwargs)
+                validator = self._validator
+        return validator
 
     def process_request(self, request):
         """Process the request and validate token."""
         # Check if path is exempt
-        if any(request.path.startswith(path) for path in self.exempt_paths):
+        exempt_re = self._exempt_re
+        if exempt_re is not None and exempt_re.match(request.path):
             return None
 
         # Extract token from Authorization header
@@ -76,29 +106,54 @@ class MSALAuthenticationMiddleware(MiddlewareMixin):
             request.msal_user = None
             return None
 
-        # Validate token
-        is_valid, claims, error = self.validator.validate_token(auth_header)
-        used_app_token = False
-
-        if not is_valid and self.app_validator:
-            is_valid, claims, error = self.app_validator.validate_token(auth_header)
-            used_app_token = is_valid
-
-        if not is_valid:
+        # Other schemes (Basic, Digest, ...) can never validate, so reject them
+        # before any hashing or JWT parsing. A bare token is still validated.
+        if not auth_header.startswith('Bearer ') and ' ' in auth_header:
             return JsonResponse(
-                {'error': 'Invalid token', 'message': error},
+                {'error': 'Invalid token', 'message': 'Unsupported authorization scheme'},
                 status=401
             )
 
+        # Reuse a recent successful validation of the same token
+        cache_key = hashlib.blake2b(auth_header.encode(), digest_size=16).digest()
+        cached = self._token_cache.get(cache_key)
+        if cached is not None:
+            claims, user_info = cached
+        else:
+            # Validate token
+            validator = self.validator
+            is_valid, claims, error = validator.validate_token(auth_header)
+
+            app_validator = self.app_validator
+            if not is_valid and app_validator:
+                is_valid, claims, error = app_validator.validate_token(auth_header)
+                validator = app_validator
+
+            if not is_valid:
+                return JsonResponse(
+                    {'error': 'Invalid token', 'message': error},
+                    status=401
+                )
+
+            user_info = validator.extract_user_info(claims)
+            self._cache_validation(cache_key, claims, user_info)
+
         # Attach claims and user info to request
         request.msal_token = claims
-        if used_app_token:
-            request.msal_user = self.app_validator.extract_user_info(claims)
-        else:
-            request.msal_user = self.validator.extract_user_info(claims)
+        request.msal_user = user_info
 
         return None
 
+    def _cache_validation(self, cache_key: bytes, claims, user_info) -> None:
+        """Remember a successful validation, never past the token's exp."""
+        if not claims:
+            return
+        ttl: float = _VALIDATION_CACHE_TTL
+        exp = claims.get('exp')
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+        self._token_cache.set(cache_key, (claims, user_info), ttl)
+
     def _build_app_validator(self) -> Optional[AppTokenValidator]:
         if not getattr(settings, 'APP_JWT_ENABLED', False):
             return None
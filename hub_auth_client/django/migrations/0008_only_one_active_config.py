@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 16:22
+
+from django.db import migrations, models
+
+
+def deactivate_extra_active_configs(apps, schema_editor):
+    """Keep only the most recently updated active configuration before adding the constraint."""
+    AzureADConfiguration = apps.get_model('hub_auth_client', 'AzureADConfiguration')
+    active = AzureADConfiguration.objects.filter(is_active=True).order_by('-updated_at')
+    keep = active.values_list('pk', flat=True).first()
+    if keep is not None:
+        active.exclude(pk=keep).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hub_auth_client', '0007_apiendpointmapping'),
+    ]
+
+    operations = [
+        migrations.RunPython(deactivate_extra_active_configs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='azureadconfiguration',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('is_active',), name='only_one_active_config', violation_error_message='Only one configuration can be active at a time.'),
+        ),
+    ]
@@ -187,10 +187,14 @@ class EndpointPermission(models.Model):
 
     def get_required_scope_names(self):
         """Get list of required scope names."""
+        if 'required_scopes' in getattr(self, '_prefetched_objects_cache', {}):
+            return [scope.name for scope in self.required_scopes.all() if scope.is_active]
         return list(self.required_scopes.filter(is_active=True).values_list('name', flat=True))
 
     def get_required_role_names(self):
         """Get list of required role names."""
+        if 'required_roles' in getattr(self, '_prefetched_objects_cache', {}):
+            return [role.name for role in self.required_roles.all() if role.is_active]
         return list(self.required_roles.filter(is_active=True).values_list('name', flat=True))
 
 
@@ -212,7 +212,9 @@ class RLSPolicy(models.Model):
             str: SQL CREATE POLICY statement
         """
         using_expr = self.get_using_expression()
-        with_check_expr = self.get_with_check_expression()
+        # Same as get_with_check_expression(), without rebuilding the USING
+        # expression (and re-querying scopes/roles) a second time
+        with_check_expr = self.with_check_expression or using_expr
 
         sql_parts = [
             f"CREATE POLICY {self.name}",
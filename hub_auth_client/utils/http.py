@@ -0,0 +1,109 @@
+# hub_auth_client/utils/http.py
+"""
+HTTP helpers for talking to Azure AD and Microsoft Graph.
+"""
+import threading
+import time
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from hub_auth_client.utils.json_helpers import loads as json_loads
+
+# Throttling and transient gateway errors worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_session(total_retries: int = 5, backoff_factor: float = 0.5) -> requests.Session:
+    """
+    Build a requests.Session with pooled connections and retries.
+
+    Retries honour Retry-After on 429/503. Once retries run out the last
+    response is returned, so raise_for_status() still reports it.
+    """
+    retry = Retry(
+        total=total_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'POST'}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def odata_str(value: str) -> str:
+    """Escape a value for use inside a single-quoted OData string literal."""
+    return value.replace("'", "''")
+
+
+GRAPH_DEFAULT_SCOPE = 'https://graph.microsoft.com/.default'
+
+# Refresh tokens this many seconds before Azure AD says they expire
+TOKEN_EXPIRY_MARGIN = 60
+
+# (tenant_id, client_id, scope) -> (access_token, expires_at)
+_token_cache: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+
+# Serializes refreshes so concurrent callers share one token request
+_token_lock = threading.Lock()
+
+
+def get_client_credentials_token(
+    session: requests.Session,
+    tenant_id: str,
+    client_id: str,
+    client_secret: str,
+    scope: str = GRAPH_DEFAULT_SCOPE,
+) -> str:
+    """
+    Get an app-only access token, reusing a cached one until near expiry.
+
+    Tokens are only kept in process memory. Concurrent callers wait for a
+    single refresh instead of each requesting a token. Raises requests
+    exceptions from the token request unchanged.
+    """
+    key = (tenant_id, client_id, scope)
+    cached = _token_cache.get(key)
+    if cached is not None and time.time() < cached[1]:
+        return cached[0]
+
+    with _token_lock:
+        # Another thread may have refreshed while we waited
+        cached = _token_cache.get(key)
+        if cached is not None and time.time() < cached[1]:
+            return cached[0]
+        return _request_token(session, key, client_secret)
+
+
+def _request_token(session: requests.Session, key: Tuple[str, str, str], client_secret: str) -> str:
+    """Request a new token from Azure AD and cache it."""
+    tenant_id, client_id, scope = key
+    response = session.post(
+        f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token",
+        data={
+            'grant_type': 'client_credentials',
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'scope': scope,
+        },
+        timeout=30,
+    )
+    response.raise_for_status()
+    payload = json_loads(response.content)
+    access_token = payload['access_token']
+    expires_in = payload.get('expires_in')
+    if expires_in:
+        _token_cache[key] = (access_token, time.time() + int(expires_in) - TOKEN_EXPIRY_MARGIN)
+    return access_token
+
+
+def clear_token_cache() -> None:
+    """Forget all cached access tokens."""
+    _token_cache.clear()
@@ -0,0 +1,18 @@
+# hub_auth_client/utils/json_helpers.py
+"""
+JSON helper functions with optional orjson acceleration.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
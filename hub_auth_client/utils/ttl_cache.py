@@ -0,0 +1,53 @@
+# hub_auth_client/utils/ttl_cache.py
+"""
+Small in-process TTL cache used to memoize token validation results.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded cache whose entries expire after a per-entry TTL.
+
+    When full, the least recently inserted entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (defaults to the cache TTL)."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic() + ttl, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -41,6 +41,9 @@ setup(
         "django": [
             "Django>=4.2",
         ],
+        "fast": [
+            "orjson>=3.9.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-django>=4.5.0",
@@ -10,7 +10,7 @@ from django.test import RequestFactory, TestCase
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.contrib.messages.middleware import MessageMiddleware
 from django.contrib.messages.storage.fallback import FallbackStorage
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
 
 def get_admin_backend():
@@ -25,6 +25,12 @@ def get_admin_views():
     return MSALAdminLoginView, MSALAdminCallbackView
 
 
+def get_state_helpers():
+    """Lazy import of signed-state helpers."""
+    from hub_auth_client.django.admin_views import _NONCE_COOKIE, _dump_state, _load_state
+    return _NONCE_COOKIE, _dump_state, _load_state
+
+
 def get_user_model():
     """Lazy import of User model."""
     from django.contrib.auth import get_user_model
@@ -263,7 +269,16 @@ class TestMSALAdminLoginView:
         assert parsed_url.hostname == 'login.microsoftonline.com'
         assert 'tenant-123' in response.url
         assert 'client-456' in response.url
-        assert 'msal_state' in request.session
+        assert 'msal_state' not in request.session
+        assert 'msal_redirect_uri' not in request.session
+
+        # State is signed, bound to the nonce cookie and carries the redirect URI
+        nonce_cookie, _, load_state = get_state_helpers()
+        query = parse_qs(parsed_url.query)
+        assert load_state(query['state'][0]) == {
+            'n': response.cookies[nonce_cookie].value,
+            'r': query['redirect_uri'][0],
+        }
     
     @patch('hub_auth_client.django.admin_views.MSALAdminLoginView._get_config')
     def test_login_without_config_redirects_to_admin(self, mock_config):
@@ -304,25 +319,54 @@ class TestMSALAdminCallbackView:
         """Add messages framework to request."""
         setattr(request, '_messages', FallbackStorage(request))
         return request
+
+    def _signed_state(self, nonce='test-nonce', redirect_uri='http://localhost/callback'):
+        """Build a signed state value for the given nonce."""
+        _, dump_state, _ = get_state_helpers()
+        return dump_state({'n': nonce, 'r': redirect_uri})
+
+    def _add_nonce_cookie(self, request, nonce='test-nonce'):
+        """Attach the state nonce cookie to the request."""
+        nonce_cookie, _, _ = get_state_helpers()
+        request.COOKIES[nonce_cookie] = nonce
+        return request
     
     def test_callback_rejects_invalid_state(self):
         """Test callback rejects request with invalid state."""
         request = self.factory.get('/admin/login/msal/callback/?state=wrong&code=123')
         request = self._add_session_to_request(request)
         request = self._add_messages_to_request(request)
-        request.session['msal_state'] = 'correct'
+        request = self._add_nonce_cookie(request)
         
         response = self.view(request)
         
         assert response.status_code == 302
         assert response.url == '/admin/login/'
+
+    @patch('hub_auth_client.django.admin_views.MSALAdminCallbackView._exchange_code_for_token')
+    def test_callback_rejects_state_for_other_browser(self, mock_exchange):
+        """Test callback rejects a signed state whose nonce does not match the cookie."""
+        state = self._signed_state('attacker-nonce')
+        request = self.factory.get(f'/admin/login/msal/callback/?state={state}&code=123')
+        request = self._add_session_to_request(request)
+        request = self._add_messages_to_request(request)
+        request = self._add_nonce_cookie(request, 'victim-nonce')
+
+        response = self.view(request)
+
+        assert response.status_code == 302
+        assert response.url == '/admin/login/'
+        mock_exchange.assert_not_called()
     
     def test_callback_handles_error_from_microsoft(self):
         """Test callback handles error response from Microsoft."""
-        request = self.factory.get('/admin/login/msal/callback/?error=access_denied&error_description=User%20cancelled')
+        request = self.factory.get(
+            f'/admin/login/msal/callback/?state={self._signed_state()}'
+            '&error=access_denied&error_description=User%20cancelled'
+        )
         request = self._add_session_to_request(request)
         request = self._add_messages_to_request(request)
-        request.session['msal_state'] = 'test-state'
+        request = self._add_nonce_cookie(request)
         
         response = self.view(request)
         
@@ -347,11 +391,10 @@ class TestMSALAdminCallbackView:
             'roles': ['Admin']
         }
         
-        request = self.factory.get('/admin/login/msal/callback/?state=test-state&code=auth-code')
+        request = self.factory.get(f'/admin/login/msal/callback/?state={self._signed_state()}&code=auth-code')
         request = self._add_session_to_request(request)
         request = self._add_messages_to_request(request)
-        request.session['msal_state'] = 'test-state'
-        request.session['msal_redirect_uri'] = 'http://localhost/callback'
+        request = self._add_nonce_cookie(request)
         
         response = self.view(request)
         
@@ -382,11 +425,10 @@ class TestMSALAdminCallbackView:
             'roles': []  # No staff/admin roles
         }
         
-        request = self.factory.get('/admin/login/msal/callback/?state=test-state&code=auth-code')
+        request = self.factory.get(f'/admin/login/msal/callback/?state={self._signed_state()}&code=auth-code')
         request = self._add_session_to_request(request)
         request = self._add_messages_to_request(request)
-        request.session['msal_state'] = 'test-state'
-        request.session['msal_redirect_uri'] = 'http://localhost/callback'
+        request = self._add_nonce_cookie(request)
         
         response = self.view(request)
         
@@ -394,6 +436,28 @@ class TestMSALAdminCallbackView:
         assert response.status_code == 302
         assert response.url == '/admin/login/'
 
+    @patch('hub_auth_client.django.admin_views.MSALAdminCallbackView._exchange_code_for_token')
+    @patch('hub_auth_client.django.admin_views.MSALAdminCallbackView._validate_id_token')
+    @patch('hub_auth_client.django.admin_views.MSALAdminCallbackView._get_config')
+    def test_callback_resolves_config_once(self, mock_config, mock_validate, mock_exchange):
+        """Test that the callback resolves configuration once and reuses it."""
+        config = ('tenant-123', 'client-456', 'secret', Mock())
+        mock_config.return_value = config
+        mock_exchange.return_value = {'id_token': 'id-token'}
+        mock_validate.return_value = None
+
+        request = self.factory.get(f'/admin/login/msal/callback/?state={self._signed_state()}&code=auth-code')
+        request = self._add_session_to_request(request)
+        request = self._add_messages_to_request(request)
+        request = self._add_nonce_cookie(request)
+
+        self.view(request)
+
+        mock_config.assert_called_once()
+        assert mock_exchange.call_args[0][2] == 'http://localhost/callback'
+        assert mock_exchange.call_args[0][-1] is config
+        assert mock_validate.call_args[0][-1] is config
+
 
 @pytest.mark.django_db
 class TestAdminSSOIntegration:
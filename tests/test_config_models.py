@@ -117,6 +117,40 @@ class TestAzureADConfiguration:
             )
             config2.save()
     
+    def test_other_integrity_errors_not_reported_as_active_conflict(self):
+        """Test only the single-active constraint is translated to a ValidationError."""
+        from django.db import IntegrityError, models
+        AzureADConfiguration, _ = get_models()
+        _, _, ValidationError = get_test_utils()
+
+        AzureADConfiguration.objects.create(
+            name="Config 1",
+            tenant_id=self.valid_tenant_id,
+            client_id=self.valid_client_id,
+            is_active=True
+        )
+        config2 = AzureADConfiguration(
+            name="Config 2",
+            tenant_id=self.valid_tenant_id,
+            client_id=self.valid_client_id,
+            is_active=True
+        )
+
+        name_clash = IntegrityError(
+            f'UNIQUE constraint failed: {AzureADConfiguration._meta.db_table}.name'
+        )
+        with patch.object(models.Model, 'save', side_effect=name_clash):
+            with pytest.raises(IntegrityError) as excinfo:
+                config2.save()
+        assert excinfo.value is name_clash
+
+        active_clash = IntegrityError(
+            'duplicate key value violates unique constraint "only_one_active_config"'
+        )
+        with patch.object(models.Model, 'save', side_effect=active_clash):
+            with pytest.raises(ValidationError, match="already active"):
+                config2.save()
+
     def test_get_active_config(self):
         """Test get_active_config class method."""
         AzureADConfiguration, _ = get_models()
@@ -137,7 +171,11 @@ class TestAzureADConfiguration:
         assert active is not None
         assert active.name == "Active Config"
         assert active.is_active is True
-    
+
+        # Only runtime columns are loaded
+        assert 'description' in active.get_deferred_fields()
+        assert 'tenant_id' not in active.get_deferred_fields()
+
     @patch('hub_auth_client.MSALTokenValidator')
     def test_get_validator(self, mock_validator):
         """Test get_validator creates MSALTokenValidator instance."""
@@ -158,6 +196,94 @@ class TestAzureADConfiguration:
         assert call_kwargs['tenant_id'] == self.valid_tenant_id
         assert call_kwargs['client_id'] == self.valid_client_id
 
+    @patch('hub_auth_client.MSALTokenValidator')
+    def test_validator_cached_on_instance(self, mock_validator):
+        """Test that the validator is built once per config instance."""
+        AzureADConfiguration, _ = get_models()
+
+        config = AzureADConfiguration.objects.create(
+            name="Test Config",
+            tenant_id=self.valid_tenant_id,
+            client_id=self.valid_client_id,
+            is_active=True
+        )
+
+        assert config.create_validator() is config.validator
+        mock_validator.assert_called_once()
+
+        # Saving drops the cached validator so new settings take effect
+        config.token_leeway = 30
+        config.save()
+        config.validator
+        assert mock_validator.call_count == 2
+        assert mock_validator.call_args[1]['leeway'] == 30
+
+
+@pytest.mark.django_db
+class TestAzureADConfigurationHistory:
+    """Test AzureADConfigurationHistory logging."""
+
+    def test_log_bulk_inserts_on_commit(self, django_capture_on_commit_callbacks):
+        """Test history entries are written together once the transaction commits."""
+        AzureADConfiguration, AzureADConfigurationHistory = get_models()
+
+        config = AzureADConfiguration.objects.create(
+            name="Test Config",
+            tenant_id="a1b2c3d4-e5f6-7890-abcd-ef1234567890",
+            client_id="f9e8d7c6-b5a4-3210-fedc-ba9876543210",
+        )
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            AzureADConfigurationHistory.log([
+                AzureADConfigurationHistory.for_configuration(config, 'created', 'admin'),
+                AzureADConfigurationHistory.for_configuration(config, 'activated', 'admin'),
+            ])
+            assert AzureADConfigurationHistory.objects.count() == 0
+
+        assert len(callbacks) == 1
+        actions = set(AzureADConfigurationHistory.objects.values_list('action', flat=True))
+        assert actions == {'created', 'activated'}
+        assert AzureADConfigurationHistory.objects.filter(
+            configuration_name="Test Config", changed_by='admin'
+        ).count() == 2
+
+
+@pytest.mark.django_db
+class TestResolveAzureConfig:
+    """Test the shared database-then-settings config resolver."""
+
+    def test_falls_back_to_settings_and_caches(self, settings):
+        """Test settings fallback is built once and reused."""
+        from hub_auth_client.django.config_models import resolve_azure_config
+
+        settings.AZURE_AD_TENANT_ID = 'settings-tenant-id'
+        settings.MSAL_EXEMPT_PATHS = ['/health/']
+
+        resolved = resolve_azure_config()
+
+        assert resolved.tenant_id == 'settings-tenant-id'
+        assert resolved.exempt_paths == ['/health/']
+        assert resolved.name is None
+        assert resolve_azure_config().validator is resolved.validator
+
+    def test_prefers_database_config(self):
+        """Test the active database config wins over settings."""
+        AzureADConfiguration, _ = get_models()
+        from hub_auth_client.django.config_models import resolve_azure_config
+
+        AzureADConfiguration.objects.create(
+            name="Active Config",
+            tenant_id="a1b2c3d4-e5f6-7890-abcd-ef1234567890",
+            client_id="f9e8d7c6-b5a4-3210-fedc-ba9876543210",
+            client_secret="secret",
+            is_active=True
+        )
+
+        resolved = resolve_azure_config()
+
+        assert resolved.name == "Active Config"
+        assert resolved.client_secret == "secret"
+
 
 @pytest.mark.django_db
 class TestAuthenticationWithDatabaseConfig:
@@ -168,9 +294,8 @@ class TestAuthenticationWithDatabaseConfig:
         self.valid_tenant_id = "a1b2c3d4-e5f6-7890-abcd-ef1234567890"
         self.valid_client_id = "f9e8d7c6-b5a4-3210-fedc-ba9876543210"
     
-    @patch('hub_auth_client.django.authentication.MSALTokenValidator')
     @patch('hub_auth_client.MSALTokenValidator')
-    def test_uses_database_config_when_available(self, mock_validator_main, mock_validator_auth):
+    def test_uses_database_config_when_available(self, mock_validator_main):
         """Test that authentication uses database config when available."""
         AzureADConfiguration, _ = get_models()
         from hub_auth_client.django.authentication import MSALAuthentication
@@ -9,6 +9,7 @@ from unittest.mock import Mock, patch, MagicMock
 from django.http import JsonResponse
 from django.test import RequestFactory
 from hub_auth_client.django.decorators import (
+    _reset_validator,
     get_validator,
     require_token,
     require_scopes,
@@ -16,6 +17,14 @@ from hub_auth_client.django.decorators import (
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_validator():
+    """Clear the cached validator between tests."""
+    _reset_validator()
+    yield
+    _reset_validator()
+
+
 @pytest.fixture
 def request_factory():
     """Provide Django request factory."""
@@ -62,6 +71,12 @@ class TestGetValidator:
             leeway=0,
         )
     
+    @patch('hub_auth_client.django.decorators.MSALTokenValidator')
+    def test_get_validator_is_cached(self, mock_validator):
+        """Test get_validator builds the validator once and reuses it."""
+        assert get_validator() is get_validator()
+        mock_validator.assert_called_once()
+
     @patch('hub_auth_client.django.decorators.settings')
     def test_get_validator_missing_tenant_id(self, mock_settings_module):
         """Test get_validator raises error when tenant_id is missing."""
@@ -134,6 +149,8 @@ class TestRequireToken:
         
         assert response.status_code == 401
         assert b'Missing Authorization header' in response.content
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == JsonResponse({'error': 'Missing Authorization header'}).content
     
     def test_require_token_with_invalid_token(self, request_factory):
         """Test require_token rejects request with invalid token."""
@@ -158,6 +175,47 @@ class TestRequireToken:
         assert response.status_code == 401
         assert b'Invalid token' in response.content
 
+    def test_require_token_caches_valid_result(self, request_factory):
+        """Test a valid token is only verified once within the cache TTL."""
+        import time
+
+        @require_token
+        def test_view(request):
+            return JsonResponse({'success': True})
+
+        mock_validator = MagicMock()
+        mock_validator.validate_token.return_value = (
+            True,
+            {'sub': 'user-id', 'exp': time.time() + 3600},
+            None
+        )
+        mock_validator.extract_user_info.return_value = {'object_id': 'user-id'}
+
+        with patch('hub_auth_client.django.decorators.get_validator', return_value=mock_validator):
+            for _ in range(2):
+                request = request_factory.get('/test/')
+                request.META['HTTP_AUTHORIZATION'] = 'Bearer valid-token'
+                assert test_view(request).status_code == 200
+
+        mock_validator.validate_token.assert_called_once_with('Bearer valid-token')
+
+    def test_require_token_does_not_cache_invalid_result(self, request_factory):
+        """Test failed validations are retried on every request."""
+        @require_token
+        def test_view(request):
+            return JsonResponse({'success': True})
+
+        mock_validator = MagicMock()
+        mock_validator.validate_token.return_value = (False, None, 'Token has expired')
+
+        with patch('hub_auth_client.django.decorators.get_validator', return_value=mock_validator):
+            for _ in range(2):
+                request = request_factory.get('/test/')
+                request.META['HTTP_AUTHORIZATION'] = 'Bearer expired-token'
+                assert test_view(request).status_code == 401
+
+        assert mock_validator.validate_token.call_count == 2
+
 
 class TestRequireScopes:
     """Test the require_scopes decorator."""
@@ -188,7 +246,7 @@ class TestRequireScopes:
         assert response.status_code == 200
         mock_validator.validate_token.assert_called_once_with(
             'Bearer valid-token',
-            required_scopes=['User.Read', 'Files.ReadWrite'],
+            required_scopes=('User.Read', 'Files.ReadWrite'),
             require_all_scopes=False,
         )
     
@@ -252,10 +310,14 @@ class TestRequireScopes:
         assert response.status_code == 200
         mock_validator.validate_token.assert_called_once_with(
             'Bearer valid-token',
-            required_scopes=['User.Read', 'Files.ReadWrite'],
+            required_scopes=('User.Read', 'Files.ReadWrite'),
             require_all_scopes=True,
         )
 
+    def test_require_scopes_empty_list_is_require_token(self):
+        """Test an empty scope list only requires a valid token."""
+        assert require_scopes([]) is require_token
+
 
 class TestRequireRoles:
     """Test the require_roles decorator."""
@@ -286,7 +348,7 @@ class TestRequireRoles:
         assert response.status_code == 200
         mock_validator.validate_token.assert_called_once_with(
             'Bearer valid-token',
-            required_roles=['Admin', 'Manager'],
+            required_roles=('Admin', 'Manager'),
             require_all_roles=False,
         )
     
@@ -350,6 +412,10 @@ class TestRequireRoles:
         assert response.status_code == 200
         mock_validator.validate_token.assert_called_once_with(
             'Bearer valid-token',
-            required_roles=['Admin', 'Manager'],
+            required_roles=('Admin', 'Manager'),
             require_all_roles=True,
         )
+
+    def test_require_roles_empty_list_is_require_token(self):
+        """Test an empty role list only requires a valid token."""
+        assert require_roles([]) is require_token
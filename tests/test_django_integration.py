@@ -76,7 +76,7 @@ class TestMSALAuthentication:
     
     @pytest.fixture
     def mock_validator(self):
-        with patch('hub_auth_client.django.authentication.MSALTokenValidator') as mock:
+        with patch('hub_auth_client.MSALTokenValidator') as mock:
             yield mock
     
     def test_authenticate_no_header(self, factory):
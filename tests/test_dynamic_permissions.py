@@ -10,6 +10,8 @@ from hub_auth_client.django.dynamic_permissions import (
     DynamicScopePermission,
     DynamicRolePermission,
     DynamicPermission,
+    _extract_user_roles,
+    _extract_user_scopes,
 )
 
 
@@ -56,7 +58,9 @@ class TestDynamicScopePermission:
         request.path = '/api/test/'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_scope_names.return_value = []
+        mock_endpoint._scope_names = []
+        mock_endpoint._required_scope_set = frozenset([])
+        mock_endpoint._scope_count = 0
         
         view = Mock()
         
@@ -76,13 +80,16 @@ class TestDynamicScopePermission:
         request.path = '/api/test/'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_scope_names.return_value = ['User.Read', 'Files.ReadWrite']
+        mock_endpoint._scope_names = ['User.Read', 'Files.ReadWrite']
+        mock_endpoint._required_scope_set = frozenset(['User.Read', 'Files.ReadWrite'])
+        mock_endpoint._scope_count = 2
         mock_endpoint.scope_requirement = 'any'
+        mock_endpoint._requires_all_scopes = False
         
         view = Mock()
         
         with patch.object(permission, '_get_endpoint_permission', return_value=mock_endpoint):
-            with patch.object(permission, '_get_user_scopes', return_value=['User.Read']):
+            with patch('hub_auth_client.django.dynamic_permissions._extract_user_scopes', return_value=['User.Read']):
                 result = permission.has_permission(request, view)
         
         assert result is True
@@ -98,13 +105,16 @@ class TestDynamicScopePermission:
         request.path = '/api/test/'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_scope_names.return_value = ['Admin.ReadWrite']
+        mock_endpoint._scope_names = ['Admin.ReadWrite']
+        mock_endpoint._required_scope_set = frozenset(['Admin.ReadWrite'])
+        mock_endpoint._scope_count = 1
         mock_endpoint.scope_requirement = 'any'
+        mock_endpoint._requires_all_scopes = False
         
         view = Mock()
         
         with patch.object(permission, '_get_endpoint_permission', return_value=mock_endpoint):
-            with patch.object(permission, '_get_user_scopes', return_value=['User.Read']):
+            with patch('hub_auth_client.django.dynamic_permissions._extract_user_scopes', return_value=['User.Read']):
                 result = permission.has_permission(request, view)
         
         assert result is False
@@ -120,13 +130,16 @@ class TestDynamicScopePermission:
         request.path = '/api/test/'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_scope_names.return_value = ['User.Read', 'Files.ReadWrite']
+        mock_endpoint._scope_names = ['User.Read', 'Files.ReadWrite']
+        mock_endpoint._required_scope_set = frozenset(['User.Read', 'Files.ReadWrite'])
+        mock_endpoint._scope_count = 2
         mock_endpoint.scope_requirement = 'all'
+        mock_endpoint._requires_all_scopes = True
         
         view = Mock()
         
         with patch.object(permission, '_get_endpoint_permission', return_value=mock_endpoint):
-            with patch.object(permission, '_get_user_scopes', return_value=['User.Read', 'Files.ReadWrite', 'Mail.Send']):
+            with patch('hub_auth_client.django.dynamic_permissions._extract_user_scopes', return_value=['User.Read', 'Files.ReadWrite', 'Mail.Send']):
                 result = permission.has_permission(request, view)
         
         assert result is True
@@ -142,65 +155,71 @@ class TestDynamicScopePermission:
         request.path = '/api/test/'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_scope_names.return_value = ['User.Read', 'Files.ReadWrite', 'Admin.All']
+        mock_endpoint._scope_names = ['User.Read', 'Files.ReadWrite', 'Admin.All']
+        mock_endpoint._required_scope_set = frozenset(['User.Read', 'Files.ReadWrite', 'Admin.All'])
+        mock_endpoint._scope_count = 3
         mock_endpoint.scope_requirement = 'all'
+        mock_endpoint._requires_all_scopes = True
         
         view = Mock()
         
         with patch.object(permission, '_get_endpoint_permission', return_value=mock_endpoint):
-            with patch.object(permission, '_get_user_scopes', return_value=['User.Read', 'Files.ReadWrite']):
+            with patch('hub_auth_client.django.dynamic_permissions._extract_user_scopes', return_value=['User.Read', 'Files.ReadWrite']):
                 result = permission.has_permission(request, view)
         
         assert result is False
     
-    def test_get_user_scopes_from_user_attribute(self):
+    def test_extract_user_scopes_from_user_attribute(self):
         """Test getting scopes from user.scopes attribute."""
-        permission = DynamicScopePermission()
-        
-        request = Mock()
+        request = Mock(spec=['user', 'auth'])
         request.user = Mock()
         request.user.scopes = ['User.Read', 'Files.ReadWrite']
         
-        result = permission._get_user_scopes(request)
+        result = _extract_user_scopes(request)
         
-        assert result == ['User.Read', 'Files.ReadWrite']
+        assert result == frozenset(['User.Read', 'Files.ReadWrite'])
     
-    def test_get_user_scopes_from_token_scp(self):
+    def test_extract_user_scopes_from_token_scp(self):
         """Test getting scopes from token 'scp' claim."""
-        permission = DynamicScopePermission()
-        
-        request = Mock()
+        request = Mock(spec=['user', 'auth'])
         request.user = Mock(spec=[])  # No scopes attribute
         request.auth = {'scp': 'User.Read Files.ReadWrite'}
         
-        result = permission._get_user_scopes(request)
+        result = _extract_user_scopes(request)
         
-        assert result == ['User.Read', 'Files.ReadWrite']
+        assert result == frozenset(['User.Read', 'Files.ReadWrite'])
     
-    def test_get_user_scopes_from_token_scopes_array(self):
+    def test_extract_user_scopes_from_token_scopes_array(self):
         """Test getting scopes from token 'scopes' array."""
-        permission = DynamicScopePermission()
-        
-        request = Mock()
+        request = Mock(spec=['user', 'auth'])
         request.user = Mock(spec=[])
         request.auth = {'scopes': ['User.Read', 'Files.ReadWrite']}
         
-        result = permission._get_user_scopes(request)
+        result = _extract_user_scopes(request)
         
-        assert result == ['User.Read', 'Files.ReadWrite']
+        assert result == frozenset(['User.Read', 'Files.ReadWrite'])
     
-    def test_get_user_scopes_returns_empty_when_not_found(self):
-        """Test getting scopes returns empty list when not found."""
-        permission = DynamicScopePermission()
-        
-        request = Mock()
+    def test_extract_user_scopes_returns_empty_when_not_found(self):
+        """Test getting scopes returns an empty set when not found."""
+        request = Mock(spec=['user', 'auth'])
         request.user = Mock(spec=[])
         # No auth attribute
         delattr(request, 'auth')
         
-        result = permission._get_user_scopes(request)
+        result = _extract_user_scopes(request)
         
-        assert result == []
+        assert result == frozenset()
+
+    def test_extract_user_scopes_memoized_on_request(self):
+        """Test scopes are parsed once per request."""
+        request = Mock(spec=['user', 'auth'])
+        request.user = Mock(spec=[])
+        request.auth = {'scp': 'User.Read'}
+
+        first = _extract_user_scopes(request)
+        request.auth = {'scp': 'Files.ReadWrite'}
+
+        assert _extract_user_scopes(request) is first
 
 
 class TestDynamicRolePermission:
@@ -231,13 +250,16 @@ class TestDynamicRolePermission:
         request.path = '/api/test/'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_role_names.return_value = ['Admin', 'Manager']
+        mock_endpoint._role_names = ['Admin', 'Manager']
+        mock_endpoint._required_role_set = frozenset(['Admin', 'Manager'])
+        mock_endpoint._role_count = 2
         mock_endpoint.role_requirement = 'any'
+        mock_endpoint._requires_all_roles = False
         
         view = Mock()
         
         with patch.object(permission, '_get_endpoint_permission', return_value=mock_endpoint):
-            with patch.object(permission, '_get_user_roles', return_value=['Admin']):
+            with patch('hub_auth_client.django.dynamic_permissions._extract_user_roles', return_value=['Admin']):
                 result = permission.has_permission(request, view)
         
         assert result is True
@@ -253,40 +275,39 @@ class TestDynamicRolePermission:
         request.path = '/api/test/'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_role_names.return_value = ['Admin', 'Manager']
+        mock_endpoint._role_names = ['Admin', 'Manager']
+        mock_endpoint._required_role_set = frozenset(['Admin', 'Manager'])
+        mock_endpoint._role_count = 2
         mock_endpoint.role_requirement = 'all'
+        mock_endpoint._requires_all_roles = True
         
         view = Mock()
         
         with patch.object(permission, '_get_endpoint_permission', return_value=mock_endpoint):
-            with patch.object(permission, '_get_user_roles', return_value=['Admin', 'Manager', 'User']):
+            with patch('hub_auth_client.django.dynamic_permissions._extract_user_roles', return_value=['Admin', 'Manager', 'User']):
                 result = permission.has_permission(request, view)
         
         assert result is True
     
-    def test_get_user_roles_from_user_attribute(self):
+    def test_extract_user_roles_from_user_attribute(self):
         """Test getting roles from user.roles attribute."""
-        permission = DynamicRolePermission()
-        
-        request = Mock()
+        request = Mock(spec=['user', 'auth'])
         request.user = Mock()
         request.user.roles = ['Admin', 'Manager']
         
-        result = permission._get_user_roles(request)
+        result = _extract_user_roles(request)
         
-        assert result == ['Admin', 'Manager']
+        assert result == frozenset(['Admin', 'Manager'])
     
-    def test_get_user_roles_from_token(self):
+    def test_extract_user_roles_from_token(self):
         """Test getting roles from token claims."""
-        permission = DynamicRolePermission()
-        
-        request = Mock()
+        request = Mock(spec=['user', 'auth'])
         request.user = Mock(spec=[])
         request.auth = {'roles': ['Admin', 'Manager']}
         
-        result = permission._get_user_roles(request)
+        result = _extract_user_roles(request)
         
-        assert result == ['Admin', 'Manager']
+        assert result == frozenset(['Admin', 'Manager'])
 
 
 class TestDynamicPermission:
@@ -310,49 +331,299 @@ class TestDynamicPermission:
         """Test user with required scopes and roles is allowed."""
         permission = DynamicPermission()
         
-        request = Mock()
+        request = Mock(spec=['user', 'auth', 'path', 'method'])
         request.user = Mock()
         request.user.is_authenticated = True
         request.user.username = 'testuser'
+        request.user.scopes = ['User.Read', 'Mail.Send']
+        request.user.roles = ['User']
         request.path = '/api/test/'
         request.method = 'GET'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_scope_names.return_value = ['User.Read']
-        mock_endpoint.get_required_role_names.return_value = ['User']
+        mock_endpoint._scope_names = ['User.Read']
+        mock_endpoint._required_scope_set = frozenset(['User.Read'])
+        mock_endpoint._requires_all_scopes = False
+        mock_endpoint._role_names = ['User']
+        mock_endpoint._required_role_set = frozenset(['User'])
+        mock_endpoint._requires_all_roles = False
         
         view = Mock()
         
         with patch('hub_auth_client.django.dynamic_permissions.cache') as mock_cache:
             mock_cache.get.return_value = mock_endpoint
-            
-            with patch('hub_auth_client.django.dynamic_permissions.DynamicScopePermission.has_permission', return_value=True):
-                with patch('hub_auth_client.django.dynamic_permissions.DynamicRolePermission.has_permission', return_value=True):
-                    result = permission.has_permission(request, view)
+            result = permission.has_permission(request, view)
         
         assert result is True
+        # The endpoint permission is looked up once and shared by both checks
+        version = mock_cache.get_or_set.return_value
+        mock_cache.get.assert_called_once_with(f'endpoint_perm:{version}:/api/test/:GET')
     
     def test_user_missing_required_scopes_denied(self):
         """Test user missing required scopes is denied."""
         permission = DynamicPermission()
         
-        request = Mock()
+        request = Mock(spec=['user', 'auth', 'path', 'method'])
         request.user = Mock()
         request.user.is_authenticated = True
         request.user.username = 'testuser'
+        request.user.scopes = ['User.Read']
+        request.user.roles = []
         request.path = '/api/test/'
         request.method = 'POST'
         
         mock_endpoint = Mock()
-        mock_endpoint.get_required_scope_names.return_value = ['Admin.ReadWrite']
-        mock_endpoint.get_required_role_names.return_value = []
+        mock_endpoint._scope_names = ['Admin.ReadWrite']
+        mock_endpoint._required_scope_set = frozenset(['Admin.ReadWrite'])
+        mock_endpoint._requires_all_scopes = False
+        mock_endpoint._role_names = []
+        mock_endpoint._required_role_set = frozenset([])
+        mock_endpoint._requires_all_roles = False
         
         view = Mock()
         
         with patch('hub_auth_client.django.dynamic_permissions.cache') as mock_cache:
             mock_cache.get.return_value = mock_endpoint
-            
-            with patch('hub_auth_client.django.dynamic_permissions.DynamicScopePermission.has_permission', return_value=False):
-                result = permission.has_permission(request, view)
+            result = permission.has_permission(request, view)
         
         assert result is False
+    
+    def test_user_missing_some_roles_when_all_required_denied(self):
+        """Test roles are checked after scopes pass."""
+        permission = DynamicPermission()
+        
+        request = Mock(spec=['user', 'auth', 'path', 'method'])
+        request.user = Mock()
+        request.user.is_authenticated = True
+        request.user.username = 'testuser'
+        request.user.scopes = ['User.Read']
+        request.user.roles = ['User']
+        request.path = '/api/test/'
+        request.method = 'GET'
+        
+        mock_endpoint = Mock()
+        mock_endpoint._scope_names = ['User.Read']
+        mock_endpoint._required_scope_set = frozenset(['User.Read'])
+        mock_endpoint._requires_all_scopes = False
+        mock_endpoint._role_names = ['Admin', 'User']
+        mock_endpoint._required_role_set = frozenset(['Admin', 'User'])
+        mock_endpoint._requires_all_roles = True
+        
+        view = Mock()
+        
+        with patch('hub_auth_client.django.dynamic_permissions.cache') as mock_cache:
+            mock_cache.get.return_value = mock_endpoint
+            result = permission.has_permission(request, view)
+        
+        assert result is False
+
+@pytest.mark.django_db
+class TestLookupEndpointPermission:
+    """Test the shared endpoint permission lookup."""
+
+    def setup_method(self):
+        from django.core.cache import cache
+        from hub_auth_client.django.dynamic_permissions import _negative_cache
+        cache.clear()
+        _negative_cache.clear()
+
+    def test_lookup_reuses_match_until_permission_changes(self, django_assert_num_queries):
+        """Test repeated lookups skip the database until a permission is saved."""
+        from django.core.cache import cache
+        from hub_auth_client.django.dynamic_permissions import (
+            _lookup_endpoint_permission,
+            _permissions_version,
+        )
+        from hub_auth_client.django.models import EndpointPermission
+
+        perm = EndpointPermission.objects.create(
+            name='Items',
+            url_pattern=r'^/api/items/',
+            http_methods='GET',
+        )
+
+        assert _lookup_endpoint_permission('/api/items/', 'GET').pk == perm.pk
+
+        # Without the shared cache entry the in-process match is reused
+        cache.delete(f'endpoint_perm:{_permissions_version()}:/api/items/:GET')
+        with django_assert_num_queries(0):
+            assert _lookup_endpoint_permission('/api/items/', 'GET').pk == perm.pk
+
+        perm.is_active = False
+        perm.save()
+
+        assert _lookup_endpoint_permission('/api/items/', 'GET') is None
+
+    def test_requirement_changes_apply_to_cached_paths(self):
+        """Test editing required scopes/roles retires the cached permission."""
+        from hub_auth_client.django.dynamic_permissions import _lookup_endpoint_permission
+        from hub_auth_client.django.models import EndpointPermission, RoleDefinition, ScopeDefinition
+
+        perm = EndpointPermission.objects.create(name='Items', url_pattern=r'^/api/items/')
+        perm.required_scopes.add(ScopeDefinition.objects.create(name='Items.Read'))
+
+        cached = _lookup_endpoint_permission('/api/items/', 'GET')
+        assert cached._required_scope_set == frozenset({'Items.Read'})
+        assert _lookup_endpoint_permission('/api/items/', 'GET')._scope_names == ('Items.Read',)
+
+        perm.required_scopes.set([ScopeDefinition.objects.create(name='Items.Write')])
+        perm.required_roles.add(RoleDefinition.objects.create(name='Editor'))
+
+        updated = _lookup_endpoint_permission('/api/items/', 'GET')
+        assert updated._required_scope_set == frozenset({'Items.Write'})
+        assert updated._required_role_set == frozenset({'Editor'})
+
+    def test_lookup_honours_priority_and_methods(self):
+        """Test the compiled table keeps priority order and method filtering."""
+        from hub_auth_client.django.dynamic_permissions import _lookup_endpoint_permission
+        from hub_auth_client.django.models import EndpointPermission
+
+        EndpointPermission.objects.create(
+            name='Broken', url_pattern=r'^/api/(', http_methods='*', priority=100,
+        )
+        general = EndpointPermission.objects.create(
+            name='API', url_pattern=r'^/api/', http_methods='*', priority=0,
+        )
+        writes = EndpointPermission.objects.create(
+            name='Item writes', url_pattern=r'^/api/items/', http_methods='POST', priority=10,
+        )
+
+        assert _lookup_endpoint_permission('/api/items/', 'POST').pk == writes.pk
+        assert _lookup_endpoint_permission('/api/items/', 'GET').pk == general.pk
+        assert _lookup_endpoint_permission('/other/', 'GET') is None
+
+    def test_combined_matcher_matches_linear_scan(self):
+        """Test the combined alternation and the per-pattern fallback agree."""
+        import re
+        from hub_auth_client.django.dynamic_permissions import (
+            _combine_patterns,
+            _match_permission_id,
+        )
+
+        entries = (
+            (re.compile(r'^/api/items/(?P<pk>\d+)/$'), 3),
+            (re.compile(r'^/api/items/'), 2),
+            (re.compile(r'^/api/'), 1),
+        )
+        combined = _combine_patterns(entries)
+        assert combined is not None
+
+        for path, expected in [
+            ('/api/items/7/', 3),
+            ('/api/items/', 2),
+            ('/api/users/', 1),
+            ('/health/', None),
+        ]:
+            assert _match_permission_id((combined, entries), path) == expected
+            assert _match_permission_id((None, entries), path) == expected
+
+        # Backreferences cannot survive being renumbered inside the alternation
+        assert _combine_patterns(((re.compile(r'^/(a)/\1/$'), 1),)) is None
+
+    def test_lookup_attaches_requirements(self, django_assert_num_queries):
+        """Test scope and role requirements are precomputed on the permission."""
+        from hub_auth_client.django.dynamic_permissions import _lookup_endpoint_permission
+        from hub_auth_client.django.models import EndpointPermission, ScopeDefinition
+
+        perm = EndpointPermission.objects.create(name='Items', url_pattern=r'^/api/items/')
+        perm.required_scopes.add(
+            ScopeDefinition.objects.create(name='Items.Read', category='b'),
+            ScopeDefinition.objects.create(name='Items.List', category='c'),
+            ScopeDefinition.objects.create(name='Items.Write', category='a'),
+            ScopeDefinition.objects.create(name='Items.Legacy', is_active=False),
+        )
+
+        endpoint_perm = _lookup_endpoint_permission('/api/items/', 'GET')
+
+        with django_assert_num_queries(0):
+            assert endpoint_perm._scope_names == ('Items.List', 'Items.Read', 'Items.Write')
+            assert endpoint_perm._required_scope_set == frozenset(endpoint_perm._scope_names)
+            assert endpoint_perm._scope_count == 4
+            assert endpoint_perm._role_names == ()
+            assert endpoint_perm._role_count == 0
+            assert endpoint_perm._requires_all_scopes is False
+            assert endpoint_perm.get_required_scope_names() == ['Items.Write', 'Items.Read', 'Items.List']
+            assert 'description' in endpoint_perm.get_deferred_fields()
+
+    def test_paths_sharing_a_permission_load_it_once(self, django_assert_num_queries):
+        """Test a new path matching an already loaded permission skips the database."""
+        from hub_auth_client.django.dynamic_permissions import _lookup_endpoint_permission
+        from hub_auth_client.django.models import EndpointPermission
+
+        perm = EndpointPermission.objects.create(name='Item', url_pattern=r'^/api/items/\d+/$')
+
+        assert _lookup_endpoint_permission('/api/items/1/', 'GET').pk == perm.pk
+
+        with django_assert_num_queries(0):
+            assert _lookup_endpoint_permission('/api/items/2/', 'GET').pk == perm.pk
+
+    def test_unmatched_paths_skip_shared_cache(self):
+        """Test unknown paths are remembered in-process until permissions change."""
+        from hub_auth_client.django.dynamic_permissions import (
+            _lookup_endpoint_permission,
+            _permissions_version,
+        )
+        from hub_auth_client.django.models import EndpointPermission
+
+        assert _lookup_endpoint_permission('/api/unknown/', 'GET') is None
+
+        version = _permissions_version()
+        with patch('hub_auth_client.django.dynamic_permissions.cache') as mock_cache:
+            mock_cache.get_or_set.return_value = version
+            assert _lookup_endpoint_permission('/api/unknown/', 'GET') is None
+        # Only the version token is read
+        mock_cache.get.assert_not_called()
+
+        perm = EndpointPermission.objects.create(name='Unknown', url_pattern=r'^/api/unknown/')
+
+        assert _lookup_endpoint_permission('/api/unknown/', 'GET').pk == perm.pk
+
+    def test_permission_added_in_another_process_enforced(self):
+        """Test a version bump from elsewhere overrides this process's negative entries."""
+        from django.core.cache import cache
+        from hub_auth_client.django.dynamic_permissions import (
+            _VERSION_CACHE_KEY,
+            _lookup_endpoint_permission,
+            _negative_cache,
+        )
+        from hub_auth_client.django.models import EndpointPermission
+
+        assert _lookup_endpoint_permission('/api/new/', 'GET') is None
+        assert len(_negative_cache) == 1
+
+        # Another worker adds the permission: its signal bumps the shared
+        # version but cannot clear this process's negative cache
+        with patch('hub_auth_client.django.dynamic_permissions._negative_cache'):
+            perm = EndpointPermission.objects.create(name='New', url_pattern=r'^/api/new/')
+        assert len(_negative_cache) == 1
+        assert cache.get(_VERSION_CACHE_KEY) is not None
+
+        assert _lookup_endpoint_permission('/api/new/', 'GET').pk == perm.pk
+
+    def test_changes_without_signals_picked_up_after_version_expires(self):
+        """Test update() and bulk_create() changes are seen once the version token expires."""
+        import time
+        from hub_auth_client.django.dynamic_permissions import (
+            _VERSION_TIMEOUT,
+            _lookup_endpoint_permission,
+            _negative_cache,
+        )
+        from hub_auth_client.django.models import EndpointPermission
+
+        perm = EndpointPermission.objects.create(name='Items', url_pattern=r'^/api/items/')
+        assert _lookup_endpoint_permission('/api/items/', 'GET').pk == perm.pk
+        assert _lookup_endpoint_permission('/api/orders/', 'GET') is None
+
+        # Neither of these sends post_save
+        EndpointPermission.objects.filter(pk=perm.pk).update(is_active=False)
+        EndpointPermission.objects.bulk_create([
+            EndpointPermission(name='Orders', url_pattern=r'^/api/orders/'),
+        ])
+
+        # Path entries and the negative cache expire first; the version token
+        # expires no later than the 5 minute path entries
+        later = time.time() + max(_VERSION_TIMEOUT, 300) + 1
+        _negative_cache.clear()
+        with patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            assert _lookup_endpoint_permission('/api/items/', 'GET') is None
+            assert _lookup_endpoint_permission('/api/orders/', 'GET').name == 'Orders'
@@ -0,0 +1,360 @@
+"""
+Tests for fetch_azure_roles management command.
+"""
+import pytest
+from io import StringIO
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Forget access tokens cached by earlier tests."""
+    from hub_auth_client.utils.http import clear_token_cache
+    clear_token_cache()
+    yield
+    clear_token_cache()
+
+
+def get_command():
+    """Lazy import of the command to avoid app registry issues."""
+    from hub_auth_client.django.management.commands.fetch_azure_roles import Command
+    return Command(stdout=StringIO(), stderr=StringIO())
+
+
+@pytest.mark.django_db
+class TestImportRoles:
+    """Test importing fetched roles into RoleDefinition."""
+
+    def test_import_creates_and_updates_in_bulk(self, django_assert_max_num_queries):
+        """Test roles are created and updated without per-role queries."""
+        from hub_auth_client.django.models import RoleDefinition
+
+        RoleDefinition.objects.create(name='Admin', description='Old description')
+        RoleDefinition.objects.create(name='Reader', description='Reads things')
+
+        roles = [
+            {'name': 'Admin', 'description': 'Administrators', 'is_enabled': True},
+            {'name': 'Reader', 'description': 'Reads things', 'is_enabled': True},
+            {'name': 'Writer', 'description': 'Writes things', 'is_enabled': True},
+            {'name': 'Legacy', 'description': 'Old role', 'is_enabled': False},
+            {'name': '', 'description': 'Nameless'},
+        ]
+
+        command = get_command()
+        with django_assert_max_num_queries(5):
+            command.import_roles(roles)
+
+        assert RoleDefinition.objects.get(name='Admin').description == 'Administrators'
+        assert RoleDefinition.objects.get(name='Writer').is_active is True
+        assert RoleDefinition.objects.get(name='Legacy').is_active is False
+        assert RoleDefinition.objects.count() == 4
+
+        output = command.stdout.getvalue()
+        assert 'Created: 2' in output
+        assert 'Updated: 1' in output
+        assert 'Skipped: 2' in output
+
+
+class TestHandle:
+    """Test option handling in the command entry point."""
+
+    def test_batch_size_passed_to_import(self):
+        """Test --batch-size reaches import_roles."""
+        from unittest.mock import patch
+        from django.core.management import call_command
+        from hub_auth_client.django.management.commands.fetch_azure_roles import Command
+
+        roles = [{'name': 'Admin', 'description': '', 'category': 'user', 'source': 'app_registration'}]
+        with patch.object(Command, 'fetch_roles_from_azure', return_value=roles), \
+                patch.object(Command, 'import_roles') as import_roles:
+            call_command(
+                'fetch_azure_roles', '--import', '--batch-size', '1000',
+                '--tenant-id', 't', '--client-id', 'c', '--client-secret', 's',
+                stdout=StringIO(),
+            )
+
+        import_roles.assert_called_once_with(roles, batch_size=1000, verbose=True)
+
+    @pytest.mark.django_db
+    def test_json_import_keeps_stdout_parseable(self):
+        """Test --format=json --import writes only the JSON document to stdout."""
+        import json
+        from unittest.mock import patch
+        from django.core.management import call_command
+        from hub_auth_client.django.management.commands.fetch_azure_roles import Command
+
+        roles = [{'name': 'Admin', 'description': 'Admins', 'category': 'user', 'source': 'app_registration'}]
+        stdout, stderr = StringIO(), StringIO()
+        with patch.object(Command, 'fetch_roles_from_azure', return_value=roles):
+            call_command(
+                'fetch_azure_roles', '--format', 'json', '--import',
+                '--tenant-id', 't', '--client-id', 'c', '--client-secret', 's',
+                stdout=stdout, stderr=stderr,
+            )
+
+        assert json.loads(stdout.getvalue()) == roles
+        assert 'Created role: Admin' in stderr.getvalue()
+        assert 'Created: 1' in stderr.getvalue()
+
+    def test_json_without_roles_writes_nothing_to_stdout(self):
+        """Test the no-roles warning goes to stderr in JSON mode."""
+        from unittest.mock import patch
+        from django.core.management import call_command
+        from hub_auth_client.django.management.commands.fetch_azure_roles import Command
+
+        stdout, stderr = StringIO(), StringIO()
+        with patch.object(Command, 'fetch_roles_from_azure', return_value=[]):
+            call_command(
+                'fetch_azure_roles', '--format', 'json',
+                '--tenant-id', 't', '--client-id', 'c', '--client-secret', 's',
+                stdout=stdout, stderr=stderr,
+            )
+
+        assert stdout.getvalue() == ''
+        assert 'No App Roles found' in stderr.getvalue()
+
+
+class TestFetchRolesFromAzure:
+    """Test fetching App Roles through Microsoft Graph."""
+
+    @pytest.fixture
+    def config(self):
+        return {
+            'tenant_id': 'test-tenant-id',
+            'client_id': 'test-client-id',
+            'client_secret': 'test-client-secret',
+        }
+
+    @staticmethod
+    def response(payload):
+        from unittest.mock import Mock
+        import json
+        response = Mock()
+        response.json.return_value = payload
+        response.content = json.dumps(payload).encode()
+        response.raise_for_status = Mock()
+        return response
+
+    def test_fetch_uses_shared_session(self, config):
+        """Test the token and Graph requests go through one pooled session."""
+        from unittest.mock import Mock
+
+        command = get_command()
+        command.session = Mock()
+        command.session.post.return_value = self.response({'access_token': 'token', 'expires_in': 3600})
+        command.session.get.return_value = self.response({'value': [{
+            'id': 'object-id',
+            'appId': 'test-client-id',
+            'displayName': 'Test App',
+            'appRoles': [
+                {'value': 'Admin', 'displayName': 'Admin', 'description': 'Admins',
+                 'allowedMemberTypes': ['User'], 'isEnabled': True, 'id': 'role-1'},
+                {'value': 'Old', 'isEnabled': False, 'id': 'role-2'},
+            ],
+        }]})
+
+        roles = command.fetch_roles_from_azure(config)
+
+        assert [role['name'] for role in roles] == ['Admin']
+        assert roles[0]['category'] == 'user'
+        command.session.post.assert_called_once()
+        command.session.get.assert_called_once()
+        assert command.session.get.call_args[1]['params']['$select'] == 'id,appId,displayName,appRoles'
+
+    def test_access_token_reused_until_expiry(self, config):
+        """Test a second fetch reuses the cached access token."""
+        from unittest.mock import Mock
+
+        command = get_command()
+        command.session = Mock()
+        command.session.post.return_value = self.response({'access_token': 'token', 'expires_in': 3600})
+        command.session.get.return_value = self.response({'value': []})
+
+        command.fetch_roles_from_azure(config)
+        command.fetch_roles_from_azure(config)
+
+        command.session.post.assert_called_once()
+        assert command.session.get.call_count == 2
+        headers = command.session.get.call_args[1]['headers']
+        assert headers['Authorization'] == 'Bearer token'
+        assert headers['Accept'] == 'application/json;odata.metadata=none'
+        assert 'gzip' in headers['Accept-Encoding']
+
+    def test_concurrent_token_requests_share_one_refresh(self, config):
+        """Test threads racing on an empty cache trigger a single token request."""
+        import threading
+        import time
+        from unittest.mock import Mock
+        from hub_auth_client.utils.http import get_client_credentials_token
+
+        session = Mock()
+
+        def slow_post(*args, **kwargs):
+            time.sleep(0.05)
+            return self.response({'access_token': 'token', 'expires_in': 3600})
+
+        session.post.side_effect = slow_post
+        tokens = []
+        threads = [
+            threading.Thread(target=lambda: tokens.append(get_client_credentials_token(
+                session, config['tenant_id'], config['client_id'], config['client_secret']
+            )))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert tokens == ['token'] * 5
+        session.post.assert_called_once()
+
+    def test_include_microsoft_uses_one_batch_request(self, config):
+        """Test the app and Microsoft Graph lookups share a single $batch call."""
+        from unittest.mock import Mock
+
+        app = {'id': 'object-id', 'appId': 'test-client-id', 'displayName': 'Test App', 'appRoles': [
+            {'value': 'Admin', 'allowedMemberTypes': ['User'], 'isEnabled': True, 'id': 'role-1'},
+        ]}
+        ms_graph = {'appRoles': [
+            {'value': 'User.Read.All', 'allowedMemberTypes': ['Application'], 'isEnabled': True, 'id': 'ms-1'},
+        ]}
+
+        command = get_command()
+        command.session = Mock()
+        command.session.post.side_effect = [
+            self.response({'access_token': 'token', 'expires_in': 3600}),
+            self.response({'responses': [
+                {'id': 'ms_graph', 'status': 200, 'body': {'value': [ms_graph]}},
+                {'id': 'app', 'status': 200, 'body': {'value': [app]}},
+            ]}),
+        ]
+
+        roles = command.fetch_roles_from_azure(config, include_microsoft=True)
+
+        assert [role['name'] for role in roles] == ['Admin', 'User.Read.All']
+        command.session.get.assert_not_called()
+        batch_call = command.session.post.call_args_list[1]
+        assert batch_call[0][0] == 'https://graph.microsoft.com/v1.0/$batch'
+        assert {r['id'] for r in batch_call[1]['json']['requests']} == {'app', 'ms_graph'}
+
+    def test_batch_failure_falls_back_to_individual_requests(self, config):
+        """Test a rejected $batch call falls back to separate GETs."""
+        import requests
+        from unittest.mock import Mock
+
+        command = get_command()
+        command.session = Mock()
+        command.session.post.side_effect = [
+            self.response({'access_token': 'token', 'expires_in': 3600}),
+            requests.exceptions.ConnectionError('batch unavailable'),
+        ]
+        command.session.get.side_effect = [
+            self.response({'value': [{'id': 'object-id', 'appRoles': [
+                {'value': 'Admin', 'isEnabled': True},
+            ]}]}),
+            self.response({'value': [{'appRoles': [
+                {'value': 'User.Read.All', 'isEnabled': True},
+            ]}]}),
+        ]
+
+        roles = command.fetch_roles_from_azure(config, include_microsoft=True)
+
+        assert [role['name'] for role in roles] == ['Admin', 'User.Read.All']
+        assert command.session.get.call_count == 2
+
+    def test_quiet_fetch_writes_no_progress(self, config):
+        """Test progress lines are suppressed when verbose is off (JSON output)."""
+        from unittest.mock import Mock
+
+        command = get_command()
+        command.session = Mock()
+        command.session.post.return_value = self.response({'access_token': 'token', 'expires_in': 3600})
+        command.session.get.return_value = self.response({'value': [{'id': 'object-id', 'appRoles': [
+            {'value': 'Admin', 'isEnabled': True},
+            {'value': 'Old', 'isEnabled': False},
+        ]}]})
+
+        roles = command.fetch_roles_from_azure(config, verbose=False)
+
+        assert [role['name'] for role in roles] == ['Admin']
+        assert command.stdout.getvalue() == ''
+
+    def test_client_id_quotes_escaped_in_filter(self, config):
+        """Test apostrophes in the client ID are doubled per OData quoting rules."""
+        from unittest.mock import Mock
+
+        config['client_id'] = "o'brien"
+        command = get_command()
+        command.session = Mock()
+        command.session.post.return_value = self.response({'access_token': 'token', 'expires_in': 3600})
+        command.session.get.return_value = self.response({'value': []})
+
+        command.fetch_roles_from_azure(config)
+
+        assert command.session.get.call_args[1]['params']['$filter'] == "appId eq 'o''brien'"
+
+
+class TestOutputTable:
+    """Test the table output."""
+
+    def test_table_lists_roles_and_summary(self):
+        """Test every role row and the category summary are rendered."""
+        roles = [
+            {'name': 'Writer', 'description': 'Writes', 'category': 'user', 'source': 'app_registration',
+             'is_enabled': True, 'allowed_member_types': ['User']},
+            {'name': 'Admin', 'description': 'Admins', 'category': 'user', 'source': 'app_registration',
+             'is_enabled': True, 'allowed_member_types': ['User']},
+            {'name': 'Daemon', 'description': '', 'category': 'application', 'source': 'app_registration',
+             'is_enabled': True, 'allowed_member_types': ['Application']},
+        ]
+
+        command = get_command()
+        command.output_table(roles)
+
+        output = command.stdout.getvalue()
+        assert 'Found 3 App Roles' in output
+        assert output.index('Admin') < output.index('Writer')
+        assert '  → Admins' in output
+        assert '↳ Assignable to: Application' in output
+        assert '  application: 1\n  user: 2' in output
+
+
+class TestOutputJson:
+    """Test the JSON output."""
+
+    def test_streamed_json_matches_dumps(self):
+        """Test streamed output is identical to a single json.dumps call."""
+        import json
+
+        roles = [
+            {'name': f'Role{i}', 'description': 'Zugriff für alle', 'allowed_member_types': ['User']}
+            for i in range(300)
+        ]
+
+        command = get_command()
+        command.output_json(roles)
+
+        assert command.stdout.getvalue() == json.dumps(roles, indent=2) + '\n'
+
+
+class TestNormalizeRole:
+    """Test converting Graph appRoles into role dicts."""
+
+    def test_null_description_falls_back_to_display_name(self):
+        """Test a null Graph description never reaches the import as None."""
+        role = get_command()._normalize_role(
+            {'value': 'Admin', 'displayName': 'Administrator', 'description': None,
+             'allowedMemberTypes': ['User', 'Application'], 'id': 'role-1'},
+            'app_registration',
+        )
+
+        assert role == {
+            'name': 'Admin',
+            'description': 'Administrator',
+            'display_name': 'Administrator',
+            'is_enabled': True,
+            'allowed_member_types': ['User', 'Application'],
+            'id': 'role-1',
+            'source': 'app_registration',
+            'category': 'user_and_application',
+        }
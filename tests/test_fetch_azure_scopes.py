@@ -8,6 +8,25 @@ from django.core.management import call_command
 from django.core.management.base import CommandError
 
 
+def graph_response(payload):
+    """Build a mock HTTP response carrying a JSON payload."""
+    import json
+    response = Mock()
+    response.json.return_value = payload
+    response.content = json.dumps(payload).encode()
+    response.raise_for_status = Mock()
+    return response
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Forget access tokens cached by earlier tests."""
+    from hub_auth_client.utils.http import clear_token_cache
+    clear_token_cache()
+    yield
+    clear_token_cache()
+
+
 class TestFetchAzureScopesCommand:
     """Test fetch_azure_scopes management command."""
     
@@ -20,19 +39,22 @@ class TestFetchAzureScopesCommand:
             'client_secret': 'test-client-secret'
         }
     
+    @pytest.fixture
+    def mock_session(self):
+        """Replace the command's pooled HTTP session."""
+        session = Mock()
+        with patch('hub_auth_client.django.management.commands.fetch_azure_scopes.Command.session', session):
+            yield session
+
     @pytest.fixture
     def mock_token_response(self):
         """Mock token response from Azure."""
-        mock_response = Mock()
-        mock_response.json.return_value = {'access_token': 'test-token'}
-        mock_response.raise_for_status = Mock()
-        return mock_response
+        return graph_response({'access_token': 'test-token'})
     
     @pytest.fixture
     def mock_app_response_with_api(self):
         """Mock app response with API scopes."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        return graph_response({
             'value': [{
                 'id': 'app-id',
                 'displayName': 'Test App',
@@ -57,30 +79,24 @@ class TestFetchAzureScopesCommand:
                     ]
                 }
             }]
-        }
-        mock_response.raise_for_status = Mock()
-        return mock_response
+        })
     
     @pytest.fixture
     def mock_app_response_without_api(self):
         """Mock app response without API key (needs beta endpoint)."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        return graph_response({
             'value': [{
                 'id': 'app-id',
                 'displayName': 'Test App',
                 'appId': 'test-client-id',
                 'identifierUris': ['api://test-app']
             }]
-        }
-        mock_response.raise_for_status = Mock()
-        return mock_response
+        })
     
     @pytest.fixture
     def mock_beta_response(self):
         """Mock beta endpoint response."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        return graph_response({
             'id': 'app-id',
             'displayName': 'Test App',
             'appId': 'test-client-id',
@@ -95,19 +111,15 @@ class TestFetchAzureScopesCommand:
                     }
                 ]
             }
-        }
-        mock_response.raise_for_status = Mock()
-        return mock_response
+        })
     
-    @patch('hub_auth_client.django.management.commands.fetch_azure_scopes.requests.post')
-    @patch('hub_auth_client.django.management.commands.fetch_azure_scopes.requests.get')
     def test_fetch_scopes_success_with_v1_endpoint(
-        self, mock_get, mock_post, mock_config, mock_token_response, 
+        self, mock_session, mock_config, mock_token_response, 
         mock_app_response_with_api
     ):
         """Test successful scope fetching from v1.0 endpoint."""
-        mock_post.return_value = mock_token_response
-        mock_get.return_value = mock_app_response_with_api
+        mock_session.post.return_value = mock_token_response
+        mock_session.get.return_value = mock_app_response_with_api
         
         out = StringIO()
         
@@ -122,18 +134,19 @@ class TestFetchAzureScopesCommand:
         # Should show scope names
         assert 'user.read' in output
         assert 'user.write' in output
+        assert mock_session.get.call_args[1]['params']['$select'] == (
+            'id,displayName,appId,identifierUris,api,appRoles,requiredResourceAccess'
+        )
     
-    @patch('hub_auth_client.django.management.commands.fetch_azure_scopes.requests.post')
-    @patch('hub_auth_client.django.management.commands.fetch_azure_scopes.requests.get')
     def test_fetch_scopes_fallback_to_beta_endpoint(
-        self, mock_get, mock_post, mock_config, mock_token_response,
+        self, mock_session, mock_config, mock_token_response,
         mock_app_response_without_api, mock_beta_response
     ):
         """Test fallback to beta endpoint when v1.0 doesn't have API."""
-        mock_post.return_value = mock_token_response
+        mock_session.post.return_value = mock_token_response
         
         # First call returns app without 'api', second call is beta endpoint
-        mock_get.side_effect = [mock_app_response_without_api, mock_beta_response]
+        mock_session.get.side_effect = [mock_app_response_without_api, mock_beta_response]
         
         out = StringIO()
         
@@ -148,26 +161,22 @@ class TestFetchAzureScopesCommand:
         # Should still find scopes
         assert 'user.read' in output
     
-    @patch('hub_auth_client.django.management.commands.fetch_azure_scopes.requests.post')
-    @patch('hub_auth_client.django.management.commands.fetch_azure_scopes.requests.get')
     def test_fetch_scopes_no_scopes_found(
-        self, mock_get, mock_post, mock_config, mock_token_response
+        self, mock_session, mock_config, mock_token_response
     ):
         """Test handling when no scopes are found."""
-        mock_post.return_value = mock_token_response
+        mock_session.post.return_value = mock_token_response
         
         # App with no scopes
-        no_scopes_response = Mock()
-        no_scopes_response.json.return_value = {
+        no_scopes_response = graph_response({
             'value': [{
                 'id': 'app-id',
                 'displayName': 'Test App',
                 'appId': 'test-client-id'
             }]
-        }
-        no_scopes_response.raise_for_status = Mock()
+        })
         
-        mock_get.return_value = no_scopes_response
+        mock_session.get.return_value = no_scopes_response
         
         out = StringIO()
         
@@ -180,6 +189,157 @@ class TestFetchAzureScopesCommand:
         # Should indicate no scopes found
         assert 'No scopes found' in output or 'No \'api\' key' in output
     
+    def test_access_token_reused_across_runs(
+        self, mock_session, mock_config, mock_app_response_with_api
+    ):
+        """Test a second run reuses the cached access token."""
+        token_response = graph_response({'access_token': 'test-token', 'expires_in': 3600})
+        mock_session.post.return_value = token_response
+        mock_session.get.return_value = mock_app_response_with_api
+
+        with patch('hub_auth_client.django.management.commands.fetch_azure_scopes.Command.get_azure_config',
+                   return_value=mock_config):
+            call_command('fetch_azure_scopes', stdout=StringIO())
+            call_command('fetch_azure_scopes', stdout=StringIO())
+
+        mock_session.post.assert_called_once()
+        assert mock_session.get.call_count == 2
+
+    def test_debug_diagnostics_logged_not_printed(
+        self, mock_session, mock_config, mock_token_response, mock_app_response_with_api, caplog
+    ):
+        """Test DEBUG diagnostics go to the logger instead of stdout."""
+        import logging
+        mock_session.post.return_value = mock_token_response
+        mock_session.get.return_value = mock_app_response_with_api
+
+        out = StringIO()
+        with patch('hub_auth_client.django.management.commands.fetch_azure_scopes.Command.get_azure_config',
+                   return_value=mock_config):
+            logger_name = 'hub_auth_client.django.management.commands.fetch_azure_scopes'
+            with caplog.at_level(logging.DEBUG, logger=logger_name):
+                call_command('fetch_azure_scopes', stdout=out)
+
+        assert 'DEBUG' not in out.getvalue()
+        assert 'user.read' in out.getvalue()
+        assert 'Top-level app keys' in caplog.text
+
+    def test_client_ids_fetched_concurrently_and_merged(self, mock_session, mock_config):
+        """Test --client-ids fetches each application and drops repeated scopes."""
+        shared_role = {'value': 'Task.Run', 'id': 'role-1', 'isEnabled': True}
+        apps = {
+            "appId eq 'app-one'": {'id': 'one', 'api': {}, 'appRoles': [shared_role]},
+            "appId eq 'app-two'": {'id': 'two', 'api': {}, 'appRoles': [
+                shared_role, {'value': 'Report.Read', 'id': 'role-2', 'isEnabled': True},
+            ]},
+        }
+        mock_session.post.return_value = graph_response({'access_token': 'test-token', 'expires_in': 3600})
+        mock_session.get.side_effect = lambda url, **kwargs: graph_response(
+            {'value': [apps[kwargs['params']['$filter']]]}
+        )
+
+        out = StringIO()
+        with patch('hub_auth_client.django.management.commands.fetch_azure_scopes.Command.get_azure_config',
+                   return_value=mock_config):
+            call_command(
+                'fetch_azure_scopes', '--client-ids', 'app-one', 'app-two', '--format=json', stdout=out
+            )
+
+        import json
+        scopes = json.loads(out.getvalue())
+        assert [scope['name'] for scope in scopes] == ['Task.Run', 'Report.Read']
+        assert mock_session.get.call_count == 2
+        mock_session.post.assert_called_once()
+
+    def test_client_reports_printed_in_input_order(self, mock_session, mock_config):
+        """Test each client's progress is printed as one block in --client-ids order."""
+        import threading
+        second_done = threading.Event()
+
+        def get(url, **kwargs):
+            app_id = kwargs['params']['$filter'].split("'")[1]
+            if app_id == 'app-one':
+                # Finish after app-two so unbuffered output would interleave
+                second_done.wait(5)
+            response = graph_response({'value': [{
+                'id': app_id, 'appId': app_id, 'api': {}, 'appRoles': [{'value': f'{app_id}.Run'}],
+            }]})
+            if app_id == 'app-two':
+                second_done.set()
+            return response
+
+        mock_session.post.return_value = graph_response({'access_token': 'test-token'})
+        mock_session.get.side_effect = get
+
+        out = StringIO()
+        with patch('hub_auth_client.django.management.commands.fetch_azure_scopes.Command.get_azure_config',
+                   return_value=mock_config):
+            call_command('fetch_azure_scopes', '--client-ids', 'app-one', 'app-two', stdout=out)
+
+        output = out.getvalue()
+        positions = [
+            output.index('=== app-one ==='),
+            output.index('App ID: app-one'),
+            output.index('=== app-two ==='),
+            output.index('App ID: app-two'),
+        ]
+        assert positions == sorted(positions)
+
+    def test_client_id_quotes_escaped_in_filter(self, mock_session, mock_config):
+        """Test single quotes in --client-ids are doubled inside the OData filter."""
+        mock_session.post.return_value = graph_response({'access_token': 'test-token'})
+        mock_session.get.return_value = graph_response({'value': []})
+
+        with patch('hub_auth_client.django.management.commands.fetch_azure_scopes.Command.get_azure_config',
+                   return_value=mock_config):
+            call_command('fetch_azure_scopes', '--client-ids', "c'x", stdout=StringIO(), stderr=StringIO())
+
+        assert mock_session.get.call_args[1]['params']['$filter'] == "appId eq 'c''x'"
+
+    @pytest.mark.django_db
+    def test_jsonl_output_is_only_json_lines(self, mock_session, mock_config):
+        """Test every stdout line in --format=jsonl is a JSON record, even with --import."""
+        import json
+        mock_session.post.return_value = graph_response({'access_token': 'test-token'})
+        mock_session.get.return_value = graph_response({'value': [{
+            'id': 'app-id',
+            'appId': 'test-client-id',
+            'identifierUris': ['api://test'],
+            'api': {'oauth2PermissionScopes': [{'value': 'user.read', 'id': 's1'}]},
+            'appRoles': [{'value': 'Task.Run', 'id': 'r1'}],
+        }]})
+
+        out, err = StringIO(), StringIO()
+        with patch('hub_auth_client.django.management.commands.fetch_azure_scopes.Command.get_azure_config',
+                   return_value=mock_config):
+            call_command('fetch_azure_scopes', '--format=jsonl', '--import', stdout=out, stderr=err)
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [record['name'] for record in records] == ['api://test/user.read', 'Task.Run']
+        assert 'Created: 2' in err.getvalue()
+
+    def test_count_only_skips_scope_listing(self, mock_session, mock_config):
+        """Test --count-only reports counts from the v1.0 response and skips the beta call."""
+        mock_session.post.return_value = graph_response({'access_token': 'test-token'})
+        mock_session.get.return_value = graph_response({'value': [{
+            'id': 'app-id',
+            'api': {'oauth2PermissionScopes': [{'value': 'user.read'}, {'value': 'user.write'}]},
+            'appRoles': [{'value': 'Task.Run'}],
+            'requiredResourceAccess': [
+                {'resourceAppId': 'graph', 'resourceAccess': [{'id': 'a'}, {'id': 'b'}]},
+            ],
+        }]})
+
+        out = StringIO()
+        with patch('hub_auth_client.django.management.commands.fetch_azure_scopes.Command.get_azure_config',
+                   return_value=mock_config):
+            call_command('fetch_azure_scopes', '--count-only', stdout=out)
+
+        output = out.getvalue()
+        assert '  delegated: 2\n  application: 1\n  required: 2' in output
+        assert 'user.read' not in output
+        mock_session.get.assert_called_once()
+
     def test_no_configuration_provided(self):
         """Test error when no Azure configuration is available."""
         out = StringIO()
@@ -194,12 +354,11 @@ class TestFetchAzureScopesCommand:
         # Should show error about missing configuration
         assert 'configuration not found' in error_output.lower()
     
-    @patch('hub_auth_client.django.management.commands.fetch_azure_scopes.requests.post')
-    def test_authentication_failure(self, mock_post, mock_config):
+    def test_authentication_failure(self, mock_session, mock_config):
         """Test handling of authentication failure."""
         # Mock a request exception which is caught and reported
         from requests.exceptions import RequestException
-        mock_post.side_effect = RequestException("Authentication failed")
+        mock_session.post.side_effect = RequestException("Authentication failed")
         
         out = StringIO()
         err = StringIO()
@@ -241,6 +400,57 @@ class TestFetchAzureScopesCommand:
         assert parsed[0]['name'] == 'api://test/user.read'
 
 
+class TestScopeOutputTable:
+    """Test the scope table output."""
+
+    def test_rows_grouped_by_category_and_name(self):
+        """Test rows are ordered by category then name, with per-category counts."""
+        from hub_auth_client.django.management.commands.fetch_azure_scopes import Command
+
+        scopes = [
+            {'name': 'Write', 'description': '', 'category': 'delegated', 'type': 'oauth2', 'enabled': True},
+            {'name': 'Task.Run', 'description': 'Runs', 'category': 'application', 'type': 'app_role',
+             'enabled': True},
+            {'name': 'Read', 'description': 'Reads', 'category': 'delegated', 'type': 'oauth2', 'enabled': False},
+        ]
+
+        command = Command(stdout=StringIO(), stderr=StringIO())
+        command.output_table(scopes)
+
+        output = command.stdout.getvalue()
+        assert output.index('Task.Run') < output.index('Read') < output.index('Write')
+        assert '  → Reads' in output
+        assert '  application: 1\n  delegated: 2' in output
+        assert [scope['name'] for scope in scopes] == ['Write', 'Task.Run', 'Read']
+
+class TestScopeJsonOutput:
+    """Test the JSON output formats."""
+
+    def test_streamed_json_matches_dumps(self):
+        """Test streamed output is identical to a single json.dumps call."""
+        import json
+        from hub_auth_client.django.management.commands.fetch_azure_scopes import Command
+
+        scopes = [{'name': f'Scope{i}', 'description': 'Zugriff für alle', 'enabled': True} for i in range(300)]
+
+        command = Command(stdout=StringIO(), stderr=StringIO())
+        command.output_json(scopes)
+
+        assert command.stdout.getvalue() == json.dumps(scopes, indent=2) + '\n'
+
+    def test_jsonl_writes_one_scope_per_line(self):
+        """Test JSON Lines output has one parseable object per line."""
+        import json
+        from hub_auth_client.django.management.commands.fetch_azure_scopes import Command
+
+        scopes = [{'name': 'A', 'enabled': True}, {'name': 'B', 'enabled': False}]
+
+        command = Command(stdout=StringIO(), stderr=StringIO())
+        command.output_jsonl(scopes)
+
+        lines = command.stdout.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == scopes
+
 class TestAzureScopeImport:
     """Test importing scopes to database."""
     
@@ -282,3 +492,84 @@ class TestAzureScopeImport:
         scope = ScopeDefinition.objects.filter(name='api://test/user.read').first()
         assert scope is not None
         assert scope.description == 'Read user data'
+
+    @pytest.mark.django_db
+    def test_import_scopes_in_bulk(self, django_assert_max_num_queries):
+        """Test scopes are created and updated without per-scope queries."""
+        from hub_auth_client.django.management.commands.fetch_azure_scopes import Command
+        from hub_auth_client.django.models import ScopeDefinition
+
+        ScopeDefinition.objects.create(name='api://test/user.read', description='Old description')
+        ScopeDefinition.objects.create(name='api://test/user.list', description='List users')
+
+        scopes = [
+            {'name': 'api://test/user.read', 'description': 'Read user data', 'category': 'delegated'},
+            {'name': 'api://test/user.list', 'description': 'List users', 'category': 'delegated'},
+            {'name': 'api://test/user.write', 'description': 'Write user data', 'category': 'delegated'},
+            {'name': 'Task.Run', 'description': 'Run tasks', 'category': 'application', 'enabled': False},
+            {'name': '', 'description': 'Nameless'},
+        ]
+
+        command = Command(stdout=StringIO(), stderr=StringIO())
+        with django_assert_max_num_queries(5):
+            command.import_scopes(scopes)
+
+        assert ScopeDefinition.objects.get(name='api://test/user.read').description == 'Read user data'
+        assert ScopeDefinition.objects.get(name='Task.Run').is_active is False
+        assert ScopeDefinition.objects.get(name='Task.Run').category == 'application'
+        assert ScopeDefinition.objects.count() == 4
+
+        output = command.stdout.getvalue()
+        assert 'Created: 2' in output
+        assert 'Updated: 1' in output
+        assert 'Skipped: 2' in output
+        assert 'Created scope' not in output
+
+        command = Command(stdout=StringIO(), stderr=StringIO())
+        command.import_scopes([{'name': 'Extra.Scope', 'description': 'Extra'}], verbose=True)
+        assert '✓ Created scope: Extra.Scope' in command.stdout.getvalue()
+
+    @pytest.mark.django_db
+    def test_import_scopes_collapses_duplicate_names(self):
+        """Test a repeated scope name is imported once with its last description."""
+        from hub_auth_client.django.management.commands.fetch_azure_scopes import Command
+        from hub_auth_client.django.models import ScopeDefinition
+
+        scopes = [
+            {'name': 'api://test/user.read', 'description': 'First', 'category': 'delegated'},
+            {'name': 'api://test/user.read', 'description': 'Second', 'category': 'delegated'},
+        ]
+
+        command = Command(stdout=StringIO(), stderr=StringIO())
+        command.import_scopes(scopes)
+
+        assert ScopeDefinition.objects.get(name='api://test/user.read').description == 'Second'
+        output = command.stdout.getvalue()
+        assert 'Created: 1' in output
+        assert 'Updated: 0' in output
+
+
+@pytest.mark.django_db
+class TestAzureConfigLookup:
+    """Test resolving Azure AD credentials for the command."""
+
+    def test_active_database_config_used(self):
+        """Test the active AzureADConfiguration supplies the credentials."""
+        from hub_auth_client.django.config_models import AzureADConfiguration
+        from hub_auth_client.django.management.commands.fetch_azure_scopes import Command
+
+        AzureADConfiguration.objects.create(
+            name='Active Config',
+            tenant_id='12345678-1234-1234-1234-123456789012',
+            client_id='87654321-4321-4321-4321-210987654321',
+            client_secret='db-secret',
+            is_active=True,
+        )
+
+        config = Command().get_azure_config({})
+
+        assert config == {
+            'tenant_id': '12345678-1234-1234-1234-123456789012',
+            'client_id': '87654321-4321-4321-4321-210987654321',
+            'client_secret': 'db-secret',
+        }
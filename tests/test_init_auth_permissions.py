@@ -0,0 +1,46 @@
+"""
+Tests for init_auth_permissions management command.
+"""
+import pytest
+from io import StringIO
+
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestInitAuthPermissions:
+    """Test seeding the default scopes and roles."""
+
+    def test_creates_missing_and_keeps_existing(self, django_assert_max_num_queries):
+        """Test existing rows are left alone and the rest are inserted in bulk."""
+        from hub_auth_client.django.models import RoleDefinition, ScopeDefinition
+
+        ScopeDefinition.objects.create(name='User.Read', category='Custom', description='Keep me')
+        RoleDefinition.objects.create(name='Admin', description='Keep me')
+
+        out = StringIO()
+        with django_assert_max_num_queries(8):
+            call_command('init_auth_permissions', stdout=out)
+
+        assert ScopeDefinition.objects.count() == 15
+        assert RoleDefinition.objects.count() == 6
+        assert ScopeDefinition.objects.get(name='User.Read').description == 'Keep me'
+        assert RoleDefinition.objects.get(name='Admin').description == 'Keep me'
+
+        output = out.getvalue()
+        assert 'Scope exists: User.Read' in output
+        assert 'Created scope: Files.Share' in output
+        assert 'Role exists: Admin' in output
+        assert 'Created role: Guest' in output
+
+    def test_rerun_is_idempotent(self):
+        """Test running twice creates nothing new."""
+        from hub_auth_client.django.models import RoleDefinition, ScopeDefinition
+
+        call_command('init_auth_permissions', stdout=StringIO())
+        out = StringIO()
+        call_command('init_auth_permissions', stdout=out)
+
+        assert ScopeDefinition.objects.count() == 15
+        assert RoleDefinition.objects.count() == 6
+        assert 'Created' not in out.getvalue()
@@ -0,0 +1,190 @@
+"""
+Tests for list_endpoints management command.
+"""
+import json
+
+import pytest
+from io import StringIO
+from unittest.mock import patch
+
+from django.urls import get_resolver, include, path
+from rest_framework import serializers
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class SecuredView(APIView):
+    """Return secured data."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({})
+
+
+class OpenView(APIView):
+    """Return open data."""
+
+    permission_classes = []
+
+    def get(self, request):
+        return Response({})
+
+    def post(self, request):
+        return Response({})
+
+
+urlpatterns = [
+    path('api/secured/', SecuredView.as_view(), name='secured'),
+    path('api/open/', OpenView.as_view(), name='open'),
+    path('api/v2/', include([
+        path('items/', include([
+            path('<int:pk>/', SecuredView.as_view(), name='item-detail'),
+        ])),
+        path('health/', OpenView.as_view(), name='health'),
+    ])),
+]
+
+
+def get_command():
+    """Lazy import of the command to avoid app registry issues."""
+    from hub_auth_client.django.management.commands.list_endpoints import Command
+    return Command(stdout=StringIO(), stderr=StringIO())
+
+
+@pytest.mark.urls(__name__)
+class TestCollectEndpoints:
+    """Test walking the URL tree."""
+
+    def test_collects_view_details(self):
+        """Test each URL pattern becomes an endpoint with its view details."""
+        endpoints = {e['url_pattern']: e for e in get_command().collect_endpoints()}
+
+        assert set(endpoints) == {'api/secured/', 'api/open/', 'api/v2/items/<int:pk>/', 'api/v2/health/'}
+        assert list(endpoints['api/secured/']['permission_classes']) == ['IsAuthenticated']
+        assert not endpoints['api/open/']['permission_classes']
+        assert set(endpoints['api/open/']['methods']) >= {'GET', 'POST'}
+        assert endpoints['api/secured/']['description'] == 'Return secured data.'
+        assert endpoints['api/secured/']['methods'] is endpoints['api/v2/items/<int:pk>/']['methods']
+
+    def test_nested_includes_keep_urlconf_order(self):
+        """Test included patterns get their prefixes and keep declaration order."""
+        urls = [e['url_pattern'] for e in get_command()._walk_url_patterns(get_resolver())]
+
+        assert urls == ['api/secured/', 'api/open/', 'api/v2/items/<int:pk>/', 'api/v2/health/']
+
+    def test_url_tree_walked_once_per_resolver(self):
+        """Test repeated collection reuses the last walk and returns fresh dicts."""
+        from hub_auth_client.django.management.commands.list_endpoints import Command
+
+        first = get_command().collect_endpoints()
+        first[0]['serializer'] = 'Mutated'
+
+        with patch.object(Command, '_walk_url_patterns') as walk:
+            second = get_command().collect_endpoints()
+
+        walk.assert_not_called()
+        assert 'serializer' not in second[0]
+
+    def test_view_class_introspected_once(self):
+        """Test URL patterns sharing a view class reuse its introspection."""
+        from hub_auth_client.django.management.commands.list_endpoints import _introspect_view
+
+        _introspect_view.cache_clear()
+        command = get_command()
+        command._walk_url_patterns(get_resolver())
+
+        info = _introspect_view.cache_info()
+        assert (info.misses, info.hits) == (2, 2)
+
+
+class TestSerializerInfo:
+    """Test serializer details added by --show-serializers."""
+
+    def test_serializer_fields_built_once_per_class(self):
+        """Test each serializer is instantiated once however many endpoints use it."""
+        init_calls = []
+
+        class ItemSerializer(serializers.Serializer):
+            name = serializers.CharField()
+            count = serializers.IntegerField()
+
+            def __init__(self, *args, **kwargs):
+                init_calls.append(1)
+                super().__init__(*args, **kwargs)
+
+        class ItemView(GenericAPIView):
+            serializer_class = ItemSerializer
+
+        endpoints = [{'view_class': ItemView} for _ in range(3)] + [{'view_class': OpenView}]
+        get_command().add_serializer_info(endpoints)
+
+        assert len(init_calls) == 1
+        assert endpoints[0]['serializer'] == 'ItemSerializer'
+        assert endpoints[2]['serializer_fields'] == ['name', 'count']
+        assert endpoints[3]['serializer'] is None
+        assert endpoints[3]['serializer_fields'] == []
+
+
+@pytest.mark.urls(__name__)
+class TestEndpointOutput:
+    """Test the output formats."""
+
+    def test_json_output_streamed_in_chunks(self):
+        """Test JSON output is written in several chunks and parses to the endpoints."""
+        from hub_auth_client.django.management.commands.list_endpoints import Command
+
+        out = StringIO()
+        command = Command(stdout=out)
+        endpoints = command.collect_endpoints()
+
+        with patch(
+            'hub_auth_client.django.management.commands.list_endpoints._JSON_WRITE_CHUNKS', 8
+        ):
+            command.output_json(endpoints)
+
+        data = json.loads(out.getvalue())
+        assert [e['url_pattern'] for e in data] == [e['url_pattern'] for e in endpoints]
+        assert all('view_class' not in e for e in data)
+
+    def test_table_rows_truncated_and_padded(self):
+        """Test table rows keep their fixed column widths and flag unsecured views."""
+        from hub_auth_client.django.management.commands.list_endpoints import Command
+
+        out = StringIO()
+        command = Command(stdout=out, no_color=True)
+        endpoints = command.collect_endpoints()
+        endpoints[0]['url_pattern'] = 'api/' + 'x' * 60
+
+        command.output_table(endpoints, show_serializers=True)
+
+        lines = out.getvalue().splitlines()
+        long_row = next(line for line in lines if line.startswith('api/xxx'))
+        assert long_row[:51] == 'api/' + 'x' * 44 + '   '
+        assert long_row[51:71] == f"{'GET,OPTIONS':<20}"
+        assert long_row[72:102] == f"{'SecuredView':<30}"
+        assert long_row[103:133] == f"{'IsAuthenticated':<30}"
+        assert long_row[134:].rstrip() == 'N/A'
+        open_row = next(line for line in lines if line.startswith('api/open/'))
+        assert open_row[103:133] == f"{'NONE':<30}"
+        assert 'Unsecured endpoints: 2/4' in out.getvalue()
+
+    def test_csv_written_through_command_stdout(self):
+        """Test CSV output goes to the command's stdout in one write."""
+        import csv
+
+        from hub_auth_client.django.management.commands.list_endpoints import Command
+
+        out = StringIO()
+        command = Command(stdout=out)
+        endpoints = command.collect_endpoints()
+
+        with patch.object(command.stdout, 'write', wraps=command.stdout.write) as write:
+            command.output_csv(endpoints)
+
+        assert write.call_count == 1
+        rows = list(csv.reader(StringIO(out.getvalue())))
+        assert rows[0][0] == 'URL Pattern'
+        assert [row[0] for row in rows[1:]] == [e['url_pattern'] for e in endpoints]
@@ -0,0 +1,89 @@
+"""
+Tests for the manage_rls management command.
+
+The command only runs against PostgreSQL, so these tests call its methods
+directly with the database cursor mocked out.
+"""
+
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hub_auth_client.django.management.commands.manage_rls import Command
+
+
+@pytest.fixture
+def out():
+    return StringIO()
+
+
+@pytest.fixture
+def command(out):
+    return Command(stdout=out)
+
+
+@pytest.fixture
+def mock_cursor():
+    with patch('hub_auth_client.django.management.commands.manage_rls.connection') as conn:
+        yield conn.cursor.return_value.__enter__.return_value
+
+
+@pytest.mark.django_db
+class TestApplyPolicies:
+    """Test applying RLS policies."""
+
+    def make_policies(self):
+        from hub_auth_client.django.rls_models import RLSPolicy
+
+        RLSPolicy.objects.create(name='first_policy', table_name='first_table')
+        RLSPolicy.objects.create(name='second_policy', table_name='second_table')
+        RLSPolicy.objects.create(name='off_policy', table_name='off_table', is_active=False)
+        return RLSPolicy
+
+    def test_apply_all_one_statement_batch_per_policy(self, command, out, mock_cursor):
+        """Test each active policy is applied with a single execute."""
+        RLSPolicy = self.make_policies()
+
+        command.apply_all_policies(RLSPolicy)
+
+        assert mock_cursor.execute.call_count == 2
+        sql = mock_cursor.execute.call_args_list[0][0][0]
+        assert sql.index('DROP POLICY IF EXISTS') < sql.index('ENABLE ROW LEVEL SECURITY')
+        assert sql.index('ENABLE ROW LEVEL SECURITY') < sql.index('CREATE POLICY')
+        assert 'Successfully applied 2 policies' in out.getvalue()
+
+    def test_apply_all_continues_after_failure(self, command, out, mock_cursor):
+        """Test a failing policy is reported without stopping the others."""
+        RLSPolicy = self.make_policies()
+        mock_cursor.execute.side_effect = [Exception('boom'), None]
+
+        command.apply_all_policies(RLSPolicy)
+
+        output = out.getvalue()
+        assert 'Successfully applied 1 policies' in output
+        assert '1 errors occurred' in output
+        assert 'boom' in output
+
+
+@pytest.mark.django_db
+class TestShowStatus:
+    """Test the default status listing."""
+
+    def test_status_lists_policies_from_single_query(self, command, out, django_assert_num_queries):
+        """Test status output needs one query for configs and one for policies."""
+        from hub_auth_client.django.rls_models import RLSPolicy, RLSTableConfig
+
+        RLSTableConfig.objects.create(table_name='first_table', rls_enabled=True)
+        RLSPolicy.objects.create(name='first_policy', table_name='first_table')
+        RLSPolicy.objects.create(name='off_policy', table_name='off_table', is_active=False)
+
+        with django_assert_num_queries(2):
+            command.show_status(RLSPolicy, RLSTableConfig)
+
+        output = out.getvalue()
+        assert 'first_table: ✓ Enabled' in output
+        assert 'RLS Policies: 1 active, 1 inactive' in output
+        assert '✓ first_policy on first_table' in output
+        assert '✗ off_policy on off_table' in output
+        assert output.index('first_policy') < output.index('off_policy')
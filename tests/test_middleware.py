@@ -54,6 +54,9 @@ class TestMSALAuthenticationMiddleware:
         
         assert middleware.get_response == get_response
         assert middleware.exempt_paths == ['/health/']
+        mock_validator_class.assert_not_called()
+
+        assert middleware.validator is middleware.validator
         mock_validator_class.assert_called_once_with(
             tenant_id='test-tenant',
             client_id='test-client',
@@ -237,6 +240,34 @@ class TestMSALAuthenticationMiddleware:
         # Validator should never be called
         mock_validator.validate_token.assert_not_called()
     
+    @patch('hub_auth_client.django.middleware.MSALTokenValidator')
+    @patch('hub_auth_client.django.middleware.settings')
+    def test_exempt_paths_matched_literally(self, mock_settings_module, mock_validator_class, request_factory):
+        """Test exempt paths are prefix matches with regex characters taken literally."""
+        mock_settings_module.AZURE_AD_TENANT_ID = 'test-tenant'
+        mock_settings_module.AZURE_AD_CLIENT_ID = 'test-client'
+        mock_settings_module.MSAL_EXEMPT_PATHS = ['/v1.0/health/']
+
+        def getattr_side_effect(obj, name, default=None):
+            return getattr(mock_settings_module, name, default)
+
+        mock_validator = MagicMock()
+        mock_validator.validate_token.return_value = (False, None, 'Invalid')
+        mock_validator_class.return_value = mock_validator
+
+        with patch('hub_auth_client.django.middleware.getattr', side_effect=getattr_side_effect):
+            middleware = MSALAuthenticationMiddleware(Mock())
+        middleware.app_validator = None
+
+        exempt = request_factory.get('/v1.0/health/live')
+        exempt.META['HTTP_AUTHORIZATION'] = 'Bearer token'
+        assert middleware.process_request(exempt) is None
+
+        for path in ['/v1x0/health/', '/api/v1.0/health/']:
+            request = request_factory.get(path)
+            request.META['HTTP_AUTHORIZATION'] = 'Bearer token'
+            assert middleware.process_request(request).status_code == 401
+
     @patch('hub_auth_client.django.middleware.MSALTokenValidator')
     @patch('hub_auth_client.django.middleware.settings')
     def test_process_request_non_exempt_path_requires_validation(self, mock_settings_module, mock_validator_class, request_factory):
@@ -271,3 +302,92 @@ class TestMSALAuthenticationMiddleware:
         
         assert result is None
         mock_validator.validate_token.assert_called_once_with('Bearer valid-token')
+
+    @patch('hub_auth_client.django.middleware.MSALTokenValidator')
+    @patch('hub_auth_client.django.middleware.settings')
+    def test_repeated_token_validated_once(self, mock_settings_module, mock_validator_class, request_factory):
+        """Test a recently validated token is served from the validation cache."""
+        mock_settings_module.AZURE_AD_TENANT_ID = 'test-tenant'
+        mock_settings_module.AZURE_AD_CLIENT_ID = 'test-client'
+        mock_settings_module.MSAL_EXEMPT_PATHS = []
+
+        def getattr_side_effect(obj, name, default=None):
+            return getattr(mock_settings_module, name, default)
+
+        mock_validator = MagicMock()
+        mock_validator.validate_token.return_value = (True, {'sub': 'user-id'}, None)
+        mock_validator.extract_user_info.return_value = {'object_id': 'user-id'}
+        mock_validator_class.return_value = mock_validator
+
+        with patch('hub_auth_client.django.middleware.getattr', side_effect=getattr_side_effect):
+            middleware = MSALAuthenticationMiddleware(Mock())
+
+        for _ in range(3):
+            request = request_factory.get('/api/test/')
+            request.META['HTTP_AUTHORIZATION'] = 'Bearer valid-token'
+            assert middleware.process_request(request) is None
+            assert request.msal_token == {'sub': 'user-id'}
+            assert request.msal_user == {'object_id': 'user-id'}
+
+        mock_validator.validate_token.assert_called_once_with('Bearer valid-token')
+        mock_validator.extract_user_info.assert_called_once_with({'sub': 'user-id'})
+
+    @patch('hub_auth_client.django.middleware.MSALTokenValidator')
+    @patch('hub_auth_client.django.middleware.settings')
+    def test_expired_claims_not_cached(self, mock_settings_module, mock_validator_class, request_factory):
+        """Test claims whose exp has passed are revalidated on every request."""
+        mock_settings_module.AZURE_AD_TENANT_ID = 'test-tenant'
+        mock_settings_module.AZURE_AD_CLIENT_ID = 'test-client'
+        mock_settings_module.MSAL_EXEMPT_PATHS = []
+
+        def getattr_side_effect(obj, name, default=None):
+            return getattr(mock_settings_module, name, default)
+
+        mock_validator = MagicMock()
+        mock_validator.validate_token.return_value = (True, {'sub': 'user-id', 'exp': 1}, None)
+        mock_validator.extract_user_info.return_value = {'object_id': 'user-id'}
+        mock_validator_class.return_value = mock_validator
+
+        with patch('hub_auth_client.django.middleware.getattr', side_effect=getattr_side_effect):
+            middleware = MSALAuthenticationMiddleware(Mock())
+
+        for _ in range(2):
+            request = request_factory.get('/api/test/')
+            request.META['HTTP_AUTHORIZATION'] = 'Bearer valid-token'
+            assert middleware.process_request(request) is None
+
+        assert mock_validator.validate_token.call_count == 2
+
+    @patch('hub_auth_client.django.middleware.MSALTokenValidator')
+    @patch('hub_auth_client.django.middleware.settings')
+    def test_non_bearer_scheme_rejected_without_validation(self, mock_settings_module, mock_validator_class, request_factory):
+        """Test other authorization schemes get a 401 without reaching the validators."""
+        mock_settings_module.AZURE_AD_TENANT_ID = 'test-tenant'
+        mock_settings_module.AZURE_AD_CLIENT_ID = 'test-client'
+        mock_settings_module.MSAL_EXEMPT_PATHS = []
+
+        def getattr_side_effect(obj, name, default=None):
+            return getattr(mock_settings_module, name, default)
+
+        mock_validator = MagicMock()
+        mock_validator.validate_token.return_value = (True, {'sub': 'user-id'}, None)
+        mock_validator.extract_user_info.return_value = {'object_id': 'user-id'}
+        mock_validator_class.return_value = mock_validator
+
+        with patch('hub_auth_client.django.middleware.getattr', side_effect=getattr_side_effect):
+            middleware = MSALAuthenticationMiddleware(Mock())
+        middleware.app_validator = MagicMock()
+
+        request = request_factory.get('/api/test/')
+        request.META['HTTP_AUTHORIZATION'] = 'Basic dXNlcjpwYXNz'
+        result = middleware.process_request(request)
+
+        assert result.status_code == 401
+        mock_validator.validate_token.assert_not_called()
+        middleware.app_validator.validate_token.assert_not_called()
+
+        # A bare token without a scheme is still handed to the validator
+        request = request_factory.get('/api/test/')
+        request.META['HTTP_AUTHORIZATION'] = 'raw-token'
+        assert middleware.process_request(request) is None
+        mock_validator.validate_token.assert_called_once_with('raw-token')
@@ -154,6 +154,23 @@ class TestRLSPolicy:
         assert 'USING (true)' in sql
         assert "WITH CHECK (status = 'active')" in sql
     
+    def test_generate_create_policy_sql_builds_using_once(self, django_assert_num_queries):
+        """Test the generated USING expression is reused for WITH CHECK."""
+        from hub_auth_client.django.rls_models import RLSPolicy
+
+        policy = RLSPolicy.objects.create(
+            name='all_policy',
+            table_name='test_table',
+            policy_command='ALL',
+        )
+
+        # One query each for required scopes and required roles
+        with django_assert_num_queries(2):
+            sql = policy.generate_create_policy_sql()
+
+        assert 'USING (true)' in sql
+        assert 'WITH CHECK (true)' in sql
+
     def test_generate_drop_policy_sql(self):
         """Test generating DROP POLICY SQL."""
         from hub_auth_client.django.rls_models import RLSPolicy